@@ -9,13 +9,18 @@ Endpoint'ler:
 - /simulate_deposit: Maaş yatışı simülasyonu
 - /action: Kullanıcı eylemi işleme
 - /stream: Server-Sent Events stream
+- /workflow/<correlationId>: Workflow durumu ve sonucu
 - /health: Servis sağlık kontrolü
+- /metrics: Performans metrikleri
 - /kafka/publish: Kafka event yayınlama
 """
 
 import time
 import json
 import threading
+import itertools
+import uuid
+from collections import deque, OrderedDict
 from typing import Dict, Any, Optional
 from queue import Queue
 from flask import Flask, request, Response, jsonify
@@ -23,16 +28,225 @@ from flask import Flask, request, Response, jsonify
 from config import config
 from services import service_manager
 from workflow import FinancialWorkflow, FinancialState
+from workflow_executor import WorkflowExecutor
+from workflow_results import workflow_results
+from workflow_idempotency import workflow_idempotency
+from workflow_singleflight import workflow_singleflight
+
+
+class ClientStream:
+    """
+    Tek bir /stream client'ının sınırlı mesaj buffer'ı
+    
+    Buffer dolduğunda yavaş client politikası uygulanır:
+    - drop-oldest: En eski bekleyen mesaj atılır
+    - drop-client: Client bağlantısı kapatılır
+    - coalesce: Aynı event/agent/correlation için bekleyen eski mesaj yenisiyle değiştirilir
+      (eşleşen yoksa en eskisi atılır)
+    """
+    
+    POLICIES = ("drop-oldest", "drop-client", "coalesce")
+    
+    def __init__(self, max_size: int, policy: str, user_id: Optional[str] = None,
+                 correlation_id: Optional[str] = None, events: Optional[frozenset] = None):
+        """
+        Client buffer'ını başlatır
+        
+        Args:
+            max_size: Bekleyebilecek maksimum mesaj sayısı
+            policy: Buffer dolduğunda uygulanacak politika
+            user_id: Yalnızca bu kullanıcının event'leri (None: filtre yok)
+            correlation_id: Yalnızca bu workflow'un event'leri (None: filtre yok)
+            events: Yalnızca bu event tipleri (None: tümü)
+        """
+        self.max_size = max_size
+        self.policy = policy if policy in self.POLICIES else "drop-oldest"
+        self.user_id = user_id
+        self.correlation_id = correlation_id
+        self.events = events
+        self.created_at = time.time()
+        self.closed = False
+        
+        # Yazma takibi: yield öncesi işaretlenir, generator devam ettiğinde temizlenir.
+        # Uzun süre temizlenmeyen bir yazma, bağlantının sessizce öldüğünü gösterir
+        self.write_started_at: Optional[float] = None
+        
+        self._buffer = deque()
+        self._condition = threading.Condition()
+        self.stats = {"delivered": 0, "writes": 0, "batched_writes": 0, "dropped": 0, "coalesced": 0, "max_lag": 0}
+    
+    def matches(self, event_name: str, user_id: Optional[str], correlation_id: Optional[str]) -> bool:
+        """
+        Event'in client'ın abonelik filtrelerine uyup uymadığını kontrol eder
+        
+        Args:
+            event_name: Event adı
+            user_id: Event'in userId routing anahtarı
+            correlation_id: Event'in correlationId routing anahtarı
+            
+        Returns:
+            bool: Client bu event'i almalıysa True
+        """
+        if self.events is not None and event_name not in self.events:
+            return False
+        if self.user_id is not None and self.user_id != user_id:
+            return False
+        if self.correlation_id is not None and self.correlation_id != correlation_id:
+            return False
+        return True
+    
+    def put(self, msg: str, coalesce_key: Optional[tuple] = None) -> bool:
+        """
+        Mesajı client buffer'ına ekler
+        
+        Args:
+            msg: SSE formatında mesaj
+            coalesce_key: coalesce politikası için mesaj anahtarı
+            
+        Returns:
+            bool: Client kapatılmalıysa False (drop-client politikası)
+        """
+        with self._condition:
+            if self.closed:
+                return False
+            
+            if len(self._buffer) >= self.max_size:
+                if self.policy == "drop-client":
+                    self.closed = True
+                    self._condition.notify_all()
+                    return False
+                
+                if self.policy == "coalesce" and coalesce_key is not None:
+                    for index, (key, _) in enumerate(self._buffer):
+                        if key == coalesce_key:
+                            del self._buffer[index]
+                            self.stats["coalesced"] += 1
+                            break
+                    else:
+                        self._buffer.popleft()
+                        self.stats["dropped"] += 1
+                else:
+                    self._buffer.popleft()
+                    self.stats["dropped"] += 1
+            
+            self._buffer.append((coalesce_key, msg))
+            self.stats["max_lag"] = max(self.stats["max_lag"], len(self._buffer))
+            self._condition.notify()
+            return True
+    
+    def get(self, timeout: Optional[float] = None) -> Optional[str]:
+        """
+        Sıradaki mesajı döndürür
+        
+        Args:
+            timeout: Maksimum bekleme süresi (None: süresiz)
+            
+        Returns:
+            str: SSE mesajı; zaman aşımı veya kapanışta None
+        """
+        with self._condition:
+            if not self._buffer and not self.closed:
+                self._condition.wait(timeout)
+            if not self._buffer:
+                return None
+            _, msg = self._buffer.popleft()
+            self.stats["delivered"] += 1
+            self.stats["writes"] += 1
+            return msg
+    
+    def get_batch(self, timeout: Optional[float], max_bytes: int, max_delay: float) -> Optional[str]:
+        """
+        Bekleyen mesajları tek bir yazmada birleştirerek döndürür
+        
+        Adaptif çalışır: buffer'da tek mesaj varsa beklemeden döner; birden
+        fazla mesaj bekliyorsa (yoğunluk anı) byte sınırına kadar birleştirir
+        ve yeni mesajlar için en fazla max_delay kadar bekler.
+        
+        Args:
+            timeout: İlk mesaj için maksimum bekleme süresi (None: süresiz)
+            max_bytes: Tek yazmanın byte üst sınırı
+            max_delay: Yoğunlukta ek mesajlar için maksimum bekleme (saniye)
+            
+        Returns:
+            str: Birleştirilmiş SSE mesajları; zaman aşımı veya kapanışta None
+        """
+        with self._condition:
+            if not self._buffer and not self.closed:
+                self._condition.wait(timeout)
+            if not self._buffer:
+                return None
+            
+            parts = []
+            size = 0
+            deadline = None
+            while True:
+                while self._buffer:
+                    msg_size = len(self._buffer[0][1])
+                    if parts and size + msg_size > max_bytes:
+                        break
+                    _, msg = self._buffer.popleft()
+                    parts.append(msg)
+                    size += msg_size
+                
+                # Byte sınırı doldu, tek mesaj vardı (yük yok) veya client kapandı
+                if self._buffer or len(parts) < 2 or self.closed or max_delay <= 0:
+                    break
+                
+                if deadline is None:
+                    deadline = time.monotonic() + max_delay
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._condition.wait(remaining):
+                    break
+            
+            self.stats["delivered"] += len(parts)
+            self.stats["writes"] += 1
+            if len(parts) > 1:
+                self.stats["batched_writes"] += 1
+            return "".join(parts)
+    
+    def begin_write(self):
+        """Socket'e yazma başlamadan önce çağrılır"""
+        self.write_started_at = time.monotonic()
+    
+    def end_write(self):
+        """Yazma tamamlanıp generator devam ettiğinde çağrılır"""
+        self.write_started_at = None
+    
+    def write_stalled_for(self) -> float:
+        """Devam eden yazmanın süresi (yazma yoksa 0)"""
+        started = self.write_started_at
+        return time.monotonic() - started if started is not None else 0.0
+    
+    def close(self):
+        """Client'ı kapatır ve bekleyen get çağrısını uyandırır"""
+        with self._condition:
+            self.closed = True
+            self._buffer.clear()
+            self._condition.notify_all()
+    
+    @property
+    def lag(self) -> int:
+        """Client'a henüz yazılmamış mesaj sayısı"""
+        return len(self._buffer)
 
 
 class EventBroadcaster:
     """
     Server-Sent Events broadcaster
     
-    Tüm bağlı client'lara event'leri yayınlar.
-    Thread-safe çalışır.
+    Event'leri abonelik filtreleri eşleşen client'lara yayınlar.
+    Client'lar correlationId, userId veya filtresiz (wildcard) olarak
+    indekslenir; böylece bir event yalnızca ilgili client'lara dağıtılır.
+    Thread-safe çalışır; aday client'lar kilit altında seçilir,
+    mesajlar kilit dışında her client'ın sınırlı buffer'ına yazılır.
     """
     
+    # events/sec hesaplamasında kullanılan kayan pencere (saniye)
+    RATE_WINDOW_SECONDS = 10
+    
+    # Tutulan en fazla single-flight leader → follower correlationId eşlemesi
+    MAX_CORRELATION_ALIASES = 1024
+    
     def __init__(self, publisher_queue: Queue):
         """
         Broadcaster'ı başlatır
@@ -40,75 +254,467 @@ class EventBroadcaster:
         Args:
             publisher_queue: Event yayınlama kuyruğu
         """
+        sse_config = config.get_sse_config()
+        self.client_buffer_size = sse_config["client_buffer_size"]
+        self.slow_client_policy = sse_config["slow_client_policy"]
+        self.heartbeat_interval = sse_config["heartbeat_interval"]
+        self.write_timeout = sse_config["write_timeout"]
+        self.batch_enabled = sse_config["batch_enabled"]
+        self.batch_max_bytes = sse_config["batch_max_bytes"]
+        self.batch_max_delay = sse_config["batch_max_delay_ms"] / 1000.0
+        self.allow_wildcard = sse_config["allow_wildcard"]
+        # UI'nin birleştirdiği delta event'leri coalesce edilmez (eskisi atılırsa metin eksik kalır)
+        self.delta_events = frozenset({config.LLM_STREAMING["TOKEN_EVENT"]})
+        
         self.publisher_queue = publisher_queue
         self.clients = []
         self.clients_lock = threading.Lock()
-        self._start_broadcaster()
+        self.dropped_clients = 0
+        
+        # Abonelik indeksleri: correlationId -> client'lar, userId -> client'lar, filtresizler
+        self._by_correlation: Dict[str, set] = {}
+        self._by_user: Dict[str, set] = {}
+        self._wildcard: set = set()
+        
+        # Single-flight eşlemeleri: leader correlationId -> bağlanan follower correlationId'leri.
+        # "workflow-attached" event'iyle öğrenilir; leader'ın event'leri follower abonelerine de gider
+        self.attached_event = config.get_workflow_single_flight_config()["attached_event"]
+        self._aliases: "OrderedDict[str, set]" = OrderedDict()
+        
+        # Replay ring buffer'ı: Last-Event-ID ile yeniden bağlanan client'lara kaçırılan event'ler
+        # Id'ler milisaniye zaman damgasından başlar; yeniden başlatmalardan sonra da artmaya devam eder
+        self.replay_max_events = sse_config["replay_max_events"]
+        self.replay_max_bytes = sse_config["replay_max_bytes"]
+        self._event_ids = itertools.count(int(time.time() * 1000))
+        self._replay = deque()
+        self._replay_bytes = 0
+        self.replayed_events = 0
+        
+        # Stream yaşam döngüsü sayaçları
+        self.reaped_clients = 0
+        self.closed_clients = 0
+        self.heartbeats_sent = 0
+        
+        # Fan-out motoru yaşam döngüsü (start / drain / stop)
+        self._engine_thread: Optional[threading.Thread] = None
+        self._reaper_thread: Optional[threading.Thread] = None
+        self._lifecycle_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._in_flight = 0
+        
+        # Throughput metrikleri: saniyelik event sayaçları ve son fan-out süreleri
+        self.events_total = 0
+        self._rate_buckets = deque(maxlen=self.RATE_WINDOW_SECONDS + 1)
+        self._fanout_latencies = deque(maxlen=1024)
     
-    def _start_broadcaster(self):
-        """Broadcaster thread'ini başlatır"""
-        def broadcaster():
-            """Event broadcaster loop'u"""
-            while True:
-                try:
-                    item = self.publisher_queue.get()
-                    if item is None:
-                        break
-                    
-                    # SSE format'ında mesaj oluştur
-                    msg = self._format_sse_message(
-                        item.get("event", "message"),
-                        item.get("data", {})
-                    )
-                    
-                    # Tüm client'lara gönder
-                    with self.clients_lock:
-                        for q in self.clients:
-                            q.put(msg)
-                            
-                except Exception as e:
-                    print(f"Broadcaster hatası: {e}")
-        
-        # Broadcaster thread'ini başlat
-        t = threading.Thread(target=broadcaster, daemon=True)
-        t.start()
+    def start(self):
+        """
+        Tek fan-out motorunu ve reaper thread'ini başlatır
+        
+        Idempotent'tir; tekrar çağrılırsa ikinci bir tüketici thread açılmaz.
+        Tüm event'ler tek thread'den kuyruk sırasıyla dağıtıldığı için aynı
+        correlationId'nin event'leri her client'a yayınlandığı sırayla ulaşır.
+        """
+        with self._lifecycle_lock:
+            if self._engine_thread is not None and self._engine_thread.is_alive():
+                return
+            
+            self._stopping.clear()
+            self._engine_thread = threading.Thread(target=self._run, name="sse-fanout", daemon=True)
+            self._engine_thread.start()
+            
+            if self._reaper_thread is None or not self._reaper_thread.is_alive():
+                self._reaper_thread = threading.Thread(target=self._reap, name="sse-reaper", daemon=True)
+                self._reaper_thread.start()
+        
         print("✅ Event broadcaster başlatıldı")
     
-    def _format_sse_message(self, event_name: str, data: Dict[str, Any]) -> str:
+    def drain(self, timeout: float = 5.0) -> bool:
+        """
+        Kuyrukta bekleyen event'lerin dağıtılmasını bekler
+        
+        Args:
+            timeout: Maksimum bekleme süresi (saniye)
+            
+        Returns:
+            bool: Kuyruk zamanında boşaldıysa True
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.publisher_queue.qsize() == 0 and self._in_flight == 0:
+                return True
+            time.sleep(0.01)
+        return False
+    
+    def stop(self, timeout: float = 5.0) -> bool:
+        """
+        Bekleyen event'leri dağıttıktan sonra fan-out motorunu durdurur
+        
+        Durdurma sinyali (None) kuyruğun sonuna eklenir; böylece önceden
+        yayınlanmış event'ler client'lara ulaştırılır.
+        
+        Args:
+            timeout: Maksimum bekleme süresi (saniye)
+            
+        Returns:
+            bool: Motor zamanında durduysa True
+        """
+        with self._lifecycle_lock:
+            thread = self._engine_thread
+            self._stopping.set()
+            if thread is None or not thread.is_alive():
+                return True
+            self.publisher_queue.put(None)
+        
+        thread.join(timeout)
+        stopped = not thread.is_alive()
+        print("🛑 Event broadcaster durduruldu" if stopped else "⚠️ Event broadcaster zamanında durmadı")
+        return stopped
+    
+    def _run(self):
+        """Fan-out motoru loop'u - kuyruktaki event'leri sırayla dağıtır"""
+        while True:
+            try:
+                item = self.publisher_queue.get()
+                if item is None:
+                    break
+                
+                self._in_flight = 1
+                started = time.perf_counter()
+                self._fan_out(item)
+                self._record_fanout(time.perf_counter() - started)
+            except Exception as e:
+                print(f"Broadcaster hatası: {e}")
+            finally:
+                self._in_flight = 0
+    
+    def _fan_out(self, item: Dict[str, Any]):
+        """
+        Tek bir event'i ilgili client'ların buffer'larına dağıtır
+        
+        Args:
+            item: publisher_queue öğesi
+        """
+        event_name = item.get("event", "message")
+        data = item.get("data", {})
+        user_id, correlation_id = self._routing_keys(item)
+        
+        # SSE format'ında, artan id'li mesaj oluştur
+        # (redis-streams backend'i tüm worker'larda ortak id'yi zarfa ekler)
+        event_id = item.get("id") or next(self._event_ids)
+        msg = self._format_sse_message(event_name, data, event_id)
+        
+        # Replay buffer'a ekle ve ilgili client'ları seç; aynı kilit altında
+        # yapıldığı için yeni bağlanan client event'i ya replay'de ya canlı alır
+        with self.clients_lock:
+            if event_name == self.attached_event and isinstance(data, dict):
+                self._add_alias(data.get("leaderCorrelationId"), data.get("correlationId"))
+            self._remember_event(event_id, event_name, user_id, correlation_id, msg)
+            candidates = self._candidate_clients(user_id, correlation_id)
+            aliases = set(self._aliases.get(correlation_id, ())) if correlation_id is not None else set()
+        
+        clients = [c for c in candidates if self._client_matches(c, event_name, user_id, correlation_id, aliases)]
+        coalesce_key = self._coalesce_key(event_name, data)
+        for client in clients:
+            if not client.put(msg, coalesce_key):
+                print("⚠️ Yavaş SSE client'ı bağlantıdan düşürüldü")
+                self.dropped_clients += 1
+                self.remove_client(client)
+    
+    def _record_fanout(self, duration: float):
+        """Fan-out süresini ve saniyelik event sayacını kaydeder"""
+        self.events_total += 1
+        self._fanout_latencies.append(duration)
+        
+        second = int(time.time())
+        if self._rate_buckets and self._rate_buckets[-1][0] == second:
+            self._rate_buckets[-1][1] += 1
+        else:
+            self._rate_buckets.append([second, 1])
+    
+    def _reap(self):
+        """Reaper loop'u - yazması write_timeout'u aşan ölü stream'leri temizler"""
+        interval = max(min(self.write_timeout, self.heartbeat_interval) / 2.0, 1.0)
+        while not self._stopping.wait(interval):
+            try:
+                with self.clients_lock:
+                    clients = list(self.clients)
+                
+                for client in clients:
+                    if client.write_stalled_for() > self.write_timeout:
+                        print(f"💀 Ölü SSE bağlantısı temizlendi (yazma {client.write_stalled_for():.0f}s bloklu)")
+                        self.reaped_clients += 1
+                        self.remove_client(client)
+            except Exception as e:
+                print(f"SSE reaper hatası: {e}")
+    
+    def get_engine_stats(self) -> Dict[str, Any]:
+        """
+        Fan-out motorunun throughput metriklerini döndürür
+        
+        Returns:
+            Dict[str, Any]: events/sec, kuyruk derinliği ve fan-out gecikmesi (ms)
+        """
+        now = int(time.time())
+        window_start = now - self.RATE_WINDOW_SECONDS
+        # İçinde bulunulan (tamamlanmamış) saniye hariç tutulur
+        recent = sum(count for second, count in list(self._rate_buckets) if window_start <= second < now)
+        
+        latencies = sorted(self._fanout_latencies)
+        if latencies:
+            latency = {
+                "avg_ms": round(sum(latencies) / len(latencies) * 1000, 3),
+                "p95_ms": round(latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)] * 1000, 3),
+                "max_ms": round(latencies[-1] * 1000, 3)
+            }
+        else:
+            latency = {"avg_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+        
+        return {
+            "running": self._engine_thread is not None and self._engine_thread.is_alive(),
+            "events_total": self.events_total,
+            "events_per_sec": round(recent / self.RATE_WINDOW_SECONDS, 2),
+            "queue_depth": self.publisher_queue.qsize(),
+            "fanout_latency": latency
+        }
+    
+    def _routing_keys(self, item: Dict[str, Any]) -> tuple:
+        """
+        Event'in userId ve correlationId routing anahtarlarını çıkarır
+        
+        Önce kuyruk öğesindeki zarf alanlarına, yoksa event verisine
+        (ve data.payload'a) bakılır.
+        
+        Args:
+            item: publisher_queue öğesi
+            
+        Returns:
+            tuple: (user_id, correlation_id)
+        """
+        data = item.get("data")
+        sources = [item]
+        if isinstance(data, dict):
+            sources.append(data)
+            if isinstance(data.get("payload"), dict):
+                sources.append(data["payload"])
+        
+        user_id = next((src["userId"] for src in sources if src.get("userId")), None)
+        correlation_id = next((src["correlationId"] for src in sources if src.get("correlationId")), None)
+        return user_id, correlation_id
+    
+    def _candidate_clients(self, user_id: Optional[str], correlation_id: Optional[str]) -> list:
+        """
+        İndekslerden event'i alabilecek aday client'ları seçer (clients_lock tutulmalı)
+        
+        Maliyet toplam bağlantı sayısıyla değil, ilgili client sayısıyla orantılıdır.
+        Routing anahtarı olmayan event'ler yalnızca filtresiz client'lara gider.
+        """
+        candidates = list(self._wildcard)
+        if user_id is not None:
+            candidates.extend(self._by_user.get(user_id, ()))
+        if correlation_id is not None:
+            candidates.extend(self._by_correlation.get(correlation_id, ()))
+            for alias in self._aliases.get(correlation_id, ()):
+                candidates.extend(self._by_correlation.get(alias, ()))
+        return candidates
+    
+    def _add_alias(self, leader_id: Optional[str], follower_id: Optional[str]):
+        """Follower correlationId'sini leader'ın event'lerine bağlar (clients_lock tutulmalı)"""
+        if not leader_id or not follower_id or leader_id == follower_id:
+            return
+        self._aliases.setdefault(leader_id, set()).add(follower_id)
+        self._aliases.move_to_end(leader_id)
+        while len(self._aliases) > self.MAX_CORRELATION_ALIASES:
+            self._aliases.popitem(last=False)
+    
+    def _client_matches(self, client: ClientStream, event_name: str, user_id: Optional[str],
+                        correlation_id: Optional[str], aliases: set) -> bool:
+        """
+        Client'ın event'i alıp almayacağını single-flight eşlemeleriyle birlikte kontrol eder
+        
+        Leader'ın event'i, leader'a bağlanmış bir follower'ın correlationId'sine
+        abone olan client'a da gönderilir.
+        """
+        if client.matches(event_name, user_id, correlation_id):
+            return True
+        return client.correlation_id in aliases and client.matches(event_name, user_id, client.correlation_id)
+    
+    def _remember_event(self, event_id: int, event_name: str, user_id: Optional[str],
+                        correlation_id: Optional[str], msg: str):
+        """
+        Event'i replay ring buffer'ına ekler (clients_lock tutulmalı)
+        
+        Buffer hem event sayısı hem toplam byte ile sınırlıdır; en eski
+        event'ler önce atılır.
+        """
+        size = len(msg.encode("utf-8"))
+        self._replay.append((event_id, event_name, user_id, correlation_id, msg, size))
+        self._replay_bytes += size
+        while self._replay and (
+            len(self._replay) > self.replay_max_events or self._replay_bytes > self.replay_max_bytes
+        ):
+            self._replay_bytes -= self._replay.popleft()[5]
+    
+    def _index_for(self, client: ClientStream) -> tuple:
+        """Client'ın kayıtlı olduğu indeksi ve anahtarını döndürür"""
+        if client.correlation_id is not None:
+            return self._by_correlation, client.correlation_id
+        if client.user_id is not None:
+            return self._by_user, client.user_id
+        return None, None
+    
+    def _coalesce_key(self, event_name: str, data: Dict[str, Any]) -> Optional[tuple]:
+        """
+        coalesce politikası için event'in yerini alabileceği anahtarı üretir
+        
+        agent-token gibi birbirine eklenen delta event'leri birbirinin yerini
+        alamaz; None döner ve bu event'ler drop-oldest ile düşer.
+        """
+        if event_name in self.delta_events:
+            return None
+        if not isinstance(data, dict):
+            return (event_name,)
+        return (event_name, data.get("agent"), data.get("correlationId"))
+    
+    def _format_sse_message(self, event_name: str, data: Dict[str, Any], event_id: Optional[int] = None) -> str:
         """
         SSE format'ında mesaj oluşturur
         
         Args:
             event_name: Event adı
             data: Event verisi
+            event_id: Last-Event-ID ile devam için artan event id'si
             
         Returns:
             str: SSE format'ında mesaj
         """
-        return f"event: {event_name}\ndata: {json.dumps(data)}\n\n"
+        id_line = f"id: {event_id}\n" if event_id is not None else ""
+        return f"{id_line}event: {event_name}\ndata: {json.dumps(data)}\n\n"
+    
+    def create_client(self, user_id: Optional[str] = None, correlation_id: Optional[str] = None,
+                      events: Optional[frozenset] = None, last_event_id: Optional[int] = None) -> tuple:
+        """
+        Yapılandırılmış buffer boyutu ve politikayla yeni client oluşturup ekler
+        
+        Client kaydı ve replay buffer okuması aynı kilit altında yapılır;
+        böylece hiçbir event kaçırılmaz veya iki kez gönderilmez.
+        
+        Args:
+            user_id: userId abonelik filtresi
+            correlation_id: correlationId abonelik filtresi
+            events: Event tipi filtresi
+            last_event_id: Client'ın aldığı son event id'si (Last-Event-ID)
+            
+        Returns:
+            tuple: (ClientStream, replay edilecek SSE mesajları listesi)
+        """
+        client = ClientStream(
+            self.client_buffer_size, self.slow_client_policy,
+            user_id=user_id, correlation_id=correlation_id, events=events
+        )
+        with self.clients_lock:
+            self._register_client(client)
+            replay = []
+            if last_event_id is not None:
+                replay = [
+                    msg for event_id, event_name, event_user, event_correlation, msg, _ in self._replay
+                    if event_id > last_event_id and self._client_matches(
+                        client, event_name, event_user, event_correlation,
+                        self._aliases.get(event_correlation, ())
+                    )
+                ]
+        
+        if replay:
+            self.replayed_events += len(replay)
+            print(f"🔁 SSE client için {len(replay)} event replay ediliyor (Last-Event-ID: {last_event_id})")
+        return client, replay
     
-    def add_client(self, client_queue: Queue):
+    def add_client(self, client: ClientStream):
         """
         Yeni client ekler
         
         Args:
-            client_queue: Client queue'su
+            client: Client buffer'ı
         """
         with self.clients_lock:
-            self.clients.append(client_queue)
+            self._register_client(client)
+    
+    def _register_client(self, client: ClientStream):
+        """Client'ı listeye ve abonelik indeksine ekler (clients_lock tutulmalı)"""
+        self.clients.append(client)
+        index, key = self._index_for(client)
+        if index is None:
+            self._wildcard.add(client)
+        else:
+            index.setdefault(key, set()).add(client)
     
-    def remove_client(self, client_queue: Queue):
+    def remove_client(self, client: ClientStream):
         """
         Client'ı kaldırır
         
         Args:
-            client_queue: Kaldırılacak client queue'su
+            client: Kaldırılacak client buffer'ı
         """
         with self.clients_lock:
             try:
-                self.clients.remove(client_queue)
+                self.clients.remove(client)
             except ValueError:
-                pass
+                return
+            self.closed_clients += 1
+            index, key = self._index_for(client)
+            if index is None:
+                self._wildcard.discard(client)
+            else:
+                subscribers = index.get(key)
+                if subscribers is not None:
+                    subscribers.discard(client)
+                    if not subscribers:
+                        del index[key]
+        client.close()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Client bazlı lag ve drop sayaçlarını döndürür
+        
+        Returns:
+            Dict[str, Any]: Broadcaster istatistikleri
+        """
+        with self.clients_lock:
+            clients = list(self.clients)
+        
+        now = time.time()
+        client_stats = [
+            dict(
+                client.stats,
+                lag=client.lag,
+                age_seconds=round(now - client.created_at, 1),
+                write_stalled_seconds=round(client.write_stalled_for(), 1)
+            )
+            for client in clients
+        ]
+        return {
+            "engine": self.get_engine_stats(),
+            "connected_clients": len(clients),
+            "live_streams": len(clients),
+            "reaped_streams": self.reaped_clients,
+            "closed_streams": self.closed_clients,
+            "heartbeats_sent": self.heartbeats_sent,
+            "wildcard_clients": len(self._wildcard),
+            "indexed_users": len(self._by_user),
+            "indexed_correlations": len(self._by_correlation),
+            "correlation_aliases": len(self._aliases),
+            "client_buffer_size": self.client_buffer_size,
+            "slow_client_policy": self.slow_client_policy,
+            "dropped_clients": self.dropped_clients,
+            "replay_buffer_events": len(self._replay),
+            "replay_buffer_bytes": self._replay_bytes,
+            "replayed_events": self.replayed_events,
+            "total_lag": sum(stats["lag"] for stats in client_stats),
+            "total_dropped": sum(stats["dropped"] for stats in client_stats),
+            "total_writes": sum(stats["writes"] for stats in client_stats),
+            "total_batched_writes": sum(stats["batched_writes"] for stats in client_stats),
+            "clients": client_stats
+        }
 
 
 class APIHandler:
@@ -133,6 +739,15 @@ class APIHandler:
         self.publisher_queue = publisher_queue
         self.workflow = workflow
         self.broadcaster = broadcaster
+        self.metrics_providers = {}
+        
+        # Deposit ve kullanıcı eylemi işleri için sınırlı worker havuzu (admission control)
+        self.workflow_executor = WorkflowExecutor()
+        self.register_metrics("workflow_executor", self.workflow_executor.get_stats)
+        self.register_metrics("workflow_results", workflow_results.get_stats)
+        self.register_metrics("workflow_idempotency", workflow_idempotency.get_stats)
+        self.register_metrics("workflow_single_flight", workflow_singleflight.get_stats)
+        
         self._register_routes()
     
     def _register_routes(self):
@@ -167,6 +782,8 @@ class APIHandler:
             Returns:
                 202: İşlem kabul edildi
                 400: Geçersiz request
+                429: Workflow kuyruğu dolu (Retry-After header'ı ile)
+                503: Uygulama kapanıyor (Retry-After header'ı ile)
             """
             print("🎯 simulate_deposit route çağrıldı")
             return self._handle_simulate_deposit()
@@ -190,6 +807,8 @@ class APIHandler:
             Returns:
                 202: Eylem kabul edildi
                 400: Geçersiz request
+                429: Workflow kuyruğu dolu (Retry-After header'ı ile)
+                503: Uygulama kapanıyor (Retry-After header'ı ile)
             """
             return self._handle_user_action()
         
@@ -278,11 +897,35 @@ class APIHandler:
             Web UI'nin agent çıktılarını ve bildirimleri
             gerçek zamanlı olarak almasını sağlar.
             
+            Query Parameters (abonelik filtreleri):
+                userId: Yalnızca bu kullanıcının event'leri
+                correlationId: Yalnızca bu workflow'un event'leri
+                events: Virgülle ayrılmış event tipleri (ör. agent-output,notification)
+            
+            userId veya correlationId zorunludur; filtresiz abonelik yalnızca
+            SSE_ALLOW_WILDCARD=true iken kabul edilir.
+            
             Returns:
                 text/event-stream: SSE stream
+                400: userId / correlationId eksik
             """
             return self._handle_stream()
         
+        @self.app.route("/workflow/<correlation_id>", methods=["GET"])
+        def workflow_status(correlation_id):
+            """
+            Workflow durum endpoint'i
+            
+            correlationId ile başlatılan workflow'un durumunu, node bazlı
+            sürelerini ve final sonucunu döndürür. Polling yapan veya yeniden
+            bağlanan client'lar SSE stream'i açık tutmadan sonuca ulaşır.
+            
+            Returns:
+                200: Workflow kaydı (status: queued, running, completed, failed)
+                404: Bilinmeyen veya süresi dolmuş correlationId
+            """
+            return self._handle_workflow_status(correlation_id)
+        
         @self.app.route("/health", methods=["GET"])
         def health_check():
             """
@@ -296,6 +939,19 @@ class APIHandler:
             """
             return self._handle_health_check()
         
+        @self.app.route("/metrics", methods=["GET"])
+        def metrics():
+            """
+            Performans metrikleri endpoint'i
+            
+            Bağlantı havuzu ve servis katmanı sayaçlarını
+            JSON olarak raporlar.
+            
+            Returns:
+                200: Metrik JSON'u
+            """
+            return self._handle_metrics()
+        
         @self.app.route("/kafka/publish", methods=["POST"])
         def kafka_publish():
             """
@@ -339,7 +995,8 @@ class APIHandler:
             print(f"✅ JSON payload alındı: {event}")
             
             # Correlation ID'yi ayarla
-            correlation_id = event.get("correlation_id") or event.get("meta", {}).get("correlationId") or f"corr-{int(time.time())}"
+            # Üretilen ID'ler benzersiz olmalı; aynı saniyedeki iki deposit idempotency ile birleşmesin
+            correlation_id = event.get("correlation_id") or event.get("meta", {}).get("correlationId") or f"corr-{int(time.time())}-{uuid.uuid4().hex[:8]}"
             print(f"🔗 Correlation ID: {correlation_id}")
             
             # Request'i workflow formatına çevir
@@ -354,14 +1011,11 @@ class APIHandler:
             }
             print(f"🔄 Workflow event oluşturuldu: {workflow_event}")
             
-            # Workflow'u background thread'de başlat
-            print(f"🧵 Background thread başlatılıyor...")
-            thread = threading.Thread(
-                target=self._process_deposit_workflow, 
-                args=(workflow_event,)
-            )
-            thread.start()
-            print(f"✅ Background thread başlatıldı: {thread.is_alive()}")
+            # Workflow'u sınırlı kapasiteyle başlat; kapasite doluysa 429 döndür
+            if not self._submit_deposit(workflow_event):
+                return self._busy_response()
+            workflow_results.mark_queued(correlation_id, workflow_event["payload"]["userId"], workflow_event["payload"]["amount"])
+            print(f"✅ Workflow kuyruğa alındı: {correlation_id}")
             
             return jsonify({
                 "status": "accepted",
@@ -389,18 +1043,16 @@ class APIHandler:
             if not user_id:
                 return jsonify({"error": "userId gerekli"}), 400
             
+            # Finalize işlemini worker havuzuna gönder; kapasite doluysa yan etki oluşturmadan reddet
+            if not self.workflow_executor.submit(self._finalize_user_action, payload):
+                return self._busy_response()
+            
             # Redis'e kullanıcı eylemini kaydet
             service_manager.redis_service.set_user_action(user_id, payload)
             
             # Event'i yayınla
             self.publisher_queue.put({"event": "user-action", "data": payload})
             
-            # Finalize işlemini background thread'de başlat
-            threading.Thread(
-                target=self._finalize_user_action, 
-                args=(payload,)
-            ).start()
-            
             return jsonify({"status": "accepted"}), 202
             
         except Exception as e:
@@ -609,25 +1261,109 @@ Sonuç: Kullanıcı önerileri beğenmedi
         Server-Sent Events stream'i işler
         
         Returns:
-            Response: SSE stream response
+            Response: SSE stream response (userId / correlationId eksikse 400)
         """
+        # Abonelik filtrelerini oku (filtresiz client tüm kullanıcıların event'lerini alır)
+        user_id = request.args.get("userId") or None
+        correlation_id = request.args.get("correlationId") or None
+        if user_id is None and correlation_id is None and not self.broadcaster.allow_wildcard:
+            return jsonify({"error": "userId veya correlationId gerekli"}), 400
+        events = request.args.get("events")
+        events = frozenset(e.strip() for e in events.split(",") if e.strip()) if events else None
+        
+        # Yeniden bağlanan EventSource Last-Event-ID header'ını otomatik gönderir
+        last_event_id = request.headers.get("Last-Event-ID") or request.args.get("lastEventId")
+        try:
+            last_event_id = int(last_event_id) if last_event_id else None
+        except ValueError:
+            last_event_id = None
+        
         def generate():
             """SSE event generator"""
-            # Yeni client queue'su oluştur
-            q = Queue()
-            self.broadcaster.add_client(q)
+            # Yeni client buffer'ı oluştur ve kaçırılan event'leri al
+            client, replay = self.broadcaster.create_client(user_id, correlation_id, events or None, last_event_id)
             
             try:
-                while True:
-                    # Queue'dan mesaj al
-                    msg = q.get()
+                # Önce replay, ardından canlı event'ler (replay'deki id'ler her zaman daha küçüktür)
+                for msg in self._batch_messages(replay):
+                    client.begin_write()
+                    yield msg
+                    client.end_write()
+                
+                broadcaster = self.broadcaster
+                while not client.closed:
+                    # Buffer'dan mesaj al; heartbeat süresi içinde mesaj yoksa yorum satırı gönder
+                    # (proxy'ler bağlantıyı açık tutar, ölü TCP bağlantısı yazma hatasıyla fark edilir)
+                    # Batch modunda bekleyen mesajlar tek yazmada birleştirilir
+                    if broadcaster.batch_enabled:
+                        msg = client.get_batch(
+                            broadcaster.heartbeat_interval,
+                            broadcaster.batch_max_bytes,
+                            broadcaster.batch_max_delay
+                        )
+                    else:
+                        msg = client.get(timeout=broadcaster.heartbeat_interval)
+                    if msg is None:
+                        if client.closed:
+                            break
+                        msg = ": heartbeat\n\n"
+                        self.broadcaster.heartbeats_sent += 1
+                    
+                    client.begin_write()
                     yield msg
-            except GeneratorExit:
-                # Client disconnect olduğunda queue'yu temizle
-                self.broadcaster.remove_client(q)
+                    client.end_write()
+            finally:
+                # Client disconnect olduğunda veya düşürüldüğünde buffer'ı temizle
+                self.broadcaster.remove_client(client)
         
         return Response(generate(), mimetype="text/event-stream")
     
+    def _batch_messages(self, messages: list) -> list:
+        """
+        Mesaj listesini byte sınırını aşmayan yazma parçalarına birleştirir
+        
+        Args:
+            messages: SSE mesajları
+            
+        Returns:
+            list: Birleştirilmiş yazma parçaları
+        """
+        if not self.broadcaster.batch_enabled:
+            return messages
+        
+        chunks, parts, size = [], [], 0
+        for msg in messages:
+            if parts and size + len(msg) > self.broadcaster.batch_max_bytes:
+                chunks.append("".join(parts))
+                parts, size = [], 0
+            parts.append(msg)
+            size += len(msg)
+        if parts:
+            chunks.append("".join(parts))
+        return chunks
+    
+    def _handle_workflow_status(self, correlation_id: str) -> tuple:
+        """
+        Workflow durum sorgusunu işler
+        
+        Args:
+            correlation_id: Workflow correlation ID'si
+            
+        Returns:
+            tuple: (response_data, status_code)
+        """
+        try:
+            record = workflow_results.get(correlation_id)
+            if record is None:
+                return jsonify({
+                    "error": "Workflow bulunamadı",
+                    "correlationId": correlation_id
+                }), 404
+            return jsonify(record), 200
+        except Exception as e:
+            print(f"Workflow durum hatası: {e}")
+            return jsonify({"error": str(e)}), 500
+    
     def _handle_health_check(self) -> tuple:
         """
         Servis sağlık kontrolünü işler
@@ -642,13 +1378,26 @@ Sonuç: Kullanıcı önerileri beğenmedi
             # Workflow durumunu ekle
             services_status["workflow"] = self.workflow.is_ready()
             
+            # Başlatılma durumları (servisler lazy / arka planda bağlanır)
+            readiness = service_manager.get_readiness()
+            readiness["llm"] = self.workflow.llm_status
+            warming = any(state in ("pending", "initializing", "warming") for state in readiness.values())
+            
             # Genel sağlık durumunu belirle
             all_healthy = all(services_status.values())
-            status = "healthy" if all_healthy else "degraded"
+            shutting_down = self.workflow_executor.closed
+            if shutting_down:
+                status = "shutting_down"
+            elif all_healthy:
+                status = "healthy"
+            else:
+                status = "starting" if warming else "degraded"
             
             return jsonify({
                 "status": status,
-                "services": services_status
+                "ready": not warming and not shutting_down,
+                "services": services_status,
+                "readiness": readiness
             }), 200
             
         except Exception as e:
@@ -658,6 +1407,32 @@ Sonuç: Kullanıcı önerileri beğenmedi
                 "error": str(e)
             }), 500
     
+    def register_metrics(self, name: str, provider):
+        """
+        /metrics çıktısına ek bir metrik kaynağı ekler
+        
+        Args:
+            name: Metrik grubunun adı
+            provider: Metrik dictionary'si döndüren fonksiyon
+        """
+        self.metrics_providers[name] = provider
+    
+    def _handle_metrics(self) -> tuple:
+        """
+        Performans metriklerini işler
+        
+        Returns:
+            tuple: (response_data, status_code)
+        """
+        try:
+            metrics = service_manager.get_metrics()
+            for name, provider in self.metrics_providers.items():
+                metrics[name] = provider()
+            return jsonify(metrics), 200
+        except Exception as e:
+            print(f"Metrics hatası: {e}")
+            return jsonify({"error": str(e)}), 500
+    
     def _handle_kafka_publish(self) -> tuple:
         """
         Kafka event yayınlamayı işler
@@ -677,8 +1452,8 @@ Sonuç: Kullanıcı önerileri beğenmedi
             if not topic:
                 return jsonify({"error": "Topic gerekli"}), 400
             
-            # Kafka'ya event yayınla
-            success = service_manager.kafka_service.publish_event(topic, data)
+            # Kafka'ya event yayınla (teslim sonucu raporlanacağı için senkron)
+            success = service_manager.kafka_service.publish_event(topic, data, wait=True)
             
             if success:
                 return jsonify({
@@ -697,6 +1472,69 @@ Sonuç: Kullanıcı önerileri beğenmedi
                 "detail": str(e)
             }), 500
     
+    def _busy_response(self) -> tuple:
+        """
+        Workflow executor doluyken dönülecek 429 yanıtı (kapanıyorsa 503)
+        
+        Returns:
+            tuple: (response_data, status_code, headers)
+        """
+        retry_after = self.workflow_executor.retry_after
+        if self.workflow_executor.closed:
+            # Rolling restart: istemci diğer instance'a veya yeniden başlayan sürece tekrar denesin
+            return jsonify({
+                "error": "Sistem yeniden başlatılıyor, lütfen daha sonra tekrar deneyin",
+                "retryAfter": retry_after
+            }), 503, {"Retry-After": str(retry_after)}
+        return jsonify({
+            "error": "Sistem şu anda yoğun, lütfen daha sonra tekrar deneyin",
+            "retryAfter": retry_after
+        }), 429, {"Retry-After": str(retry_after)}
+    
+    def _submit_deposit(self, event: Dict[str, Any]) -> bool:
+        """
+        Deposit workflow'unu executor kapasitesinden slot alarak başlatır
+        
+        Async workflow hazırsa deposit event loop'ta coroutine olarak çalışır ve
+        worker thread'i tutmaz; aksi halde worker havuzunda senkron çalışır. İki
+        durumda da aynı anda en fazla max_concurrency deposit çalışır.
+        
+        Args:
+            event: Event verisi
+            
+        Returns:
+            bool: Kabul edildiyse True, kapasite doluysa False
+        """
+        if self.workflow.is_async and self.workflow.is_ready():
+            initial_state = self._deposit_initial_state(event)
+            if initial_state is not None:
+                return self.workflow_executor.submit_future(
+                    lambda: self.workflow.submit_execute(initial_state),
+                    lambda future: self._finish_async_deposit(event, future)
+                )
+        return self.workflow_executor.submit(self._process_deposit_workflow, event)
+    
+    def _finish_async_deposit(self, event: Dict[str, Any], future):
+        """
+        Event loop'ta biten deposit workflow'unun sonucunu işler (executor worker'ında çalışır)
+        
+        Args:
+            event: Event verisi
+            future: submit_execute Future'ı
+        """
+        if future.cancelled():
+            # Kapanışta loop'taki workflow iptal edildi; fallback başlatılmaz
+            print(f"⚠️ Workflow kapanışta iptal edildi: {event.get('payload', {}).get('userId')}")
+            return
+        
+        try:
+            result = future.result()
+            print(f"✅ Workflow tamamlandı: {result}")
+        except Exception as e:
+            print(f"❌ Workflow hatası: {e}")
+            print("🔄 Fallback'e geçiliyor...")
+            self._process_deposit_fallback(event)
+    
     def _process_deposit_workflow(self, event: Dict[str, Any]):
         """
         Maaş yatışı workflow'unu işler
@@ -707,15 +1545,8 @@ Sonuç: Kullanıcı önerileri beğenmedi
         try:
             print(f"🔄 Deposit workflow başlatılıyor: {event}")
             
-            payload = event.get("payload", {})
-            user_id = payload.get("userId")
-            amount = payload.get("amount")
-            correlation_id = event.get('meta', {}).get('correlationId', f"corr-{int(time.time())}")
-            
-            print(f"📊 Parsed data - User: {user_id}, Amount: {amount}, Correlation: {correlation_id}")
-            
-            if not user_id or not amount:
-                print("❌ Geçersiz event: userId veya amount eksik")
+            initial_state = self._deposit_initial_state(event)
+            if initial_state is None:
                 return
             
             # Workflow hazır değilse fallback kullan
@@ -730,18 +1561,6 @@ Sonuç: Kullanıcı önerileri beğenmedi
             # Gerçek workflow'u çalıştır
             print("🚀 Gerçek workflow başlatılıyor...")
             
-            # Initial state oluştur
-            initial_state: FinancialState = {
-                "userId": user_id,
-                "amount": amount,
-                "correlationId": correlation_id,
-                "payments_output": {},
-                "risk_output": {},
-                "investment_output": {},
-                "final_message": "",
-                "user_action": ""
-            }
-            
             result = self.workflow.run(initial_state)
             
             print(f"✅ Workflow tamamlandı: {result}")
@@ -751,23 +1570,76 @@ Sonuç: Kullanıcı önerileri beğenmedi
             print("🔄 Fallback'e geçiliyor...")
             self._process_deposit_fallback(event)
     
+    def _deposit_initial_state(self, event: Dict[str, Any]) -> Optional[FinancialState]:
+        """
+        Deposit event'inden workflow başlangıç state'ini oluşturur
+        
+        Args:
+            event: Event verisi
+            
+        Returns:
+            FinancialState: Başlangıç state'i, event geçersizse None
+        """
+        payload = event.get("payload", {})
+        user_id = payload.get("userId")
+        amount = payload.get("amount")
+        correlation_id = event.get('meta', {}).get('correlationId', f"corr-{int(time.time())}")
+        
+        print(f"📊 Parsed data - User: {user_id}, Amount: {amount}, Correlation: {correlation_id}")
+        
+        if not user_id or not amount:
+            print("❌ Geçersiz event: userId veya amount eksik")
+            return None
+        
+        return {
+            "userId": user_id,
+            "amount": amount,
+            "correlationId": correlation_id,
+            "payments_output": {},
+            "risk_output": {},
+            "investment_output": {},
+            "final_message": "",
+            "user_action": ""
+        }
+    
     def _process_deposit_fallback(self, event: Dict[str, Any]):
         """
         Workflow fallback işlemi
         
         LangGraph workflow kullanılamadığında basit
-        sıralı işlem yapar.
+        sıralı işlem yapar. Workflow ile aynı idempotency kontrolünden
+        geçer; aynı correlationId ikinci kez işlenmez.
+        
+        Args:
+            event: Event verisi
+        """
+        payload = event.get("payload", {})
+        correlation_id = event.get('meta', {}).get('correlationId', f"corr-{int(time.time())}")
+        fallback_state = {
+            "userId": payload.get("userId"),
+            "amount": payload.get("amount"),
+            "correlationId": correlation_id
+        }
+        workflow_idempotency.run(fallback_state, lambda: self._run_deposit_fallback(event, correlation_id))
+    
+    def _run_deposit_fallback(self, event: Dict[str, Any], correlation_id: str) -> Dict[str, Any]:
+        """
+        Fallback pipeline'ını çalıştırır
         
         Args:
             event: Event verisi
+            correlation_id: Workflow correlation ID'si
+            
+        Returns:
+            Dict[str, Any]: Sonuç deposuna yazılan özet state
         """
         try:
             payload = event.get("payload", {})
             user_id = payload.get("userId")
             amount = payload.get("amount")
-            correlation_id = event.get('meta', {}).get('correlationId', f"corr-{int(time.time())}")
             
             print(f"🔄 Fallback workflow başlatılıyor: {user_id}")
+            workflow_results.mark_running(correlation_id, user_id, amount)
             
             # PaymentsAgent
             payments_req = {"userId": user_id, "since": None, "limit": 10}
@@ -786,7 +1658,12 @@ Sonuç: Kullanıcı önerileri beğenmedi
                 }
             }
             payments_output["type"] = "agent-output"
-            self.publisher_queue.put({"event": "agent-output", "data": payments_output})
+            self.publisher_queue.put({
+                "event": "agent-output",
+                "userId": user_id,
+                "correlationId": correlation_id,
+                "data": payments_output
+            })
             
             # RiskAgent
             risk_req = {
@@ -796,7 +1673,12 @@ Sonuç: Kullanıcı önerileri beğenmedi
             risk_res = service_manager.mcp_service.call_tool("risk.scoreTransaction", risk_req)
             risk_output = {"agent": "RiskAgent", "analysis": risk_res}
             risk_output["type"] = "agent-output"
-            self.publisher_queue.put({"event": "agent-output", "data": risk_output})
+            self.publisher_queue.put({
+                "event": "agent-output",
+                "userId": user_id,
+                "correlationId": correlation_id,
+                "data": risk_output
+            })
             
             # InvestmentAgent
             quotes = service_manager.mcp_service.call_tool("market.quotes", {
@@ -805,7 +1687,12 @@ Sonuç: Kullanıcı önerileri beğenmedi
             })
             invest_output = {"agent": "InvestmentAgent", "recommendation": quotes}
             invest_output["type"] = "agent-output"
-            self.publisher_queue.put({"event": "agent-output", "data": invest_output})
+            self.publisher_queue.put({
+                "event": "agent-output",
+                "userId": user_id,
+                "correlationId": correlation_id,
+                "data": invest_output
+            })
             
             # Coordinator
             prompt = f"User {user_id} deposit {amount}. PaymentsAgent: {payments_output['proposal']}. Risk: {risk_res}. Quotes: {quotes}."
@@ -829,10 +1716,21 @@ Sonuç: Kullanıcı önerileri beğenmedi
             }
             self.publisher_queue.put({"event": "notification", "data": notification})
             
+            result = {
+                "current_step": "fallback_completed",
+                "coordinator_output": {"message": final_message}
+            }
             print(f"✅ Fallback workflow tamamlandı: {user_id}")
             
         except Exception as e:
             print(f"❌ Fallback workflow hatası: {e}")
+            result = {
+                "current_step": "error",
+                "error": f"Fallback hatası: {str(e)}"
+            }
+        
+        workflow_results.mark_finished(correlation_id, result, mode="fallback")
+        return result
     
     def _finalize_user_action(self, payload: Dict[str, Any]):
         """
@@ -1076,6 +1974,8 @@ Analiz sonucunu JSON formatında döndür:
                     # Event'i yayınla
                     self.publisher_queue.put({
                         "event": "agent-output",
+                        "userId": user_id,
+                        "correlationId": correlation_id,
                         "data": {
                             "agent": "PaymentsAgent",
                             "action": "transfer_modified",
@@ -1119,6 +2019,8 @@ Analiz sonucunu JSON formatında döndür:
                 # Event'i yayınla
                 self.publisher_queue.put({
                     "event": "agent-output",
+                    "userId": user_id,
+                    "correlationId": correlation_id,
                     "data": {
                         "agent": "RiskAgent",
                         "action": "risk_analysis_completed",
@@ -1167,6 +2069,8 @@ Analiz sonucunu JSON formatında döndür:
             # Event'i yayınla
             self.publisher_queue.put({
                 "event": "agent-output",
+                "userId": user_id,
+                "correlationId": correlation_id,
                 "data": {
                     "agent": "InvestmentAgent",
                     "action": "investment_preference_updated",
@@ -1200,6 +2104,8 @@ Analiz sonucunu JSON formatında döndür:
             # Event'i yayınla
             self.publisher_queue.put({
                 "event": "agent-output",
+                "userId": user_id,
+                "correlationId": correlation_id,
                 "data": {
                     "agent": "GeneralAgent",
                     "action": "advice_provided",
@@ -1396,6 +2302,8 @@ Analiz sonucunu JSON formatında döndür:
                 # Event'i yayınla
                 self.publisher_queue.put({
                     "event": "agent-output",
+                    "userId": user_id,
+                    "correlationId": correlation_id,
                     "data": {
                         "type": "agent-output",
                         "agent": agent_name,
@@ -10,19 +10,29 @@ Mimari:
 - Services: Dış servis bağlantıları
 - Workflow: LangGraph multi-agent workflow
 - API: Flask REST API endpoints
-- Kafka Consumer: Event streaming
+- Kafka Consumer: Event streaming (sabit boyutlu worker havuzu)
+- Shutdown: SIGTERM'de yeni iş almayı durdurur, devam eden workflow'ları
+  bekler ve Kafka / event / embedding tamponlarını boşaltır
 """
 
+import signal
+import sys
 import threading
 import time
-from queue import Queue
+import uuid
 from flask import Flask
 from flask_cors import CORS
 
 from config import config
 from services import service_manager
 from workflow import FinancialWorkflow
+from async_workflow import AsyncFinancialWorkflow
 from api import APIHandler, EventBroadcaster
+from kafka_consumer_pool import DepositConsumerPool
+from event_bus import create_event_bus
+from http_client import http_client
+from workflow_idempotency import workflow_idempotency
+from workflow_singleflight import workflow_singleflight
 
 
 class FinancialAgenticApp:
@@ -68,24 +78,41 @@ class FinancialAgenticApp:
              allow_headers=['Content-Type', 'Authorization'],
              methods=['GET', 'POST', 'PUT', 'DELETE', 'OPTIONS'])
         
-        # Event broadcasting için queue oluştur
-        self.publisher_queue = Queue()
+        # Event broadcasting için event bus oluştur (varsayılan: süreç içi queue)
+        self.publisher_queue = create_event_bus()
         
-        # Event broadcaster'ı başlat
+        # Event broadcaster'ı başlat (tek fan-out motoru)
         self.broadcaster = EventBroadcaster(self.publisher_queue)
-        self.broadcaster._start_broadcaster()
+        self.broadcaster.start()
         
         # Finansal workflow'u oluştur
         print("🔧 Finansal Workflow başlatılıyor...")
-        self.workflow = FinancialWorkflow(self.publisher_queue)
-        print("✅ Finansal Workflow başlatıldı")
+        # WORKFLOW_ASYNC_ENABLED: deposit'ler thread yerine tek event loop'ta coroutine olarak bekler
+        workflow_class = AsyncFinancialWorkflow if config.WORKFLOW_ASYNC["ENABLED"] else FinancialWorkflow
+        self.workflow = workflow_class(self.publisher_queue)
+        print(f"✅ Finansal Workflow başlatıldı ({workflow_class.__name__})")
         
         # API handler'ı başlat
         print("🔧 API Handler başlatılıyor...")
         self.api_handler = APIHandler(self.app, self.publisher_queue, self.workflow, self.broadcaster)
+        self.api_handler.register_metrics("sse", self.broadcaster.get_stats)
+        self.api_handler.register_metrics("event_bus", self.publisher_queue.get_stats)
+        if self.workflow.is_async:
+            self.api_handler.register_metrics("async_workflow", self.workflow.get_stats)
         print("✅ API Handler başlatıldı")
         
+        # Servis bağlantılarını ve LLM testini arka planda başlat (HTTP trafiğini bloklamaz)
+        service_manager.start_warmup()
+        self.workflow.warm_up()
+        
         # Kafka consumer'ı başlat
+        self.kafka_consumer_pool = None
+        self._shutdown_lock = threading.Lock()
+        self._shutting_down = False
+        self.api_handler.register_metrics(
+            "kafka_consumer",
+            lambda: self.kafka_consumer_pool.get_stats() if self.kafka_consumer_pool else {"status": "not_started"}
+        )
         self._start_kafka_consumer()
         
         print("✅ Finansal Agentic Proje başarıyla başlatıldı")
@@ -96,13 +123,15 @@ class FinancialAgenticApp:
             """
             Kafka consumer loop'u
             
-            transactions.deposit topic'ini dinler ve
-            gelen event'leri workflow'a yönlendirir.
+            transactions.deposit topic'ini dinler ve gelen event'leri
+            sabit boyutlu worker havuzu üzerinden workflow'a yönlendirir.
             """
             try:
+                topic = config.KAFKA_TOPICS["TRANSACTIONS_DEPOSIT"]
                 consumer = service_manager.kafka_service.create_consumer(
-                    config.KAFKA_TOPICS["TRANSACTIONS_DEPOSIT"],
-                    "financial_agents_group"
+                    topic,
+                    config.get_kafka_consumer_config()["group_id"],
+                    enable_auto_commit=False
                 )
                 
                 if not consumer:
@@ -111,19 +140,12 @@ class FinancialAgenticApp:
                 
                 print("✅ Kafka consumer başlatıldı")
                 
-                for message in consumer:
-                    try:
-                        event_data = message.value
-                        print(f"📨 Kafka event alındı: {event_data}")
-                        
-                        # Workflow'u background thread'de başlat
-                        threading.Thread(
-                            target=self._handle_kafka_event,
-                            args=(event_data,)
-                        ).start()
-                        
-                    except Exception as e:
-                        print(f"❌ Kafka mesaj işleme hatası: {e}")
+                with self._shutdown_lock:
+                    if self._shutting_down:
+                        consumer.close(autocommit=False)
+                        return
+                    self.kafka_consumer_pool = DepositConsumerPool(consumer, topic, self._handle_kafka_event)
+                self.kafka_consumer_pool.run()
                         
             except Exception as e:
                 print(f"❌ Kafka consumer hatası: {e}")
@@ -143,7 +165,8 @@ class FinancialAgenticApp:
             payload = event_data.get("payload", {})
             user_id = payload.get("userId")
             amount = payload.get("amount")
-            correlation_id = event_data.get('meta', {}).get('correlationId', f"corr-{int(time.time())}")
+            # Kafka yeniden teslimlerinin tekilleştirilmesi event'in kendi correlationId'sine dayanır
+            correlation_id = event_data.get('meta', {}).get('correlationId', f"corr-{int(time.time())}-{uuid.uuid4().hex[:8]}")
             
             if not user_id or not amount:
                 print("❌ Geçersiz Kafka event: userId veya amount eksik")
@@ -180,14 +203,106 @@ class FinancialAgenticApp:
             # Fallback'e geç
             self.api_handler._process_deposit_fallback(event_data)
     
+    def shutdown(self, timeout: float = None) -> bool:
+        """
+        Uygulamayı kontrollü şekilde kapatır (idempotent)
+        
+        Sıra:
+        1. Yeni /simulate_deposit ve /action istekleri 503 ile reddedilir
+        2. Kafka consumer yeni mesaj almayı bırakır, başlamamış mesajları commit
+           etmeden bırakır, çalışanları bitirip offset'leri commit eder
+        3. Kabul edilmiş workflow'ların bitmesi beklenir; bitmeyenlerin
+           idempotency / single-flight sahiplikleri bırakılır
+        4. Embedding batch'leri, Kafka producer ve SSE event kuyruğu boşaltılır
+        5. Event bus ve HTTP bağlantı havuzları kapatılır
+        
+        Kafka worker'ları süre içinde bitmezse workflow loop'u, Kafka producer,
+        event bus ve HTTP havuzu açık bırakılır; çalışan workflow'lar süreç
+        sonlanana kadar bunları kullanmaya devam eder.
+        
+        Args:
+            timeout: Toplam kapanış bütçesi (saniye, varsayılan SHUTDOWN_TIMEOUT)
+            
+        Returns:
+            bool: Tüm workflow'lar zamanında bittiyse True
+        """
+        with self._shutdown_lock:
+            if self._shutting_down:
+                return True
+            self._shutting_down = True
+        
+        timeout = config.SHUTDOWN["TIMEOUT"] if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        
+        def remaining() -> float:
+            """Kapanış bütçesinden kalan süre (saniye)"""
+            return max(deadline - time.monotonic(), 0)
+        
+        print(f"🛑 Uygulama kapanıyor (en fazla {timeout:.0f} sn)...")
+        
+        # 1. Yeni iş kabulünü durdur
+        self.api_handler.workflow_executor.close()
+        
+        # 2. Kafka consumer: çalışan mesajları bitir ve offset'leri commit et
+        kafka_stopped = True
+        if self.kafka_consumer_pool is not None:
+            kafka_stopped = self.kafka_consumer_pool.stop(remaining())
+            if not kafka_stopped:
+                print("⚠️ Kafka consumer zamanında durmadı, paylaşılan client'lar açık bırakılıyor")
+        
+        # 3. Kabul edilmiş workflow'ları bekle
+        drained = self.api_handler.workflow_executor.drain(remaining())
+        if self.workflow.is_async and kafka_stopped:
+            self.workflow.close(remaining())
+        if not drained:
+            workflow_idempotency.abandon_in_flight()
+            workflow_singleflight.abandon_in_flight()
+        
+        # 4. Tamponları boşalt
+        try:
+            if service_manager.is_ready("ollama"):
+                if not service_manager.ollama_service.embedding_batcher.drain(remaining()):
+                    print("⚠️ Embedding batch kuyruğu zamanında boşalmadı")
+            if service_manager.is_ready("kafka") and kafka_stopped:
+                service_manager.kafka_service.close(max(remaining(), 1.0))
+        except Exception as e:
+            print(f"❌ Kapanışta tampon boşaltma hatası: {e}")
+        
+        if not self.broadcaster.stop(remaining()):
+            print("⚠️ SSE event kuyruğu zamanında boşalmadı")
+        
+        # 5. Bağlantıları kapat (Kafka worker'ları hâlâ çalışıyorsa açık kalır)
+        if kafka_stopped:
+            self.publisher_queue.close()
+            http_client.close()
+        
+        drained = drained and kafka_stopped
+        print(f"✅ Uygulama kapandı ({timeout - remaining():.1f} sn"
+              f"{'' if drained else ', yarıda kalan workflow var'})")
+        return drained
+    
+    def _install_signal_handlers(self):
+        """SIGTERM / SIGINT geldiğinde kontrollü kapanış yapar (development modu)"""
+        def handle_signal(signum, frame):
+            print(f"\n🛑 {signal.Signals(signum).name} alındı")
+            self.shutdown()
+            sys.exit(0)
+        
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, handle_signal)
+    
     def run(self):
-        """Flask uygulamasını çalıştırır"""
+        """Flask development server'ını çalıştırır (SERVER_MODE=development)"""
         print(f"🌐 Flask uygulaması başlatılıyor: {config.FLASK_HOST}:{config.FLASK_PORT}")
         
+        self._install_signal_handlers()
+        
         self.app.run(
             host=config.FLASK_HOST,
             port=config.FLASK_PORT,
-            debug=config.FLASK_DEBUG
+            debug=config.FLASK_DEBUG,
+            threaded=True,
+            use_reloader=False  # Reloader singleton'ları ikinci bir süreçte tekrar başlatır
         )
 
 
@@ -199,6 +314,13 @@ def main():
     koordine eder.
     """
     try:
+        # Production modunda singleton'lar gunicorn worker'larında oluşturulur;
+        # master süreçte hiçbir bileşen başlatılmaz
+        if config.SERVER_MODE == "production":
+            from server import run_production_server
+            run_production_server()
+            return
+        
         # Ana uygulamayı oluştur
         app = FinancialAgenticApp()
         
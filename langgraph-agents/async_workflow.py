@@ -0,0 +1,571 @@
+"""
+Finansal Agentic Proje Async LangGraph Workflow
+===============================================
+
+Bu modül FinancialWorkflow'un asyncio tabanlı varyantını sağlar.
+
+Senkron workflow'da her agent node'u MCP, Ollama ve Hugging Face çağrıları
+boyunca bir thread'i bloklar; bu yüzden her deposit için ayrı bir thread
+açılır. AsyncFinancialWorkflow aynı graph'ı LangGraph'in ainvoke metodu ile
+tek bir arka plan event loop'unda çalıştırır: binlerce deposit I/O beklerken
+binlerce OS thread'i yerine tek bir loop'ta coroutine olarak bekler.
+
+Özellikler:
+- Agent node'ları async (ChatOllama ainvoke/astream, httpx.AsyncClient)
+- LLM'in istediği ve fallback MCP çağrıları aynı anda (asyncio.gather) yapılır
+- MCP prefetch, hafıza okumaları ve hafıza güncellemeleri paralel beklenir
+- Prompt, fallback ve çıktı oluşturma senkron workflow ile ortaktır
+- Senkron yan etkiler (event bus PUBLISH/XADD, Kafka send) loop dışında yapılır:
+  token'lar sırası korunarak tek bir yayın thread'ine bırakılır, agent çıktıları
+  ve Kafka yayınları asyncio.to_thread ile beklenir
+
+Kullanım:
+- WORKFLOW_ASYNC_ENABLED=true ile app.py bu sınıfı kullanır
+- submit() thread-safe'tir ve concurrent.futures.Future döndürür
+- submit_execute() idempotency ve single-flight kontrollerini de loop'ta yapar;
+  API deposit'leri bununla başlatılır, bekleyen hiçbir thread tutulmaz
+- execute() mevcut senkron çağıranlar için idempotency kontrolü + submit().result() kısayoludur
+"""
+
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, Optional, Callable
+from queue import Queue
+
+from langchain_core.messages import AIMessage
+
+from config import config
+from services import service_manager
+from http_client import http_client
+from workflow import FinancialWorkflow, FinancialState
+from workflow_results import workflow_results
+from workflow_idempotency import workflow_idempotency
+from workflow_singleflight import workflow_singleflight
+
+
+class AsyncFinancialWorkflow(FinancialWorkflow):
+    """
+    LangGraph workflow'unu asyncio event loop'unda çalıştıran sınıf
+
+    Graph yapısı FinancialWorkflow ile aynıdır; I/O yapan node'lar
+    async karşılıklarıyla değiştirilir. Execution ve UserInteraction
+    node'ları I/O beklemediği için senkron kalır.
+    """
+
+    is_async = True
+
+    def __init__(self, publisher_queue: Queue):
+        """
+        Async workflow'u ve arka plan event loop thread'ini başlatır
+
+        Args:
+            publisher_queue: Event yayınlama kuyruğu
+        """
+        super().__init__(publisher_queue)
+
+        self._loop = asyncio.new_event_loop()
+        self._in_flight = 0
+        self._stats = {"submitted": 0, "completed": 0, "failed": 0}
+        self._stats_lock = threading.Lock()
+
+        # Token event'leri tek thread'de yayınlanır: sıra korunur, loop publish'i beklemez
+        self._event_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="workflow-events")
+
+        self._loop_thread = threading.Thread(
+            target=self._run_loop, name="workflow-loop", daemon=True
+        )
+        self._loop_thread.start()
+        print("✅ Async workflow event loop'u başlatıldı")
+
+    def _run_loop(self):
+        """Event loop'u arka plan thread'inde çalıştırır"""
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    # ========================================
+    # ÇALIŞTIRMA
+    # ========================================
+
+    def submit(self, initial_state: FinancialState) -> Future:
+        """
+        Workflow'u event loop'ta başlatır (thread-safe)
+
+        Args:
+            initial_state: Başlangıç state'i
+
+        Returns:
+            Future: aexecute sonucunu taşıyan concurrent.futures.Future
+        """
+        return self._schedule(self.aexecute(initial_state))
+
+    def submit_execute(self, initial_state: FinancialState) -> Future:
+        """
+        Workflow'u idempotency ve single-flight kontrolleriyle event loop'ta başlatır (thread-safe)
+
+        execute()'un bloklamayan karşılığıdır: kopyalar ve follower'lar da
+        loop'ta coroutine olarak bekler.
+
+        Args:
+            initial_state: Başlangıç state'i
+
+        Returns:
+            Future: Workflow sonucunu taşıyan concurrent.futures.Future
+        """
+        return self._schedule(workflow_idempotency.arun(initial_state, lambda: workflow_singleflight.arun(
+            initial_state, lambda: self.aexecute(initial_state), self.publisher_queue
+        )))
+
+    def _schedule(self, coroutine) -> Future:
+        """Coroutine'i event loop'a gönderir ve sayaçlara işler"""
+        with self._stats_lock:
+            self._stats["submitted"] += 1
+            self._in_flight += 1
+
+        future = asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _on_done(self, future: Future):
+        """Tamamlanan workflow'u sayaçlara işler"""
+        failed = future.cancelled() or future.exception() is not None
+        if not failed:
+            result = future.result()
+            failed = not result or result.get("current_step") == "error"
+        with self._stats_lock:
+            self._in_flight -= 1
+            self._stats["failed" if failed else "completed"] += 1
+
+    def _invoke(self, initial_state: FinancialState) -> Optional[FinancialState]:
+        """
+        Workflow'u event loop'ta çalıştırır ve sonucunu bekler
+
+        FinancialWorkflow.execute idempotency kontrolünden sonra bunu çağırır;
+        senkron çağıranlar (örn: Kafka consumer worker'ları) aynı arayüzü kullanır.
+
+        Args:
+            initial_state: Başlangıç state'i
+
+        Returns:
+            FinancialState: Workflow sonucu
+        """
+        return self.submit(initial_state).result()
+
+    async def aexecute(self, initial_state: FinancialState) -> Optional[FinancialState]:
+        """
+        LangGraph workflow'unu ainvoke ile çalıştırır
+
+        Args:
+            initial_state: Başlangıç state'i (LangGraph formatında)
+
+        Returns:
+            FinancialState: Workflow sonucu
+        """
+        if not self.workflow:
+            print("❌ LangGraph workflow henüz oluşturulmamış")
+            return None
+
+        try:
+            print(f"🚀 Async LangGraph workflow başlatılıyor: {initial_state['correlationId']}")
+            # Sonuç deposu Redis'e senkron yazar; loop'u bloklamaması için thread'de yapılır
+            await asyncio.to_thread(workflow_results.mark_running, initial_state["correlationId"],
+                                    initial_state["userId"], initial_state["amount"])
+
+            config_dict = {"configurable": {"thread_id": initial_state["correlationId"]}}
+            result = await self.workflow.ainvoke(self._to_langgraph_state(initial_state), config=config_dict)
+
+            print(f"✅ Async LangGraph workflow tamamlandı: {initial_state['userId']}")
+            print(f"📊 Final step: {result.get('current_step', 'unknown')}")
+
+            await asyncio.to_thread(workflow_results.mark_finished, initial_state["correlationId"], result)
+            return result
+
+        except Exception as e:
+            print(f"❌ Async LangGraph workflow çalıştırma hatası: {e}")
+            result = {
+                **initial_state,
+                "error": f"Workflow hatası: {str(e)}",
+                "current_step": "error"
+            }
+            await asyncio.to_thread(workflow_results.mark_finished, initial_state["correlationId"], result)
+            return result
+
+    async def _ashutdown(self):
+        """Bekleyen task'ları iptal edip bitmelerini bekler, ardından loop'un client'larını kapatır"""
+        current = asyncio.current_task()
+        tasks = [task for task in asyncio.all_tasks() if task is not current]
+        if tasks:
+            print(f"🛑 Async workflow: {len(tasks)} bekleyen task iptal ediliyor")
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await service_manager.aclose_async_clients()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Async workflow sayaçlarını döndürür
+
+        Returns:
+            Dict[str, Any]: Gönderilen, tamamlanan, başarısız ve devam eden workflow'lar
+        """
+        with self._stats_lock:
+            return dict(self._stats, in_flight=self._in_flight, loop_running=self._loop.is_running())
+
+    def close(self, timeout: float = 5.0):
+        """
+        Loop'taki işleri iptal eder, loop'a bağlı client'ları kapatır ve loop'u durdurur
+
+        İptal edilen workflow'ların Future'ları cancelled olarak tamamlanır; böylece
+        executor'ın done-callback'leri çalışır ve slotlar bırakılır.
+
+        Args:
+            timeout: Kapanış için beklenecek toplam süre (saniye)
+        """
+        deadline = time.monotonic() + timeout
+        if self._loop.is_running():
+            try:
+                asyncio.run_coroutine_threadsafe(self._ashutdown(), self._loop).result(timeout)
+            except Exception as e:
+                print(f"❌ Async workflow kapatma hatası: {e}")
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop_thread.join(max(deadline - time.monotonic(), 0))
+        # Bekleyen token event'lerini yayınla
+        self._event_executor.shutdown(wait=True)
+
+    # ========================================
+    # ASYNC NODE'LAR
+    # ========================================
+
+    async def _mcp_prefetch_node(self, state: FinancialState) -> FinancialState:
+        """
+        MCP Prefetch Node - Tahmin edilebilir MCP okumalarını aynı anda bekler
+
+        Okumalar senkron node ile aynıdır; thread havuzu yerine
+        asyncio.gather kullanılır.
+        """
+        if not config.MCP_PREFETCH["ENABLED"]:
+            return {**state, "prefetched": {}}
+
+        print("🔄 MCP Prefetch node çalışıyor...")
+        started_at = time.time()
+
+        try:
+            userId = state["userId"]
+            reads = self._prefetch_reads(userId)
+            profile_payload = {"userId": userId}
+
+            async def score_proposed_transfer():
+                # Risk skoru PaymentsAgent'ın önereceği tutara bağlı; profil gelir gelmez hesaplanır
+                profile = await self._acall_mcp_tool("userProfile.get", profile_payload)
+                payload = self._prefetch_risk_payload(state, profile)
+                return profile, payload, await self._acall_mcp_tool("risk.scoreTransaction", payload)
+
+            (profile, risk_payload, risk_result), *read_results = await asyncio.gather(
+                score_proposed_transfer(),
+                *(self._acall_mcp_tool(path, payload) for path, payload in reads)
+            )
+
+            prefetched = {self._prefetch_key("userProfile.get", profile_payload): profile}
+            for (path, payload), result in zip(reads, read_results):
+                prefetched[self._prefetch_key(path, payload)] = result
+            prefetched[self._prefetch_key("risk.scoreTransaction", risk_payload)] = risk_result
+
+            print(f"✅ MCP Prefetch node tamamlandı: {len(prefetched)} okuma, "
+                  f"{(time.time() - started_at) * 1000:.0f} ms")
+            return {
+                **state,
+                "prefetched": prefetched,
+                "current_step": "mcp_prefetch_completed"
+            }
+
+        except Exception as e:
+            # Prefetch yalnızca hızlandırmadır; hata durumunda node'lar ağdan okur
+            print(f"⚠️ MCP Prefetch hatası, node'lar doğrudan MCP'ye gidecek: {e}")
+            return {**state, "prefetched": {}}
+
+    async def _payments_agent_node(self, state: FinancialState) -> FinancialState:
+        """PaymentsAgent Node - async varyant"""
+        return await self._aagent_node("PaymentsAgent", state)
+
+    async def _risk_agent_node(self, state: FinancialState) -> FinancialState:
+        """RiskAgent Node - async varyant"""
+        return await self._aagent_node("RiskAgent", state)
+
+    async def _investment_agent_node(self, state: FinancialState) -> FinancialState:
+        """InvestmentAgent Node - async varyant"""
+        return await self._aagent_node("InvestmentAgent", state)
+
+    async def _aagent_node(self, agent: str, state: FinancialState) -> FinancialState:
+        """
+        _agent_node'un async karşılığı
+
+        LLM'in istediği tool çağrıları (veya fallback çağrıları) birbirinden
+        bağımsızdır ve aynı anda beklenir; sonuçlar istek sırasıyla işlenir.
+
+        Args:
+            agent: Agent adı
+            state: Workflow state'i
+
+        Returns:
+            FinancialState: Güncellenmiş state
+        """
+        print(f"🔄 {agent} node çalışıyor...")
+
+        try:
+            messages = self._agent_messages(agent, state)
+
+            print(f"🤖 {agent}: Ollama llama3.2:3b modeli ile analiz başlatılıyor...")
+            on_token = self._token_publisher(agent, state)
+            response = await self._arun_agent_llm(messages, on_token)
+            self._log_agent_response(agent, response)
+
+            if response.tool_calls:
+                for i, tool_call in enumerate(response.tool_calls):
+                    self._log_tool_call(agent, i, tool_call)
+                results = await asyncio.gather(*(
+                    self._acall_mcp_tool(tool_call["name"], tool_call["args"], state)
+                    for tool_call in response.tool_calls
+                ))
+                tool_results = [
+                    self._tool_result(agent, i, tool_call, result)
+                    for i, (tool_call, result) in enumerate(zip(response.tool_calls, results))
+                ]
+
+                messages.append(self._tool_summary_message(tool_results))
+                print(f"🔄 {agent}: Final LLM yanıtı alınıyor...")
+                messages.append(await self._ainvoke_chat_model(self.llm, messages, on_token))
+                print(f"✅ {agent}: Final LLM yanıtı alındı")
+            else:
+                print(f"🔄 {agent}: Fallback olarak manuel tool çağrıları yapılıyor...")
+                calls = self._agent_fallback_calls(agent, state)
+                results = await asyncio.gather(*(
+                    self._acall_mcp_tool(path, payload, state) for path, payload in calls
+                ))
+                tool_results = [
+                    (path, payload, result) for (path, payload), result in zip(calls, results)
+                ]
+                print(f"📊 {agent}: Fallback tool çağrıları tamamlandı")
+
+            return await self._apublish(
+                self._agent_output, agent, state, messages, tool_results, bool(response.tool_calls)
+            )
+
+        except Exception as e:
+            return self._agent_error(agent, state, e)
+
+    async def _coordinator_agent_node(self, state: FinancialState) -> FinancialState:
+        """CoordinatorAgent Node - async varyant (hafızalar paralel okunur)"""
+        print("🔄 CoordinatorAgent node çalışıyor...")
+
+        try:
+            userId = state["userId"]
+            amount = state["amount"]
+            correlationId = state["correlationId"]
+
+            # Redis ve Qdrant okumaları birbirinden bağımsız
+            short_term_memory, long_term_memory = await asyncio.gather(
+                self._aget_short_term_memory(userId),
+                self._aget_long_term_memory(userId, "deposit analysis")
+            )
+
+            print(f"🧠 CoordinatorAgent: Hugging Face deepseek-v3-0324 modeli ile final mesaj oluşturuluyor...")
+            print(f"📚 Memory kullanımı: Redis (kısa vadeli) + Qdrant (uzun vadeli)")
+
+            prompt = self._build_coordinator_prompt(userId, amount, state, short_term_memory, long_term_memory)
+            system_prompt = self._get_coordinator_system_prompt()
+
+            llm_response = await service_manager.huggingface_service.agenerate_response(
+                system_prompt, prompt, on_token=self._token_publisher("CoordinatorAgent", state)
+            )
+            final_message = llm_response.get("text", "Analiz tamamlandı.")
+
+            coordinator_output = await self._apublish(
+                self._publish_coordinator_output, state, short_term_memory, long_term_memory, final_message
+            )
+
+            await self._aupdate_memories(userId, amount, correlationId, final_message)
+
+            print("✅ CoordinatorAgent node tamamlandı: Final mesaj oluşturuldu")
+            return {
+                **state,
+                "coordinator_output": coordinator_output,
+                "current_step": "coordinator_agent_completed"
+            }
+
+        except Exception as e:
+            return self._agent_error("CoordinatorAgent", state, e)
+
+    # ========================================
+    # ASYNC YARDIMCILAR
+    # ========================================
+
+    def _token_publisher(self, agent: str, state: FinancialState) -> Optional[Callable[[str], None]]:
+        """
+        Token'ları loop'u bloklamadan yayınlayan callback döndürür
+
+        Redis event bus'ta her publisher_queue.put senkron bir PUBLISH/XADD'dir;
+        token başına loop'ta çağrılırsa tüm deposit'ler bekler. Callback event'i
+        yalnızca yayın thread'ine bırakır.
+        """
+        publish = super()._token_publisher(agent, state)
+        if publish is None:
+            return None
+        return lambda token, reset=False: self._event_executor.submit(publish, token, reset)
+
+    async def _apublish(self, fn: Callable, *args) -> Any:
+        """
+        Senkron yayın yapan fonksiyonu (publisher_queue.put, Kafka send) loop dışında çalıştırır
+
+        Önce yayın thread'indeki token'ların gitmesi beklenir; böylece agent-output
+        ve notification event'leri son token'lardan önce yayınlanmaz.
+        """
+        await asyncio.wrap_future(self._event_executor.submit(lambda: None))
+        return await asyncio.to_thread(fn, *args)
+
+    async def _arun_agent_llm(self, messages: list,
+                              on_token: Optional[Callable[[str], None]] = None) -> AIMessage:
+        """_run_agent_llm'in async karşılığı"""
+        if self.llm:
+            streamed = []
+
+            def track(token: str):
+                streamed.append(True)
+                on_token(token)
+
+            try:
+                response = await self._ainvoke_chat_model(
+                    http_client.bind_tools(self.llm, self.tools), messages,
+                    track if on_token is not None else None
+                )
+                print(f"✅ ChatOllama başarılı")
+                return response
+            except Exception as e:
+                print(f"⚠️ ChatOllama başarısız: {e}")
+                if streamed:
+                    on_token("", reset=True)
+
+        print(f"🔄 Manuel HTTP isteği gönderiliyor...")
+        response_content = await self._acall_ollama_manual(messages, on_token)
+        return AIMessage(content=response_content)
+
+    async def _ainvoke_chat_model(self, runnable: Any, messages: list,
+                                  on_token: Optional[Callable[[str], None]] = None) -> AIMessage:
+        """_invoke_chat_model'in async karşılığı (ainvoke / astream)"""
+        if on_token is None:
+            return await runnable.ainvoke(messages)
+
+        response = None
+        async for chunk in runnable.astream(messages):
+            if isinstance(chunk.content, str) and chunk.content:
+                on_token(chunk.content)
+            response = chunk if response is None else response + chunk
+
+        return response if response is not None else AIMessage(content="")
+
+    async def _acall_ollama_manual(self, messages: list,
+                                   on_token: Optional[Callable[[str], None]] = None) -> str:
+        """_call_ollama_manual'ın async karşılığı (paylaşılan httpx.AsyncClient ile)"""
+        try:
+            streaming = on_token is not None
+            url = f"{self.ollama_base_url}/api/chat"
+            payload = self._ollama_chat_payload(messages, streaming)
+            client = http_client.async_client()
+
+            if not streaming:
+                response = await client.post(url, json=payload, timeout=120)
+                if response.status_code != 200:
+                    print(f"❌ Ollama API hatası: {response.status_code} - {response.text}")
+                    return "Ollama API hatası"
+                return response.json().get("message", {}).get("content", "")
+
+            # Streaming modunda Ollama satır başına bir JSON chunk döndürür
+            parts = []
+            async with client.stream("POST", url, json=payload, timeout=120) as response:
+                if response.status_code != 200:
+                    await response.aread()
+                    print(f"❌ Ollama API hatası: {response.status_code} - {response.text}")
+                    return "Ollama API hatası"
+
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    token = chunk.get("message", {}).get("content", "")
+                    if token:
+                        parts.append(token)
+                        on_token(token)
+                    if chunk.get("done"):
+                        break
+            return "".join(parts)
+
+        except Exception as e:
+            print(f"❌ Manuel Ollama çağrısı hatası: {e}")
+            return "Manuel Ollama çağrısı başarısız"
+
+    async def _acall_mcp_tool(self, path: str, payload: Dict[str, Any],
+                              state: Optional[FinancialState] = None) -> Dict[str, Any]:
+        """_call_mcp_tool'un async karşılığı"""
+        prefetched = self._prefetched_result(path, payload, state)
+        if prefetched is not None:
+            return prefetched
+
+        print(f"🌐 MCP Tool Çağrısı: {path}")
+        print(f"📥 Payload: {payload}")
+
+        try:
+            result = await service_manager.mcp_service.acall_tool(path, payload)
+            print(f"✅ MCP Tool Başarılı: {path}")
+            print(f"📤 Sonuç: {str(result)[:300]}...")
+            return result
+        except Exception as e:
+            print(f"❌ MCP Tool Hatası: {path} - {e}")
+            return {"error": str(e), "path": path}
+
+    async def _aget_short_term_memory(self, userId: str) -> str:
+        """_get_short_term_memory'nin async karşılığı"""
+        snapshot = await service_manager.redis_service.aget_user_snapshot(userId)
+        return self._format_short_term_memory(snapshot)
+
+    async def _aget_long_term_memory(self, userId: str, query: str) -> str:
+        """_get_long_term_memory'nin async karşılığı"""
+        try:
+            similar_memories = await service_manager.qdrant_service.asearch_similar(
+                userId, query, top_k=3
+            )
+            return self._format_long_term_memory(similar_memories)
+        except Exception as e:
+            print(f"⚠️ Uzun vadeli hafıza hatası: {e}")
+            return ""
+
+    async def _aupdate_memories(self, userId: str, amount: int, correlationId: str, final_message: str):
+        """_update_memories'in async karşılığı (Qdrant ve Redis yazımları paralel)"""
+        long_term, short_term = await asyncio.gather(
+            service_manager.qdrant_service.astore_memory(
+                user_id=userId,
+                content=f"Deposit analysis for {amount}₺: {final_message}",
+                metadata={
+                    "type": "deposit_analysis",
+                    "amount": amount,
+                    "correlationId": correlationId
+                }
+            ),
+            service_manager.redis_service.apush_user_event(userId, {
+                "type": "deposit",
+                "amount": amount,
+                "ts": int(time.time()),
+                "message": final_message
+            }),
+            return_exceptions=True
+        )
+
+        if isinstance(long_term, Exception):
+            print(f"⚠️ Uzun vadeli hafıza güncelleme hatası: {long_term}")
+        else:
+            print(f"✅ Uzun vadeli hafıza güncellendi: {userId}")
+
+        if isinstance(short_term, Exception):
+            print(f"⚠️ Kısa vadeli hafıza güncelleme hatası: {short_term}")
+        else:
+            print(f"✅ Kısa vadeli hafıza güncellendi: {userId}")
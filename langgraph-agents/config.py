@@ -62,6 +62,30 @@ class Config:
     FLASK_PORT: int = int(os.environ.get("FLASK_PORT", "5000"))
     FLASK_DEBUG: bool = os.environ.get("FLASK_DEBUG", "False").lower() == "true"
     
+    # Sunucu Modu: development (Flask dev server) veya production (gunicorn)
+    SERVER_MODE: str = os.environ.get("SERVER_MODE", "development")
+    
+    # Gunicorn Ayarları (production modu)
+    # gthread: her SSE bağlantısı havuzdan bir thread kullanır; gevent kuruluysa binlerce bağlantı tek worker'da tutulabilir
+    # Birden fazla worker'da /stream'in tüm event'leri görmesi için EVENT_BUS_BACKEND Redis olmalıdır
+    GUNICORN = {
+        "WORKERS": int(os.environ.get("GUNICORN_WORKERS", "1")),
+        "WORKER_CLASS": os.environ.get("GUNICORN_WORKER_CLASS", "gthread"),  # gthread, gevent, sync
+        "THREADS": int(os.environ.get("GUNICORN_THREADS", "128")),            # gthread: worker başına eşzamanlı istek
+        "WORKER_CONNECTIONS": int(os.environ.get("GUNICORN_WORKER_CONNECTIONS", "2000")),  # gevent
+        "KEEPALIVE": int(os.environ.get("GUNICORN_KEEPALIVE", "5")),
+        "TIMEOUT": int(os.environ.get("GUNICORN_TIMEOUT", "120")),
+        "GRACEFUL_TIMEOUT": int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", "30")),
+        "BACKLOG": int(os.environ.get("GUNICORN_BACKLOG", "2048"))
+    }
+    
+    # Graceful Shutdown Ayarları
+    # SIGTERM'de yeni iş alımı durur, devam eden workflow'lar TIMEOUT süresine kadar beklenir,
+    # ardından Kafka producer ve buffer'lar flush edilir. GUNICORN_GRACEFUL_TIMEOUT'tan kısa olmalıdır
+    SHUTDOWN = {
+        "TIMEOUT": float(os.environ.get("SHUTDOWN_TIMEOUT", "25"))
+    }
+    
     # CORS Konfigürasyonu
     CORS_ORIGINS: str = os.environ.get("CORS_ORIGINS", "http://localhost:3000")
     
@@ -80,6 +104,32 @@ class Config:
         "ADVISOR_FINAL_MESSAGE": "advisor.finalMessage"
     }
     
+    # Kafka Producer Ayarları
+    # Asenkron modda event'ler fire-and-forget gönderilir; producer linger/batch ile gruplar,
+    # flush yalnızca checkpoint sınırlarında (workflow sonu) ve kapanışta yapılır
+    KAFKA_PRODUCER = {
+        "ASYNC": os.environ.get("KAFKA_PUBLISH_ASYNC", "True").lower() == "true",
+        "LINGER_MS": int(os.environ.get("KAFKA_LINGER_MS", "20")),
+        "BATCH_SIZE": int(os.environ.get("KAFKA_BATCH_SIZE", str(32 * 1024))),
+        "COMPRESSION": os.environ.get("KAFKA_COMPRESSION", "gzip"),  # none, gzip, snappy, lz4, zstd
+        "BUFFER_MEMORY": int(os.environ.get("KAFKA_BUFFER_MEMORY", str(16 * 1024 * 1024))),  # Sınırlı bellek içi buffer
+        "MAX_BLOCK_MS": int(os.environ.get("KAFKA_MAX_BLOCK_MS", "500")),  # Buffer doluysa send() en fazla bu kadar bekler
+        "ACKS": os.environ.get("KAFKA_ACKS", "1"),
+        "SYNC_TIMEOUT": 10,   # Senkron gönderimde teslim bekleme süresi (saniye)
+        "FLUSH_TIMEOUT": 10   # Checkpoint / kapanış flush süresi (saniye)
+    }
+    
+    # Kafka Deposit Consumer Havuzu Ayarları
+    # Mesajlar userId'ye göre sabit worker'lara dağıtılır; kuyruklar dolunca partition'lar pause edilir,
+    # offset'ler auto-commit yerine workflow tamamlandıktan sonra manuel commit edilir
+    KAFKA_CONSUMER = {
+        "GROUP_ID": os.environ.get("KAFKA_CONSUMER_GROUP_ID", "financial_agents_group"),
+        "WORKERS": int(os.environ.get("KAFKA_CONSUMER_WORKERS", "8")),
+        "WORKER_QUEUE_SIZE": int(os.environ.get("KAFKA_CONSUMER_WORKER_QUEUE_SIZE", "16")),  # Worker başına pause eşiği
+        "MAX_POLL_RECORDS": int(os.environ.get("KAFKA_CONSUMER_MAX_POLL_RECORDS", "64")),
+        "POLL_TIMEOUT_MS": int(os.environ.get("KAFKA_CONSUMER_POLL_TIMEOUT_MS", "500"))
+    }
+    
     # Ollama Model Ayarları
     OLLAMA_MODELS = {
         "LLM_MODEL": "llama3.2:3b",  # Tool calling için güçlü model (ngrok ile host edilen)
@@ -89,13 +139,61 @@ class Config:
     # Redis Key Patterns
     REDIS_KEYS = {
         "USER_LAST_ACTION": "user:{user_id}:last_action",
-        "USER_LAST_EVENTS": "user:{user_id}:last_events"
+        "USER_LAST_EVENTS": "user:{user_id}:last_events",
+        "EMBEDDING": "embedding:{model}:{digest}",
+        "WORKFLOW_RESULT": "workflow:{correlation_id}:result",
+        "WORKFLOW_CLAIM": "workflow:{correlation_id}:claim",
+        "WORKFLOW_INFLIGHT": "workflow:inflight:{user_id}:{amount}"
     }
     
     # Redis TTL Ayarları (saniye)
     REDIS_TTL = {
         "USER_ACTION": 60 * 60 * 24,  # 24 saat
-        "USER_EVENTS": 60 * 60 * 24   # 24 saat
+        "USER_EVENTS": 60 * 60 * 24,  # 24 saat
+        "EMBEDDING": 60 * 60 * 24 * 7,  # 7 gün (içerik hash'li, model değişince anahtar değişir)
+        "WORKFLOW_RESULT": int(os.environ.get("WORKFLOW_RESULT_TTL", str(60 * 60))),  # 1 saat
+        "WORKFLOW_CLAIM": int(os.environ.get("WORKFLOW_CLAIM_TTL", str(60 * 10)))  # 10 dk (en uzun workflow süresinden uzun)
+    }
+    
+    # Redis Bağlantı Havuzu Ayarları (kısa vadeli hafıza, sonuç deposu, idempotency)
+    # Havuz doluysa istek POOL_TIMEOUT saniye boş bağlantı bekler; bekleme süresi ve
+    # kullanımdaki bağlantı sayısı /metrics altında raporlanır
+    REDIS_POOL = {
+        "MAX_CONNECTIONS": int(os.environ.get("REDIS_POOL_MAX_CONNECTIONS", "64")),
+        "ASYNC_MAX_CONNECTIONS": int(os.environ.get("REDIS_POOL_ASYNC_MAX_CONNECTIONS", "32")),
+        "POOL_TIMEOUT": float(os.environ.get("REDIS_POOL_TIMEOUT", "5")),
+        "SOCKET_TIMEOUT": float(os.environ.get("REDIS_SOCKET_TIMEOUT", "5")),
+        "SOCKET_CONNECT_TIMEOUT": float(os.environ.get("REDIS_SOCKET_CONNECT_TIMEOUT", "2")),
+        "HEALTH_CHECK_INTERVAL": int(os.environ.get("REDIS_HEALTH_CHECK_INTERVAL", "30"))
+    }
+    
+    # Kullanıcı Event Geçmişi Ayarları
+    # user:{id}:last_events listesi LPUSH + LTRIM + EXPIRE ile tek round-trip'te yazılır;
+    # liste MAX_EVENTS ile sınırlanır (aktif kullanıcılarda TTL içinde sınırsız büyümez).
+    # Coordinator'ın kısa vadeli hafıza snapshot'ı (son eylem + son SNAPSHOT_EVENTS etkinlik)
+    # tek round-trip'te okunur ve SNAPSHOT_CACHE_TTL saniye süreç içinde tutulur
+    USER_EVENTS = {
+        "MAX_EVENTS": int(os.environ.get("USER_EVENTS_MAX", "50")),
+        "TRANSACTIONAL": os.environ.get("USER_EVENTS_TRANSACTIONAL", "False").lower() == "true",
+        "SNAPSHOT_EVENTS": int(os.environ.get("USER_SNAPSHOT_EVENTS", "5")),
+        "SNAPSHOT_CACHE_TTL": float(os.environ.get("USER_SNAPSHOT_CACHE_TTL", "5")),
+        "SNAPSHOT_CACHE_MAX_ENTRIES": int(os.environ.get("USER_SNAPSHOT_CACHE_MAX_ENTRIES", "1024"))
+    }
+    
+    # Embedding Önbelleği Ayarları
+    # get_embedding önünde süreç içi LRU + Redis katmanı
+    EMBEDDING_CACHE = {
+        "ENABLED": os.environ.get("EMBEDDING_CACHE_ENABLED", "True").lower() == "true",
+        "MAX_ENTRIES": int(os.environ.get("EMBEDDING_CACHE_MAX_ENTRIES", "2048"))
+    }
+    
+    # Embedding Micro-Batching Ayarları
+    # Eşzamanlı embedding istekleri kısa bir süre toplanıp tek /api/embed çağrısıyla gönderilir
+    EMBEDDING_BATCH = {
+        "ENABLED": os.environ.get("EMBEDDING_BATCH_ENABLED", "True").lower() == "true",
+        "MAX_BATCH_SIZE": int(os.environ.get("EMBEDDING_BATCH_MAX_SIZE", "32")),
+        "MAX_WAIT_MS": float(os.environ.get("EMBEDDING_BATCH_MAX_WAIT_MS", "5")),
+        "MAX_IN_FLIGHT": int(os.environ.get("EMBEDDING_BATCH_MAX_IN_FLIGHT", "4"))
     }
     
     # API Timeout Ayarları
@@ -105,6 +203,100 @@ class Config:
         "HTTP_REQUEST": 10   # Genel HTTP istekleri için
     }
     
+    # LLM Token Streaming Ayarları
+    # Açıksa agent LLM çağrıları kısmi token'ları "agent-token" event'i olarak /stream'e iletir
+    LLM_STREAMING = {
+        "ENABLED": os.environ.get("LLM_STREAMING_ENABLED", "True").lower() == "true",
+        "TOKEN_EVENT": "agent-token"
+    }
+    
+    # Workflow Executor Ayarları (/simulate_deposit ve /action arka plan işleri)
+    # En fazla MAX_CONCURRENCY iş aynı anda çalışır; QUEUE_SIZE iş bekler, fazlası 429 ile reddedilir
+    WORKFLOW_EXECUTOR = {
+        "MAX_CONCURRENCY": int(os.environ.get("WORKFLOW_MAX_CONCURRENCY", "8")),
+        "QUEUE_SIZE": int(os.environ.get("WORKFLOW_QUEUE_SIZE", "100")),
+        "RETRY_AFTER_SECONDS": int(os.environ.get("WORKFLOW_RETRY_AFTER_SECONDS", "5"))
+    }
+    
+    # Workflow Sonuç Deposu Ayarları (GET /workflow/<correlationId>)
+    # Durum, node süreleri ve final sonuç LRU + Redis'te REDIS_TTL["WORKFLOW_RESULT"] süresince tutulur
+    WORKFLOW_RESULTS = {
+        "ENABLED": os.environ.get("WORKFLOW_RESULTS_ENABLED", "True").lower() == "true",
+        "REDIS_ENABLED": os.environ.get("WORKFLOW_RESULTS_REDIS_ENABLED", "True").lower() == "true",
+        "MAX_ENTRIES": int(os.environ.get("WORKFLOW_RESULTS_MAX_ENTRIES", "1024"))
+    }
+    
+    # Workflow Idempotency Ayarları
+    # Aynı correlationId ile gelen tekrarlar saklı sonuca veya devam eden çalıştırmaya bağlanır
+    WORKFLOW_IDEMPOTENCY = {
+        "ENABLED": os.environ.get("WORKFLOW_IDEMPOTENCY_ENABLED", "True").lower() == "true",
+        "WAIT_TIMEOUT": int(os.environ.get("WORKFLOW_IDEMPOTENCY_WAIT_TIMEOUT", "180")),
+        "POLL_INTERVAL_MS": int(os.environ.get("WORKFLOW_IDEMPOTENCY_POLL_INTERVAL_MS", "500"))
+    }
+    
+    # Workflow Single-Flight Ayarları
+    # Aynı (userId, amount) için eşzamanlı çalıştırmalar tek bir leader çalıştırmaya bağlanır;
+    # bekleme süresi ve yoklama aralığı WORKFLOW_IDEMPOTENCY ile ortaktır
+    WORKFLOW_SINGLE_FLIGHT = {
+        "ENABLED": os.environ.get("WORKFLOW_SINGLE_FLIGHT_ENABLED", "True").lower() == "true",
+        "ATTACHED_EVENT": "workflow-attached"
+    }
+    
+    # Async Workflow Ayarları
+    # Açıksa agent node'ları tek bir event loop'ta ainvoke ile çalışır; deposit başına thread açılmaz
+    WORKFLOW_ASYNC = {
+        "ENABLED": os.environ.get("WORKFLOW_ASYNC_ENABLED", "False").lower() == "true"
+    }
+    
+    # MCP Prefetch Ayarları
+    # Workflow başında tahmin edilebilir tüm MCP okumaları paralel olarak yapılır
+    MCP_PREFETCH = {
+        "ENABLED": os.environ.get("MCP_PREFETCH_ENABLED", "True").lower() == "true",
+        "MAX_WORKERS": int(os.environ.get("MCP_PREFETCH_MAX_WORKERS", "16")),
+        "ASSET_TYPES": ["bond", "equity", "fund", "savings"],  # InvestmentAgent'ın seçebileceği tüm varlıklar
+        "TENOR": "1Y",
+        "TRANSACTIONS_SINCE": "last30d",
+        "TRANSACTIONS_LIMIT": 10
+    }
+    
+    # HTTP Bağlantı Havuzu Ayarları
+    # Ollama, Hugging Face ve MCP çağrıları host bazlı keep-alive havuzlarını paylaşır
+    HTTP_POOL = {
+        "POOL_CONNECTIONS": int(os.environ.get("HTTP_POOL_CONNECTIONS", "10")),  # Session başına urllib3 havuz sayısı
+        "POOL_MAXSIZE": int(os.environ.get("HTTP_POOL_MAXSIZE", "32")),          # Havuz başına açık bağlantı
+        "POOL_BLOCK": os.environ.get("HTTP_POOL_BLOCK", "False").lower() == "true",
+        "MAX_RETRIES": int(os.environ.get("HTTP_MAX_RETRIES", "0"))
+    }
+    
+    # Event Bus Ayarları (publisher_queue backend'i)
+    # memory: tek süreç; redis-pubsub / redis-streams: birden fazla API worker'ı aynı SSE akışını paylaşır
+    EVENT_BUS = {
+        "BACKEND": os.environ.get("EVENT_BUS_BACKEND", "memory"),
+        "CHANNEL": os.environ.get("EVENT_BUS_CHANNEL", "financial:events"),
+        "STREAM_MAXLEN": int(os.environ.get("EVENT_BUS_STREAM_MAXLEN", "10000")),  # redis-streams yaklaşık üst sınırı
+        "BLOCK_MS": 1000  # Listener okuma bekleme süresi
+    }
+    
+    # SSE (/stream) Ayarları
+    # Her client sınırlı bir buffer'a sahiptir; dolduğunda politika uygulanır:
+    # drop-oldest (en eskiyi at), drop-client (bağlantıyı kapat), coalesce (aynı event'in eskisini değiştir)
+    SSE = {
+        "CLIENT_BUFFER_SIZE": int(os.environ.get("SSE_CLIENT_BUFFER_SIZE", "256")),
+        "SLOW_CLIENT_POLICY": os.environ.get("SSE_SLOW_CLIENT_POLICY", "drop-oldest"),
+        # Last-Event-ID replay ring buffer'ı (event sayısı ve toplam byte ile sınırlı)
+        "REPLAY_MAX_EVENTS": int(os.environ.get("SSE_REPLAY_MAX_EVENTS", "1000")),
+        "REPLAY_MAX_BYTES": int(os.environ.get("SSE_REPLAY_MAX_BYTES", str(4 * 1024 * 1024))),
+        # Boşta bağlantılar için heartbeat aralığı ve ölü bağlantı tespiti için yazma zaman aşımı (saniye)
+        "HEARTBEAT_INTERVAL": float(os.environ.get("SSE_HEARTBEAT_INTERVAL", "15")),
+        "WRITE_TIMEOUT": float(os.environ.get("SSE_WRITE_TIMEOUT", "30")),
+        # Adaptif batch yazma: bekleyen birden fazla mesaj tek socket yazmasında birleştirilir
+        "BATCH_ENABLED": os.environ.get("SSE_BATCH_ENABLED", "True").lower() == "true",
+        "BATCH_MAX_BYTES": int(os.environ.get("SSE_BATCH_MAX_BYTES", str(64 * 1024))),
+        "BATCH_MAX_DELAY_MS": float(os.environ.get("SSE_BATCH_MAX_DELAY_MS", "10")),
+        # Filtresiz (tüm kullanıcıların event'lerini alan) abonelik yalnızca admin/izleme kurulumlarında açılmalı
+        "ALLOW_WILDCARD": os.environ.get("SSE_ALLOW_WILDCARD", "False").lower() == "true"
+    }
+    
     @classmethod
     def get_qdrant_config(cls) -> dict:
         """
@@ -127,11 +319,91 @@ class Config:
         Kafka konfigürasyonunu dictionary olarak döndürür
         
         Returns:
-            dict: Kafka bootstrap servers ve topic ayarları
+            dict: Kafka bootstrap servers, topic ve producer ayarları
         """
         return {
             "bootstrap_servers": [cls.KAFKA_BOOTSTRAP_SERVERS],
-            "topics": cls.KAFKA_TOPICS
+            "topics": cls.KAFKA_TOPICS,
+            "producer": cls.KAFKA_PRODUCER
+        }
+    
+    @classmethod
+    def get_workflow_executor_config(cls) -> dict:
+        """
+        Workflow executor konfigürasyonunu dictionary olarak döndürür
+        
+        Returns:
+            dict: Eşzamanlılık, bekleme kuyruğu kapasitesi ve Retry-After süresi
+        """
+        return {
+            "max_concurrency": cls.WORKFLOW_EXECUTOR["MAX_CONCURRENCY"],
+            "queue_size": cls.WORKFLOW_EXECUTOR["QUEUE_SIZE"],
+            "retry_after_seconds": cls.WORKFLOW_EXECUTOR["RETRY_AFTER_SECONDS"]
+        }
+    
+    @classmethod
+    def get_workflow_results_config(cls) -> dict:
+        """
+        Workflow sonuç deposu konfigürasyonunu dictionary olarak döndürür
+        
+        Returns:
+            dict: LRU kapasitesi, Redis kullanımı, TTL ve anahtar kalıbı
+        """
+        return {
+            "enabled": cls.WORKFLOW_RESULTS["ENABLED"],
+            "redis_enabled": cls.WORKFLOW_RESULTS["REDIS_ENABLED"],
+            "max_entries": cls.WORKFLOW_RESULTS["MAX_ENTRIES"],
+            "ttl": cls.REDIS_TTL["WORKFLOW_RESULT"],
+            "key_pattern": cls.REDIS_KEYS["WORKFLOW_RESULT"]
+        }
+    
+    @classmethod
+    def get_workflow_idempotency_config(cls) -> dict:
+        """
+        Workflow idempotency konfigürasyonunu dictionary olarak döndürür
+        
+        Returns:
+            dict: Sahiplenme TTL'i, bekleme süresi, polling aralığı ve anahtar kalıbı
+        """
+        return {
+            "enabled": cls.WORKFLOW_IDEMPOTENCY["ENABLED"],
+            "claim_ttl": cls.REDIS_TTL["WORKFLOW_CLAIM"],
+            "wait_timeout": cls.WORKFLOW_IDEMPOTENCY["WAIT_TIMEOUT"],
+            "poll_interval_ms": cls.WORKFLOW_IDEMPOTENCY["POLL_INTERVAL_MS"],
+            "key_pattern": cls.REDIS_KEYS["WORKFLOW_CLAIM"]
+        }
+    
+    @classmethod
+    def get_workflow_single_flight_config(cls) -> dict:
+        """
+        Workflow single-flight konfigürasyonunu dictionary olarak döndürür
+        
+        Returns:
+            dict: In-flight anahtar TTL'i ve kalıbı, bekleme ayarları ve attach event adı
+        """
+        return {
+            "enabled": cls.WORKFLOW_SINGLE_FLIGHT["ENABLED"],
+            "attached_event": cls.WORKFLOW_SINGLE_FLIGHT["ATTACHED_EVENT"],
+            "inflight_ttl": cls.REDIS_TTL["WORKFLOW_CLAIM"],
+            "wait_timeout": cls.WORKFLOW_IDEMPOTENCY["WAIT_TIMEOUT"],
+            "poll_interval_ms": cls.WORKFLOW_IDEMPOTENCY["POLL_INTERVAL_MS"],
+            "key_pattern": cls.REDIS_KEYS["WORKFLOW_INFLIGHT"]
+        }
+    
+    @classmethod
+    def get_kafka_consumer_config(cls) -> dict:
+        """
+        Kafka deposit consumer havuzu konfigürasyonunu dictionary olarak döndürür
+        
+        Returns:
+            dict: Worker sayısı, kuyruk kapasitesi ve poll ayarları
+        """
+        return {
+            "group_id": cls.KAFKA_CONSUMER["GROUP_ID"],
+            "workers": cls.KAFKA_CONSUMER["WORKERS"],
+            "worker_queue_size": cls.KAFKA_CONSUMER["WORKER_QUEUE_SIZE"],
+            "max_poll_records": cls.KAFKA_CONSUMER["MAX_POLL_RECORDS"],
+            "poll_timeout_ms": cls.KAFKA_CONSUMER["POLL_TIMEOUT_MS"]
         }
     
     @classmethod
@@ -140,12 +412,125 @@ class Config:
         Redis konfigürasyonunu dictionary olarak döndürür
         
         Returns:
-            dict: Redis URL ve TTL ayarları
+            dict: Redis URL, TTL, bağlantı havuzu, kullanıcı event geçmişi ve snapshot önbelleği ayarları
         """
         return {
             "url": cls.REDIS_URL,
             "ttl": cls.REDIS_TTL,
-            "key_patterns": cls.REDIS_KEYS
+            "key_patterns": cls.REDIS_KEYS,
+            "max_connections": max(1, cls.REDIS_POOL["MAX_CONNECTIONS"]),
+            "async_max_connections": max(1, cls.REDIS_POOL["ASYNC_MAX_CONNECTIONS"]),
+            "pool_timeout": cls.REDIS_POOL["POOL_TIMEOUT"],
+            "socket_timeout": cls.REDIS_POOL["SOCKET_TIMEOUT"],
+            "socket_connect_timeout": cls.REDIS_POOL["SOCKET_CONNECT_TIMEOUT"],
+            "health_check_interval": cls.REDIS_POOL["HEALTH_CHECK_INTERVAL"],
+            "user_events_max": max(1, cls.USER_EVENTS["MAX_EVENTS"]),
+            "user_events_transactional": cls.USER_EVENTS["TRANSACTIONAL"],
+            "snapshot_events": max(1, cls.USER_EVENTS["SNAPSHOT_EVENTS"]),
+            "snapshot_cache_ttl": cls.USER_EVENTS["SNAPSHOT_CACHE_TTL"],
+            "snapshot_cache_max_entries": cls.USER_EVENTS["SNAPSHOT_CACHE_MAX_ENTRIES"]
+        }
+    
+    @classmethod
+    def get_embedding_cache_config(cls) -> dict:
+        """
+        Embedding önbelleği konfigürasyonunu dictionary olarak döndürür
+        
+        Returns:
+            dict: LRU kapasitesi, Redis TTL ve anahtar kalıbı
+        """
+        return {
+            "enabled": cls.EMBEDDING_CACHE["ENABLED"],
+            "max_entries": cls.EMBEDDING_CACHE["MAX_ENTRIES"],
+            "redis_ttl": cls.REDIS_TTL["EMBEDDING"],
+            "key_pattern": cls.REDIS_KEYS["EMBEDDING"]
+        }
+    
+    @classmethod
+    def get_embedding_batch_config(cls) -> dict:
+        """
+        Embedding micro-batching konfigürasyonunu dictionary olarak döndürür
+        
+        Returns:
+            dict: Batch boyutu, maksimum bekleme süresi ve eşzamanlı batch sayısı
+        """
+        return {
+            "enabled": cls.EMBEDDING_BATCH["ENABLED"],
+            "max_batch_size": cls.EMBEDDING_BATCH["MAX_BATCH_SIZE"],
+            "max_wait_ms": cls.EMBEDDING_BATCH["MAX_WAIT_MS"],
+            "max_in_flight": cls.EMBEDDING_BATCH["MAX_IN_FLIGHT"]
+        }
+    
+    @classmethod
+    def get_event_bus_config(cls) -> dict:
+        """
+        Event bus konfigürasyonunu dictionary olarak döndürür
+        
+        Returns:
+            dict: Backend, kanal/stream adı ve okuma ayarları
+        """
+        return {
+            "backend": cls.EVENT_BUS["BACKEND"],
+            "channel": cls.EVENT_BUS["CHANNEL"],
+            "stream_maxlen": cls.EVENT_BUS["STREAM_MAXLEN"],
+            "block_ms": cls.EVENT_BUS["BLOCK_MS"]
+        }
+    
+    @classmethod
+    def get_sse_config(cls) -> dict:
+        """
+        SSE yayın konfigürasyonunu dictionary olarak döndürür
+        
+        Returns:
+            dict: Client buffer, yavaş client politikası, replay, heartbeat, batch ve wildcard ayarları
+        """
+        return {
+            "client_buffer_size": cls.SSE["CLIENT_BUFFER_SIZE"],
+            "slow_client_policy": cls.SSE["SLOW_CLIENT_POLICY"],
+            "replay_max_events": cls.SSE["REPLAY_MAX_EVENTS"],
+            "replay_max_bytes": cls.SSE["REPLAY_MAX_BYTES"],
+            "heartbeat_interval": cls.SSE["HEARTBEAT_INTERVAL"],
+            "write_timeout": cls.SSE["WRITE_TIMEOUT"],
+            "batch_enabled": cls.SSE["BATCH_ENABLED"],
+            "batch_max_bytes": cls.SSE["BATCH_MAX_BYTES"],
+            "batch_max_delay_ms": cls.SSE["BATCH_MAX_DELAY_MS"],
+            "allow_wildcard": cls.SSE["ALLOW_WILDCARD"]
+        }
+    
+    @classmethod
+    def get_server_config(cls) -> dict:
+        """
+        Production sunucu (gunicorn) konfigürasyonunu dictionary olarak döndürür
+        
+        Returns:
+            dict: Sunucu modu, bind adresi, worker ve bağlantı ayarları
+        """
+        return {
+            "mode": cls.SERVER_MODE,
+            "bind": f"{cls.FLASK_HOST}:{cls.FLASK_PORT}",
+            "workers": cls.GUNICORN["WORKERS"],
+            "worker_class": cls.GUNICORN["WORKER_CLASS"],
+            "threads": cls.GUNICORN["THREADS"],
+            "worker_connections": cls.GUNICORN["WORKER_CONNECTIONS"],
+            "keepalive": cls.GUNICORN["KEEPALIVE"],
+            "timeout": cls.GUNICORN["TIMEOUT"],
+            "graceful_timeout": cls.GUNICORN["GRACEFUL_TIMEOUT"],
+            "backlog": cls.GUNICORN["BACKLOG"]
+        }
+    
+    @classmethod
+    def get_http_pool_config(cls) -> dict:
+        """
+        HTTP bağlantı havuzu konfigürasyonunu dictionary olarak döndürür
+        
+        Returns:
+            dict: Havuz boyutları ve retry ayarları
+        """
+        return {
+            "pool_connections": cls.HTTP_POOL["POOL_CONNECTIONS"],
+            "pool_maxsize": cls.HTTP_POOL["POOL_MAXSIZE"],
+            "pool_block": cls.HTTP_POOL["POOL_BLOCK"],
+            "max_retries": cls.HTTP_POOL["MAX_RETRIES"]
         }
     
     @classmethod
@@ -181,7 +566,10 @@ class Config:
         print(f"Hugging Face Model: {cls.HUGGINGFACE_MODEL}")
         print(f"Hugging Face API Key: {'***' if cls.HUGGINGFACE_API_KEY else 'Not Set'}")
         print(f"Flask Host: {cls.FLASK_HOST}:{cls.FLASK_PORT}")
+        print(f"Server Mode: {cls.SERVER_MODE}")
+        print(f"Async Workflow: {'Aktif' if cls.WORKFLOW_ASYNC['ENABLED'] else 'Kapalı'}")
         print(f"CORS Origins: {cls.CORS_ORIGINS}")
+        print(f"HTTP Pool: {cls.HTTP_POOL['POOL_CONNECTIONS']} host x {cls.HTTP_POOL['POOL_MAXSIZE']} bağlantı")
         print("=============================================")
 
 
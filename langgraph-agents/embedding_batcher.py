@@ -0,0 +1,222 @@
+"""
+Finansal Agentic Proje Embedding Micro-Batcher
+==============================================
+
+Bu modül eşzamanlı workflow'lardan gelen embedding isteklerini birkaç
+milisaniye boyunca toplayıp Ollama'nın çoklu girdi kabul eden /api/embed
+endpoint'ine tek bir istek olarak gönderir ve dönen vektörleri bekleyen
+çağıranlara dağıtır.
+
+Özellikler:
+- Yapılandırılabilir maksimum batch boyutu ve bekleme süresi
+- Birden fazla batch aynı anda gönderilebilir (max_in_flight); yavaş bir
+  istek diğer embedding'leri arkasında bekletmez
+- Aynı batch içindeki tekrar eden metinler tek kez gönderilir
+- Batch boyutu histogramı ve toplam istek sayaçları
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Any, List, Optional
+
+from config import config
+
+
+class EmbeddingBatcher:
+    """
+    Embedding isteklerini micro-batch'lere toplayan sınıf
+
+    Tek bir arka plan thread'i kuyruğu boşaltır; ilk istek geldiğinde
+    max_wait_ms kadar (veya batch dolana kadar) yeni istek bekler ve
+    batch'i en fazla max_in_flight thread'lik havuzda send_batch ile gönderir.
+    Tüm gönderim thread'leri meşgulken istekler kuyrukta birikir ve sıradaki
+    batch daha büyük olur.
+    """
+
+    # Batch boyutu histogramının üst sınırları
+    HISTOGRAM_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+    def __init__(self, send_batch: Callable[[List[str]], List[Optional[List[float]]]]):
+        """
+        Batcher'ı başlatır
+
+        Args:
+            send_batch: Metin listesini alıp aynı sırada vektör listesi döndüren fonksiyon
+        """
+        batch_config = config.get_embedding_batch_config()
+        self.max_batch_size = batch_config["max_batch_size"]
+        self.max_wait = batch_config["max_wait_ms"] / 1000.0
+        self.max_in_flight = max(1, batch_config["max_in_flight"])
+        self.send_batch = send_batch
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._dispatchers = ThreadPoolExecutor(
+            max_workers=self.max_in_flight, thread_name_prefix="embedding-dispatch"
+        )
+        self._dispatch_slots = threading.Semaphore(self.max_in_flight)
+        self._lock = threading.Lock()
+        self._histogram = {bucket: 0 for bucket in self.HISTOGRAM_BUCKETS}
+        self._histogram["+Inf"] = 0
+        self._stats = {"requests": 0, "batches": 0, "texts_sent": 0, "deduplicated": 0, "errors": 0}
+
+    def _ensure_started(self):
+        """Arka plan thread'ini ilk kullanımda başlatır"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="embedding-batcher", daemon=True
+                )
+                self._thread.start()
+
+    def submit(self, text: str) -> Future:
+        """
+        Embedding isteğini sıradaki batch'e ekler
+
+        Args:
+            text: Embedding'i istenen metin
+
+        Returns:
+            Future: Sonucu embedding vektörü (veya None) olan future
+        """
+        future: Future = Future()
+        self._ensure_started()
+        with self._lock:
+            self._stats["requests"] += 1
+        self._queue.put((text, future))
+        return future
+
+    def embed(self, text: str, timeout: Optional[float] = None) -> Optional[List[float]]:
+        """
+        Metni batch'e ekler ve sonucu bekler
+
+        Args:
+            text: Embedding'i istenen metin
+            timeout: Maksimum bekleme süresi (saniye)
+
+        Returns:
+            List[float]: Embedding vektörü veya None
+        """
+        return self.submit(text).result(timeout=timeout)
+
+    def _collect_batch(self) -> List[tuple]:
+        """Kuyruktan bir batch toplar (ilk öğe için süresiz bekler)"""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining <= 0:
+                    batch.append(self._queue.get_nowait())
+                else:
+                    batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _run(self):
+        """Batcher loop'u"""
+        while True:
+            # Boş gönderim slotu olmadan batch toplanmaz; bu sırada gelenler sonraki batch'e girer
+            self._dispatch_slots.acquire()
+            batch = self._collect_batch()
+            try:
+                self._dispatchers.submit(self._settle, batch)
+            except Exception as e:
+                print(f"Embedding batcher hatası: {e}")
+                self._settle(batch, failed=True)
+
+    def _settle(self, batch: List[tuple], failed: bool = False):
+        """Batch'i gönderir (gönderim thread'inde) ve slotunu bırakır"""
+        try:
+            if not failed:
+                self._dispatch(batch)
+        except Exception as e:
+            print(f"Embedding batcher hatası: {e}")
+        finally:
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(None)
+            # drain() kuyruktan alınmış ama henüz sonuçlanmamış öğeleri de
+            # unfinished_tasks üzerinden bekler
+            for _ in batch:
+                self._queue.task_done()
+            self._dispatch_slots.release()
+
+    def drain(self, timeout: float) -> bool:
+        """
+        Bekleyen ve gönderilmekte olan batch'lerin tamamlanmasını bekler (kapanışta)
+
+        Args:
+            timeout: Maksimum bekleme süresi (saniye)
+
+        Returns:
+            bool: Kuyruk zamanında boşaldıysa True
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self._queue.unfinished_tasks == 0:
+                return True
+            time.sleep(0.01)
+        return False
+
+    def _dispatch(self, batch: List[tuple]):
+        """
+        Batch'i gönderir ve sonuçları future'lara dağıtır
+
+        Args:
+            batch: (metin, future) çiftleri
+        """
+        unique_texts = list(dict.fromkeys(text for text, _ in batch))
+        self._record_batch(len(unique_texts), len(batch) - len(unique_texts))
+
+        try:
+            vectors = self.send_batch(unique_texts)
+        except Exception as e:
+            with self._lock:
+                self._stats["errors"] += 1
+            print(f"Embedding batch gönderim hatası: {e}")
+            vectors = [None] * len(unique_texts)
+
+        results = dict(zip(unique_texts, vectors))
+        for text, future in batch:
+            vector = results.get(text)
+            future.set_result(list(vector) if vector else None)
+
+    def _record_batch(self, size: int, deduplicated: int):
+        """Batch boyutunu histograma ve sayaçlara işler"""
+        with self._lock:
+            self._stats["batches"] += 1
+            self._stats["texts_sent"] += size
+            self._stats["deduplicated"] += deduplicated
+            for bucket in self.HISTOGRAM_BUCKETS:
+                if size <= bucket:
+                    self._histogram[bucket] += 1
+                    break
+            else:
+                self._histogram["+Inf"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Batch boyutu histogramını ve sayaçları döndürür
+
+        Returns:
+            Dict[str, Any]: Batcher istatistikleri
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            histogram = {f"le_{bucket}": count for bucket, count in self._histogram.items()}
+
+        stats["max_batch_size"] = self.max_batch_size
+        stats["max_wait_ms"] = self.max_wait * 1000.0
+        stats["max_in_flight"] = self.max_in_flight
+        stats["pending"] = self._queue.qsize()
+        stats["avg_batch_size"] = round(stats["texts_sent"] / stats["batches"], 2) if stats["batches"] else 0.0
+        stats["batch_size_histogram"] = histogram
+        return stats
@@ -0,0 +1,239 @@
+"""
+Finansal Agentic Proje Embedding Önbelleği
+==========================================
+
+Bu modül OllamaService.get_embedding önünde duran iki katmanlı,
+içerik hash'li bir embedding önbelleği sağlar.
+
+Katmanlar:
+- L1: Süreç içi LRU (mikrosaniye erişim)
+- L2: Redis (süreçler ve yeniden başlatmalar arasında paylaşılır)
+
+Anahtar model adı + metin içeriğinin SHA-256 özetidir; böylece aynı metin
+farklı bir embedding modeliyle asla karıştırılmaz.
+"""
+
+import hashlib
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List
+
+from config import config
+
+
+class EmbeddingCache:
+    """
+    İki katmanlı (LRU + Redis) embedding önbelleği
+
+    Thread-safe çalışır. Redis erişilemezse yalnızca L1 katmanı kullanılır.
+    """
+
+    def __init__(self, redis_service=None):
+        """
+        Önbelleği başlatır
+
+        Args:
+            redis_service: L2 katmanı için RedisService instance'ı (opsiyonel)
+        """
+        cache_config = config.get_embedding_cache_config()
+        self.enabled = cache_config["enabled"]
+        self.max_entries = cache_config["max_entries"]
+        self.redis_ttl = cache_config["redis_ttl"]
+        self.key_pattern = cache_config["key_pattern"]
+        self.redis_service = redis_service
+
+        self._entries: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"l1_hits": 0, "l2_hits": 0, "misses": 0, "stores": 0, "redis_errors": 0}
+
+    def _digest(self, model: str, text: str) -> str:
+        """Model adı ve metin için içerik hash'i üretir"""
+        return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+    def _redis_client(self):
+        """L2 katmanı için Redis client'ını döndürür (yoksa None)"""
+        if self.redis_service is None:
+            return None
+        return self.redis_service.client
+
+    def _remember(self, digest: str, vector: List[float]):
+        """Vektörü L1 LRU'ya ekler ve kapasiteyi korur"""
+        with self._lock:
+            self._entries[digest] = vector
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _count(self, stat: str):
+        """İstatistik sayacını artırır"""
+        with self._lock:
+            self._stats[stat] += 1
+
+    def _async_redis_client(self):
+        """L2 katmanı için async Redis client'ını döndürür (yoksa None)"""
+        if self.redis_service is None:
+            return None
+        return self.redis_service.get_async_client()
+
+    def _get_local(self, digest: str) -> Optional[List[float]]:
+        """L1 LRU'daki vektörü döndürür (yoksa None)"""
+        with self._lock:
+            vector = self._entries.get(digest)
+            if vector is not None:
+                self._entries.move_to_end(digest)
+                self._stats["l1_hits"] += 1
+                return list(vector)
+        return None
+
+    def _load_remote(self, digest: str, raw: Optional[bytes]) -> Optional[List[float]]:
+        """Redis'ten okunan ham vektörü çözer ve L1'e ekler"""
+        if not raw:
+            return None
+        vector = array("d")
+        vector.frombytes(raw)
+        vector = vector.tolist()
+        self._remember(digest, vector)
+        self._count("l2_hits")
+        return list(vector)
+
+    def get(self, model: str, text: str) -> Optional[List[float]]:
+        """
+        Önbellekteki embedding'i döndürür
+
+        Args:
+            model: Embedding model adı
+            text: Embedding'i istenen metin
+
+        Returns:
+            List[float]: Embedding vektörü veya None
+        """
+        if not self.enabled:
+            return None
+
+        digest = self._digest(model, text)
+        vector = self._get_local(digest)
+        if vector is not None:
+            return vector
+
+        client = self._redis_client()
+        if client is not None:
+            try:
+                vector = self._load_remote(
+                    digest, client.get(self.key_pattern.format(model=model, digest=digest))
+                )
+                if vector is not None:
+                    return vector
+            except Exception as e:
+                self._count("redis_errors")
+                print(f"Embedding cache Redis okuma hatası: {e}")
+
+        self._count("misses")
+        return None
+
+    async def aget(self, model: str, text: str) -> Optional[List[float]]:
+        """
+        get'in async karşılığı (L2 okuması redis.asyncio ile yapılır)
+
+        Args:
+            model: Embedding model adı
+            text: Embedding'i istenen metin
+
+        Returns:
+            List[float]: Embedding vektörü veya None
+        """
+        if not self.enabled:
+            return None
+
+        digest = self._digest(model, text)
+        vector = self._get_local(digest)
+        if vector is not None:
+            return vector
+
+        client = self._async_redis_client()
+        if client is not None:
+            try:
+                vector = self._load_remote(
+                    digest, await client.get(self.key_pattern.format(model=model, digest=digest))
+                )
+                if vector is not None:
+                    return vector
+            except Exception as e:
+                self._count("redis_errors")
+                print(f"Embedding cache Redis okuma hatası: {e}")
+
+        self._count("misses")
+        return None
+
+    def put(self, model: str, text: str, vector: List[float]):
+        """
+        Embedding'i her iki katmana yazar
+
+        Args:
+            model: Embedding model adı
+            text: Metin
+            vector: Embedding vektörü
+        """
+        if not self.enabled or not vector:
+            return
+
+        digest = self._digest(model, text)
+        self._remember(digest, list(vector))
+        self._count("stores")
+
+        client = self._redis_client()
+        if client is not None:
+            try:
+                client.set(
+                    self.key_pattern.format(model=model, digest=digest),
+                    array("d", vector).tobytes(),
+                    ex=self.redis_ttl
+                )
+            except Exception as e:
+                self._count("redis_errors")
+                print(f"Embedding cache Redis yazma hatası: {e}")
+
+    async def aput(self, model: str, text: str, vector: List[float]):
+        """
+        put'un async karşılığı
+
+        Args:
+            model: Embedding model adı
+            text: Metin
+            vector: Embedding vektörü
+        """
+        if not self.enabled or not vector:
+            return
+
+        digest = self._digest(model, text)
+        self._remember(digest, list(vector))
+        self._count("stores")
+
+        client = self._async_redis_client()
+        if client is not None:
+            try:
+                await client.set(
+                    self.key_pattern.format(model=model, digest=digest),
+                    array("d", vector).tobytes(),
+                    ex=self.redis_ttl
+                )
+            except Exception as e:
+                self._count("redis_errors")
+                print(f"Embedding cache Redis yazma hatası: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Önbellek hit-rate istatistiklerini döndürür
+
+        Returns:
+            Dict[str, Any]: Katman bazlı hit/miss sayıları ve oranlar
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+
+        lookups = stats["l1_hits"] + stats["l2_hits"] + stats["misses"]
+        stats["max_entries"] = self.max_entries
+        stats["hit_rate"] = round((stats["l1_hits"] + stats["l2_hits"]) / lookups, 4) if lookups else 0.0
+        stats["l1_hit_rate"] = round(stats["l1_hits"] / lookups, 4) if lookups else 0.0
+        return stats
@@ -0,0 +1,241 @@
+"""
+Finansal Agentic Proje Event Bus
+================================
+
+Bu modül publisher_queue arkasındaki event taşıma katmanını sağlar.
+Workflow'lar ve API handler'ları event'leri put ile yayınlar,
+EventBroadcaster get ile okuyup /stream client'larına dağıtır.
+
+Backend'ler:
+- memory: Süreç içi queue.Queue (varsayılan, tek süreç)
+- redis-pubsub: Redis PUBLISH/SUBSCRIBE; her worker tüm event'leri alır
+- redis-streams: Redis XADD/XREAD; bağlantı koparsa kaldığı id'den devam eder
+  ve stream id'leri tüm worker'larda aynı SSE id'sini üretir
+
+Redis backend'lerinde put edilen event doğrudan yerel kuyruğa yazılmaz;
+bu worker'ın listener thread'i de event'i Redis'ten alır. Böylece tüm
+worker'lar aynı event'leri aynı sırayla görür.
+"""
+
+import json
+import queue
+import threading
+import time
+from typing import Dict, Any, Optional
+
+import redis
+
+from config import config
+
+
+class InMemoryEventBus:
+    """
+    Süreç içi event bus (queue.Queue sarmalayıcısı)
+
+    Tek süreçli çalışmada varsayılan backend'dir.
+    """
+
+    backend = "memory"
+
+    def __init__(self):
+        """Yerel kuyruğu başlatır"""
+        self._queue: "queue.Queue" = queue.Queue()
+        self._stats = {"published": 0, "publish_errors": 0, "received": 0}
+
+    def put(self, item: Optional[Dict[str, Any]]):
+        """
+        Event'i yayınlar
+
+        Args:
+            item: {"event": ..., "data": ...} zarfı (None: broadcaster durdurma sinyali)
+        """
+        if item is not None:
+            self._stats["published"] += 1
+            self._stats["received"] += 1
+        self._queue.put(item)
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Sıradaki event'i döndürür (queue.Queue.get ile aynı semantik)"""
+        return self._queue.get(block, timeout)
+
+    def qsize(self) -> int:
+        """Bekleyen event sayısı"""
+        return self._queue.qsize()
+
+    def close(self):
+        """Kaynakları serbest bırakır (bellek backend'inde işlem yok)"""
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Event bus sayaçlarını döndürür
+
+        Returns:
+            Dict[str, Any]: Backend adı, sayaçlar ve kuyruk derinliği
+        """
+        return dict(self._stats, backend=self.backend, pending=self.qsize())
+
+
+class RedisEventBus(InMemoryEventBus):
+    """
+    Redis tabanlı, süreçler arası event bus
+
+    put event'i Redis'e yazar; arka plan listener thread'i kanaldaki
+    (veya stream'deki) tüm event'leri yerel kuyruğa aktarır.
+    """
+
+    def __init__(self, mode: str = "pubsub"):
+        """
+        Redis event bus'ı başlatır
+
+        Args:
+            mode: "pubsub" veya "streams"
+        """
+        super().__init__()
+        bus_config = config.get_event_bus_config()
+        self.backend = f"redis-{mode}"
+        self.mode = mode
+        self.channel = bus_config["channel"]
+        self.stream_maxlen = bus_config["stream_maxlen"]
+        self.block_ms = bus_config["block_ms"]
+
+        self.client = redis.from_url(config.REDIS_URL)
+        # from_url bağlantıyı ilk komuta kadar açmaz; Redis yoksa burada hata
+        # verilsin ki create_event_bus bellek içi bus'a düşebilsin
+        self.client.ping()
+        self._stats["listener_reconnects"] = 0
+        self._closing = threading.Event()
+        self._last_stream_id = "$"
+        self._last_local_id = 0
+        self._local_id_lock = threading.Lock()
+
+        self._listener = threading.Thread(
+            target=self._listen, name=f"event-bus-{mode}", daemon=True
+        )
+        self._listener.start()
+        print(f"✅ Event bus başlatıldı: {self.backend} ({self.channel})")
+
+    def put(self, item: Optional[Dict[str, Any]]):
+        """
+        Event'i Redis üzerinden tüm worker'lara yayınlar
+
+        Redis'e yazılamazsa event en azından bu worker'ın client'larına ulaşsın
+        diye yerel kuyruğa yazılır. None (durdurma sinyali) her zaman yereldir.
+
+        Args:
+            item: {"event": ..., "data": ...} zarfı
+        """
+        if item is None:
+            self._queue.put(None)
+            return
+
+        try:
+            payload = json.dumps(item, default=str)
+            if self.mode == "streams":
+                self.client.xadd(
+                    self.channel, {"item": payload},
+                    maxlen=self.stream_maxlen, approximate=True
+                )
+            else:
+                self.client.publish(self.channel, payload)
+            self._stats["published"] += 1
+        except Exception as e:
+            self._stats["publish_errors"] += 1
+            print(f"❌ Event bus yayın hatası, yerel kuyruğa yazılıyor: {e}")
+            if self.mode == "streams":
+                item = dict(item, id=self._next_local_id())
+            self._queue.put(item)
+
+    def _next_local_id(self) -> int:
+        """
+        Yerel kuyruğa düşen event için stream id'leriyle aynı ölçekte SSE id'si üretir
+
+        Stream event'leri ms * 1000 + seq id'si taşır; broadcaster'ın sayaç
+        id'si bunların çok altında kalacağı için Last-Event-ID replay'i bozulurdu.
+        Üretilen id son okunan stream id'sinden ve önceki yerel id'den büyüktür.
+        """
+        with self._local_id_lock:
+            candidate = int(time.time() * 1000) * 1000
+            if self._last_stream_id != "$":
+                ms, seq = self._last_stream_id.split("-")
+                candidate = max(candidate, int(ms) * 1000 + int(seq) + 1)
+            self._last_local_id = max(candidate, self._last_local_id + 1)
+            return self._last_local_id
+
+    def _listen(self):
+        """Listener loop'u - Redis bağlantısı koparsa yeniden bağlanır"""
+        while not self._closing.is_set():
+            try:
+                if self.mode == "streams":
+                    self._listen_streams()
+                else:
+                    self._listen_pubsub()
+            except Exception as e:
+                if self._closing.is_set():
+                    break
+                self._stats["listener_reconnects"] += 1
+                print(f"Event bus listener hatası, yeniden bağlanılıyor: {e}")
+                time.sleep(1)
+
+    def _listen_pubsub(self):
+        """Pub/sub kanalını dinler ve mesajları yerel kuyruğa aktarır"""
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(self.channel)
+        try:
+            while not self._closing.is_set():
+                message = pubsub.get_message(timeout=self.block_ms / 1000.0)
+                if message and message.get("type") == "message":
+                    self._deliver(json.loads(message["data"]))
+        finally:
+            pubsub.close()
+
+    def _listen_streams(self):
+        """Stream'i son okunan id'den itibaren okur ve yerel kuyruğa aktarır"""
+        while not self._closing.is_set():
+            response = self.client.xread({self.channel: self._last_stream_id}, block=self.block_ms, count=100)
+            for _, entries in response or []:
+                for entry_id, fields in entries:
+                    entry_id = entry_id.decode() if isinstance(entry_id, bytes) else entry_id
+                    self._last_stream_id = entry_id
+                    raw = fields.get(b"item") or fields.get("item")
+                    if raw is None:
+                        continue
+                    item = json.loads(raw)
+                    # Stream id'si (ms-seq) tüm worker'larda aynı SSE id'sini verir
+                    ms, seq = entry_id.split("-")
+                    item["id"] = int(ms) * 1000 + int(seq)
+                    self._deliver(item)
+
+    def _deliver(self, item: Dict[str, Any]):
+        """Redis'ten gelen event'i yerel kuyruğa ekler"""
+        self._stats["received"] += 1
+        self._queue.put(item)
+
+    def close(self):
+        """Listener'ı durdurur ve Redis bağlantısını kapatır"""
+        self._closing.set()
+        try:
+            self.client.close()
+        except Exception as e:
+            print(f"Event bus kapatma hatası: {e}")
+
+
+def create_event_bus():
+    """
+    Konfigürasyondaki backend'e göre event bus oluşturur
+
+    Redis backend'i başlatılamazsa bellek içi bus'a düşülür.
+
+    Returns:
+        InMemoryEventBus: put/get/qsize arayüzüne sahip event bus
+    """
+    backend = config.get_event_bus_config()["backend"]
+
+    if backend in ("redis-pubsub", "redis-streams"):
+        try:
+            return RedisEventBus(mode=backend.split("-", 1)[1])
+        except Exception as e:
+            print(f"❌ Redis event bus başlatılamadı, bellek içi bus kullanılacak: {e}")
+    elif backend != "memory":
+        print(f"⚠️ Bilinmeyen event bus backend'i: {backend}, bellek içi bus kullanılacak")
+
+    return InMemoryEventBus()
@@ -0,0 +1,12 @@
+"""
+Finansal Agentic Proje gunicorn Konfigürasyonu
+==============================================
+
+Harici gunicorn CLI'ı ile kullanım için; ayarlar Config.GUNICORN'dan okunur.
+
+    gunicorn -c gunicorn.conf.py wsgi:application
+"""
+
+from server import build_gunicorn_options
+
+globals().update(build_gunicorn_options())
@@ -0,0 +1,312 @@
+"""
+Finansal Agentic Proje Paylaşımlı HTTP İstemci Katmanı
+======================================================
+
+Bu modül Ollama, Hugging Face ve MCP Finance Tools'a giden tüm HTTP
+çağrıları için ortak, keep-alive destekli bir bağlantı havuzu sağlar.
+
+Her host için ayrı bir requests.Session tutulur; böylece aynı host'a
+yapılan ardışık çağrılar TCP/TLS el sıkışmasını tekrar etmeden açık
+bağlantıyı yeniden kullanır (özellikle ngrok üzerindeki uzak Ollama için).
+
+Özellikler:
+- Host bazlı keep-alive bağlantı havuzu (yapılandırılabilir boyut)
+- Havuz hit/miss sayaçları (yeniden kullanılan / yeni açılan bağlantılar)
+- Tool-bound LLM runnable önbelleği (bind_tools tekrarını engeller)
+- Async workflow için event loop başına paylaşılan httpx.AsyncClient
+"""
+
+import asyncio
+import inspect
+import threading
+import weakref
+from typing import Dict, Any, Optional, List, Callable
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import config
+
+
+class LoopLocal:
+    """
+    Event loop başına tek bir async client tutan kayıt
+
+    httpx.AsyncClient, redis.asyncio ve AsyncQdrantClient bağlantıları
+    oluşturuldukları event loop'a bağlıdır; bu sınıf her loop için client'ı
+    bir kez oluşturur ve o loop içindeki tüm coroutine'lerle paylaşır.
+    """
+
+    def __init__(self, factory: Callable[[], Any], closer: Optional[Callable[[Any], Any]] = None):
+        """
+        Kaydı başlatır
+
+        Args:
+            factory: Yeni async client oluşturan fonksiyon
+            closer: Client'ı kapatan fonksiyon (varsayılan: aclose, yoksa close)
+        """
+        self._factory = factory
+        self._closer = closer
+        self._clients: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def get(self) -> Any:
+        """
+        Çalışan event loop'un client'ını döndürür (yoksa oluşturur)
+
+        Returns:
+            Any: Loop'a ait async client
+        """
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is not None:
+            return client
+
+        with self._lock:
+            client = self._clients.get(loop)
+            if client is None:
+                client = self._factory()
+                self._clients[loop] = client
+            return client
+
+    def clients(self) -> List[Any]:
+        """Oluşturulmuş tüm client'ları döndürür"""
+        with self._lock:
+            return list(self._clients.values())
+
+    async def aclose(self):
+        """Çalışan event loop'un client'ını kapatır ve kayıttan çıkarır (loop kapanmadan önce)"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.pop(loop, None)
+        if client is None:
+            return
+
+        try:
+            if self._closer is not None:
+                result = self._closer(client)
+            else:
+                result = (getattr(client, "aclose", None) or client.close)()
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            print(f"Async client kapatma hatası: {e}")
+
+
+class HTTPClientPool:
+    """
+    Host bazlı keep-alive bağlantı havuzlarını yöneten sınıf
+
+    Her scheme://host:port için tek bir requests.Session oluşturur ve
+    tüm servisler bu session'ları paylaşır. Thread-safe çalışır.
+    """
+
+    def __init__(self):
+        """Bağlantı havuzu yöneticisini başlatır"""
+        pool_config = config.get_http_pool_config()
+        self.pool_connections = pool_config["pool_connections"]
+        self.pool_maxsize = pool_config["pool_maxsize"]
+        self.pool_block = pool_config["pool_block"]
+        self.max_retries = pool_config["max_retries"]
+
+        self._sessions: Dict[str, requests.Session] = {}
+        self._bound_runnables: Dict[int, Any] = {}
+        self._async_clients = LoopLocal(self._create_async_client)
+        self._lock = threading.Lock()
+
+    def _host_key(self, url: str) -> str:
+        """
+        URL'den havuz anahtarını (scheme://netloc) çıkarır
+
+        Args:
+            url: İstek URL'i
+
+        Returns:
+            str: Host anahtarı
+        """
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def _create_session(self) -> requests.Session:
+        """Yapılandırılmış havuz boyutlarıyla yeni bir session oluşturur"""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+            max_retries=self.max_retries
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _create_async_client(self) -> httpx.AsyncClient:
+        """Sync havuzla aynı boyutlarda yeni bir httpx.AsyncClient oluşturur"""
+        print("🔌 Async HTTP bağlantı havuzu oluşturuldu")
+        # Özel transport verildiğinde client'ın limits parametresi yok sayılır; limitler transport'a verilir
+        return httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(
+                limits=httpx.Limits(
+                    max_connections=self.pool_connections * self.pool_maxsize,
+                    max_keepalive_connections=self.pool_maxsize
+                ),
+                retries=self.max_retries
+            )
+        )
+
+    def async_client(self) -> httpx.AsyncClient:
+        """
+        Çalışan event loop için paylaşılan httpx.AsyncClient'ı döndürür
+
+        Tek client tüm host'lara keep-alive bağlantı havuzu tutar; async
+        workflow'daki eşzamanlı istekler thread bloklamadan bu havuzu paylaşır.
+
+        Returns:
+            httpx.AsyncClient: Loop'a ait async HTTP client
+        """
+        return self._async_clients.get()
+
+    async def aclose_async_client(self):
+        """Çalışan event loop'un httpx.AsyncClient'ını kapatır"""
+        await self._async_clients.aclose()
+
+    def session_for(self, url: str) -> requests.Session:
+        """
+        URL'in host'u için paylaşılan session'ı döndürür
+
+        Args:
+            url: İstek URL'i
+
+        Returns:
+            requests.Session: Host'a ait keep-alive session
+        """
+        key = self._host_key(url)
+        session = self._sessions.get(key)
+        if session is not None:
+            return session
+
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = self._create_session()
+                self._sessions[key] = session
+                print(f"🔌 HTTP bağlantı havuzu oluşturuldu: {key}")
+            return session
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Paylaşılan havuz üzerinden HTTP isteği gönderir
+
+        Args:
+            method: HTTP metodu
+            url: İstek URL'i
+            **kwargs: requests parametreleri (json, headers, timeout, stream...)
+
+        Returns:
+            requests.Response: HTTP yanıtı
+        """
+        return self.session_for(url).request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """GET isteği gönderir"""
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """POST isteği gönderir"""
+        return self.request("POST", url, **kwargs)
+
+    def bind_tools(self, llm: Any, tools: List) -> Any:
+        """
+        LLM'in tool-bound runnable'ını önbellekten döndürür
+
+        Agent node'ları her çağrıda llm.bind_tools(tools) ile yeni bir
+        runnable oluşturmak yerine aynı instance'ı kullanır.
+
+        Args:
+            llm: LangChain chat modeli
+            tools: Bağlanacak araç listesi
+
+        Returns:
+            Any: Tool-bound runnable
+        """
+        key = id(llm)
+        bound = self._bound_runnables.get(key)
+        if bound is not None:
+            return bound
+
+        with self._lock:
+            bound = self._bound_runnables.get(key)
+            if bound is None:
+                bound = llm.bind_tools(tools)
+                self._bound_runnables[key] = bound
+            return bound
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Havuz hit/miss istatistiklerini döndürür
+
+        urllib3 her havuz için açılan bağlantı (num_connections) ve gönderilen
+        istek (num_requests) sayılarını tutar. Yeni bağlantı gerektiren her istek
+        bir "miss", açık bağlantıyı yeniden kullanan her istek bir "hit"tir.
+
+        Returns:
+            Dict[str, Any]: Host bazlı ve toplam havuz istatistikleri
+        """
+        hosts = {}
+        total_hits = 0
+        total_misses = 0
+
+        with self._lock:
+            sessions = list(self._sessions.items())
+
+        for key, session in sessions:
+            requests_count = 0
+            connections_count = 0
+            for adapter in set(session.adapters.values()):
+                pools = adapter.poolmanager.pools
+                for pool_key in list(pools.keys()):
+                    pool = pools.get(pool_key)
+                    if pool is None:
+                        continue
+                    requests_count += pool.num_requests
+                    connections_count += pool.num_connections
+
+            misses = min(connections_count, requests_count)
+            hits = requests_count - misses
+            total_hits += hits
+            total_misses += misses
+            hosts[key] = {
+                "requests": requests_count,
+                "hits": hits,
+                "misses": misses
+            }
+
+        total = total_hits + total_misses
+        return {
+            "pool_connections": self.pool_connections,
+            "pool_maxsize": self.pool_maxsize,
+            "hits": total_hits,
+            "misses": total_misses,
+            "hit_rate": round(total_hits / total, 4) if total else 0.0,
+            "hosts": hosts,
+            "async_clients": len(self._async_clients.clients())
+        }
+
+    def close(self):
+        """Tüm session'ları ve açık bağlantıları kapatır"""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+            self._bound_runnables.clear()
+
+        for session in sessions:
+            try:
+                session.close()
+            except Exception as e:
+                print(f"HTTP session kapatma hatası: {e}")
+
+
+# Global HTTP istemci havuzu instance'ı
+http_client = HTTPClientPool()
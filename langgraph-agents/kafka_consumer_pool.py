@@ -0,0 +1,326 @@
+"""
+Finansal Agentic Proje Kafka Deposit Consumer Havuzu
+====================================================
+
+Bu modül transactions.deposit mesajlarını sabit boyutlu bir worker
+havuzunda işler. Her mesaj için yeni thread açmak yerine:
+
+- Mesajlar userId hash'ine göre worker'lara dağıtılır; aynı kullanıcının
+  deposit'leri sırayla, farklı kullanıcılarınki paralel işlenir
+- Worker kuyrukları dolduğunda partition'lar pause edilir, boşalınca resume
+- Offset'ler auto-commit yerine yalnızca işlem bittikten sonra, partition
+  bazında kesintisiz tamamlanan en yüksek noktaya kadar manuel commit edilir
+- Kapanışta henüz başlamamış mesajlar commit edilmeden bırakılır (Kafka yeniden
+  teslim eder); yalnızca çalışan işler çağıranın süre sınırı içinde beklenir
+"""
+
+import queue
+import threading
+import time
+import zlib
+from typing import Callable, Dict, Any, List, Optional, Set
+
+from kafka import KafkaConsumer, TopicPartition
+from kafka.consumer.subscription_state import ConsumerRebalanceListener
+from kafka.structs import OffsetAndMetadata
+
+from config import config
+
+
+class _RebalanceListener(ConsumerRebalanceListener):
+    """Partition'lar geri alınmadan önce tamamlanan offset'leri commit eder, yeni atananlara backpressure uygular"""
+
+    def __init__(self, pool: "DepositConsumerPool"):
+        self.pool = pool
+
+    def on_partitions_revoked(self, revoked):
+        self.pool._on_partitions_revoked(revoked)
+
+    def on_partitions_assigned(self, assigned):
+        self.pool._on_partitions_assigned(assigned)
+
+
+class DepositConsumerPool:
+    """
+    Backpressure destekli, sabit boyutlu Kafka consumer worker havuzu
+
+    Consumer tek bir thread'den (run) kullanılır; worker'lar yalnızca
+    tamamlanan offset'leri completion kuyruğuna bildirir, commit ve
+    pause/resume işlemleri consumer thread'inde yapılır.
+    """
+
+    def __init__(self, consumer: KafkaConsumer, topic: str, handler: Callable[[Dict[str, Any]], None]):
+        """
+        Havuzu başlatır
+
+        Args:
+            consumer: enable_auto_commit=False ile oluşturulmuş KafkaConsumer
+            topic: Dinlenen topic
+            handler: Her event için çağrılacak işleyici (workflow çalıştırır)
+        """
+        consumer_config = config.get_kafka_consumer_config()
+        self.num_workers = consumer_config["workers"]
+        self.queue_capacity = consumer_config["worker_queue_size"]
+        self.max_poll_records = consumer_config["max_poll_records"]
+        self.poll_timeout_ms = consumer_config["poll_timeout_ms"]
+
+        self.consumer = consumer
+        self.topic = topic
+        self.handler = handler
+
+        self._worker_queues: List["queue.Queue"] = [queue.Queue() for _ in range(self.num_workers)]
+        self._workers: List[threading.Thread] = []
+        self._completions: "queue.Queue" = queue.Queue()
+        self._stopping = threading.Event()
+        self._stopped = threading.Event()
+        self._stop_deadline: Optional[float] = None
+
+        # Partition bazında işlenmekte olan offset'ler ve commit takibi
+        self._in_flight: Dict[TopicPartition, Set[int]] = {}
+        self._next_offset: Dict[TopicPartition, int] = {}
+        self._committed: Dict[TopicPartition, int] = {}
+        self._paused = False
+
+        self._stats_lock = threading.Lock()
+        self._stats = {"received": 0, "processed": 0, "failed": 0, "commits": 0, "pauses": 0, "resumes": 0, "dropped": 0}
+
+    # ========================================
+    # WORKER'LAR
+    # ========================================
+
+    def _start_workers(self):
+        """Sabit sayıda worker thread'i başlatır"""
+        for index, worker_queue in enumerate(self._worker_queues):
+            worker = threading.Thread(
+                target=self._worker_loop,
+                args=(worker_queue,),
+                name=f"deposit-worker-{index}",
+                daemon=True
+            )
+            worker.start()
+            self._workers.append(worker)
+
+    def _worker_loop(self, worker_queue: "queue.Queue"):
+        """Worker loop'u - kuyruğundaki event'leri sırayla işler"""
+        while True:
+            item = worker_queue.get()
+            if item is None:
+                break
+
+            tp, offset, event_data = item
+            try:
+                self.handler(event_data)
+                self._count("processed")
+            except Exception as e:
+                self._count("failed")
+                print(f"❌ Deposit worker hatası: {e}")
+            finally:
+                # Hata olsa da handler kendi fallback'ini çalıştırdı; offset tamamlandı sayılır
+                self._completions.put((tp, offset))
+
+    def _worker_for(self, event_data: Dict[str, Any]) -> int:
+        """userId'ye göre sabit worker indeksini seçer (kullanıcı bazında sıralama)"""
+        payload = event_data.get("payload", {}) if isinstance(event_data, dict) else {}
+        user_id = str(payload.get("userId") or event_data.get("userId") or "") if isinstance(event_data, dict) else ""
+        return zlib.crc32(user_id.encode("utf-8")) % self.num_workers
+
+    # ========================================
+    # CONSUMER LOOP
+    # ========================================
+
+    def run(self):
+        """
+        Consumer loop'unu çalıştırır (stop çağrılana kadar bloklar)
+
+        Bu metod consumer'ın sahibi olan thread'de çağrılmalıdır.
+        """
+        self.consumer.subscribe([self.topic], listener=_RebalanceListener(self))
+        self._start_workers()
+        print(f"✅ Kafka deposit consumer havuzu başlatıldı: {self.num_workers} worker")
+
+        try:
+            while not self._stopping.is_set():
+                self._drain_completions()
+                self._apply_backpressure()
+
+                records = self.consumer.poll(
+                    timeout_ms=self.poll_timeout_ms,
+                    max_records=self.max_poll_records
+                )
+                for tp, messages in records.items():
+                    for message in messages:
+                        self._dispatch(tp, message)
+
+                self._apply_backpressure()
+        except Exception as e:
+            print(f"❌ Kafka consumer havuzu hatası: {e}")
+        finally:
+            if self._shutdown_workers():
+                self._stopped.set()
+
+    def _dispatch(self, tp: TopicPartition, message):
+        """Mesajı ilgili worker kuyruğuna ekler ve offset'i in-flight işaretler"""
+        event_data = message.value
+        self._count("received")
+        self._in_flight.setdefault(tp, set()).add(message.offset)
+        self._next_offset[tp] = max(self._next_offset.get(tp, 0), message.offset + 1)
+        print(f"📨 Kafka event alındı: {event_data}")
+        self._worker_queues[self._worker_for(event_data)].put((tp, message.offset, event_data))
+
+    def _apply_backpressure(self):
+        """Worker kuyrukları dolunca partition'ları pause, boşalınca resume eder"""
+        depths = [q.qsize() for q in self._worker_queues]
+
+        if not self._paused and max(depths) >= self.queue_capacity:
+            assignment = self.consumer.assignment()
+            if assignment:
+                self.consumer.pause(*assignment)
+                self._paused = True
+                self._count("pauses")
+                print(f"⏸️ Worker havuzu dolu, partition'lar pause edildi (kuyruklar: {depths})")
+        elif self._paused and max(depths) > self.queue_capacity // 2:
+            # Pause sürerken atanmış ama pause edilmemiş partition kalmasın
+            unpaused = set(self.consumer.assignment()) - set(self.consumer.paused())
+            if unpaused:
+                self.consumer.pause(*unpaused)
+        elif self._paused and max(depths) <= self.queue_capacity // 2:
+            paused = self.consumer.paused()
+            if paused:
+                self.consumer.resume(*paused)
+            self._paused = False
+            self._count("resumes")
+            print("▶️ Worker havuzu boşaldı, partition'lar resume edildi")
+
+    def _drain_completions(self, partitions: Optional[Set[TopicPartition]] = None):
+        """
+        Tamamlanan offset'leri işler ve commit edilebilir noktaları commit eder
+
+        Args:
+            partitions: Yalnızca bu partition'lar için commit et (None: hepsi)
+        """
+        while True:
+            try:
+                tp, offset = self._completions.get_nowait()
+            except queue.Empty:
+                break
+            in_flight = self._in_flight.get(tp)
+            if in_flight is not None:
+                in_flight.discard(offset)
+
+        offsets = {}
+        for tp, in_flight in self._in_flight.items():
+            if partitions is not None and tp not in partitions:
+                continue
+            # İşlenmekte olan en küçük offset'e kadar her şey tamamlandı
+            commit_offset = min(in_flight) if in_flight else self._next_offset.get(tp)
+            if commit_offset is not None and commit_offset > self._committed.get(tp, -1):
+                offsets[tp] = OffsetAndMetadata(commit_offset, None)
+
+        if not offsets:
+            return
+
+        try:
+            self.consumer.commit(offsets=offsets)
+            for tp, meta in offsets.items():
+                self._committed[tp] = meta.offset
+            self._count("commits")
+        except Exception as e:
+            print(f"❌ Kafka offset commit hatası: {e}")
+
+    def _on_partitions_assigned(self, assigned):
+        """Havuz pause durumundayken yeni atanan partition'ları da pause eder"""
+        print(f"📥 Kafka partition'ları atandı: {[f'{tp.topic}-{tp.partition}' for tp in assigned]}")
+        if self._paused and assigned:
+            self.consumer.pause(*assigned)
+            print("⏸️ Worker havuzu dolu, yeni atanan partition'lar pause edildi")
+
+    def _on_partitions_revoked(self, revoked):
+        """Rebalance öncesi tamamlananları commit eder ve takibi bırakır"""
+        revoked = set(revoked)
+        self._drain_completions(revoked)
+        for tp in revoked:
+            self._in_flight.pop(tp, None)
+            self._next_offset.pop(tp, None)
+            self._committed.pop(tp, None)
+        print(f"📤 Kafka partition'ları geri alındı: {[f'{tp.topic}-{tp.partition}' for tp in revoked]}")
+
+    # ========================================
+    # YAŞAM DÖNGÜSÜ
+    # ========================================
+
+    def stop(self, timeout: float = 30.0) -> bool:
+        """
+        Yeni mesaj almayı durdurur, çalışan işleri bekler ve offset'leri commit eder
+
+        Kuyrukta bekleyen (başlamamış) mesajlar commit edilmeden bırakılır;
+        Kafka bunları yeniden teslim eder.
+
+        Args:
+            timeout: Çalışan işlerin bitmesi için maksimum bekleme (saniye)
+
+        Returns:
+            bool: Tüm worker'lar zamanında bittiyse True; False ise worker'lar
+            hâlâ workflow çalıştırıyordur ve paylaşılan client'lar kapatılmamalıdır
+        """
+        self._stop_deadline = time.monotonic() + timeout
+        self._stopping.set()
+        return self._stopped.wait(timeout)
+
+    def _shutdown_workers(self) -> bool:
+        """
+        Başlamamış mesajları bırakır, worker'ları süre sınırına kadar bekler ve son commit'i yapar
+
+        Returns:
+            bool: Tüm worker'lar bittiyse True
+        """
+        dropped = 0
+        for worker_queue in self._worker_queues:
+            while True:
+                try:
+                    item = worker_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not None:
+                    dropped += 1
+            worker_queue.put(None)
+        if dropped:
+            # Offset'leri in-flight kaldığı için commit noktası bunların önünde durur
+            with self._stats_lock:
+                self._stats["dropped"] += dropped
+            print(f"⏹️ {dropped} başlamamış deposit mesajı bırakıldı, Kafka yeniden teslim edecek")
+
+        deadline = self._stop_deadline if self._stop_deadline is not None else time.monotonic() + 30.0
+        for worker in self._workers:
+            worker.join(max(deadline - time.monotonic(), 0))
+        finished = not any(worker.is_alive() for worker in self._workers)
+        if not finished:
+            print("⚠️ Deposit worker'ları süre içinde bitmedi, tamamlananlar commit ediliyor")
+
+        self._drain_completions()
+        try:
+            self.consumer.close(autocommit=False)
+        except Exception as e:
+            print(f"Kafka consumer kapatma hatası: {e}")
+        return finished
+
+    def _count(self, stat: str):
+        """Havuz sayacını artırır"""
+        with self._stats_lock:
+            self._stats[stat] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Havuz metriklerini döndürür
+
+        Returns:
+            Dict[str, Any]: Kuyruk derinlikleri, pause durumu ve sayaçlar
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+
+        stats["workers"] = self.num_workers
+        stats["worker_queue_capacity"] = self.queue_capacity
+        stats["worker_queue_depths"] = [q.qsize() for q in self._worker_queues]
+        stats["paused"] = self._paused
+        stats["in_flight"] = sum(len(offsets) for offsets in list(self._in_flight.values()))
+        return stats
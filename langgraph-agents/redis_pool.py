@@ -0,0 +1,180 @@
+"""
+Finansal Agentic Proje Redis Bağlantı Havuzu
+============================================
+
+Bu modül RedisService'in sync ve async client'ları için boyutu, zaman
+aşımları ve sağlık kontrolü Config.get_redis_config'ten gelen bağlantı
+havuzları oluşturur.
+
+Varsayılan redis.from_url havuzu sınırsız bağlantı açar ve yoğunlukta
+sorun görünmez olur. Burada BlockingConnectionPool kullanılır:
+
+- En fazla max_connections bağlantı açılır; havuz doluysa istek
+  pool_timeout saniye boş bağlantı bekler, sonra ConnectionError alır
+- socket_timeout / socket_connect_timeout takılan Redis çağrılarını sınırlar
+- health_check_interval uzun süre boşta kalan bağlantıyı kullanmadan önce doğrular
+- Bağlantı bekleme süresi ve kullanımdaki bağlantı sayısı metrik olarak raporlanır
+"""
+
+import threading
+import time
+from typing import Dict, Any
+
+import redis
+import redis.asyncio
+
+
+class RedisPoolMetrics:
+    """
+    Bağlantı havuzu bekleme süresi ve kullanım sayaçları
+
+    Thread-safe çalışır; async havuzlarda tüm event loop'ların havuzları
+    tek bir metrik nesnesini paylaşır.
+    """
+
+    def __init__(self, max_connections: int):
+        """
+        Sayaçları başlatır
+
+        Args:
+            max_connections: Havuz başına maksimum bağlantı sayısı
+        """
+        self.max_connections = max_connections
+        self._in_use = set()
+        self._lock = threading.Lock()
+        self._stats = {"acquired": 0, "acquire_errors": 0, "peak_in_use": 0}
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def record_acquire(self, connection, wait: float):
+        """Havuzdan alınan bağlantıyı ve bekleme süresini kaydeder"""
+        with self._lock:
+            self._in_use.add(id(connection))
+            self._stats["acquired"] += 1
+            self._stats["peak_in_use"] = max(self._stats["peak_in_use"], len(self._in_use))
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+
+    def record_error(self, wait: float):
+        """Bağlantı alınamayan isteği kaydeder (havuz zaman aşımı veya bağlantı hatası)"""
+        with self._lock:
+            self._stats["acquire_errors"] += 1
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+
+    def record_release(self, connection):
+        """Havuza geri verilen bağlantıyı kaydeder"""
+        with self._lock:
+            self._in_use.discard(id(connection))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Havuz metriklerini döndürür
+
+        Returns:
+            Dict[str, Any]: Kullanımdaki bağlantı, bekleme süresi ve hata sayaçları
+        """
+        with self._lock:
+            attempts = self._stats["acquired"] + self._stats["acquire_errors"]
+            return dict(
+                self._stats,
+                in_use=len(self._in_use),
+                max_connections=self.max_connections,
+                avg_wait_ms=round(self._total_wait / attempts * 1000, 3) if attempts else 0.0,
+                max_wait_ms=round(self._max_wait * 1000, 3)
+            )
+
+
+class InstrumentedBlockingConnectionPool(redis.BlockingConnectionPool):
+    """Bağlantı bekleme süresini ve kullanımını ölçen sync BlockingConnectionPool"""
+
+    def __init__(self, *args, metrics: RedisPoolMetrics, **kwargs):
+        self.metrics = metrics
+        super().__init__(*args, **kwargs)
+
+    def get_connection(self, command_name, *keys, **options):
+        started = time.monotonic()
+        try:
+            connection = super().get_connection(command_name, *keys, **options)
+        except redis.ConnectionError:
+            self.metrics.record_error(time.monotonic() - started)
+            raise
+        self.metrics.record_acquire(connection, time.monotonic() - started)
+        return connection
+
+    def release(self, connection):
+        self.metrics.record_release(connection)
+        super().release(connection)
+
+
+class AsyncInstrumentedBlockingConnectionPool(redis.asyncio.BlockingConnectionPool):
+    """Bağlantı bekleme süresini ve kullanımını ölçen redis.asyncio BlockingConnectionPool"""
+
+    def __init__(self, *args, metrics: RedisPoolMetrics, **kwargs):
+        self.metrics = metrics
+        super().__init__(*args, **kwargs)
+
+    async def get_connection(self, command_name, *keys, **options):
+        started = time.monotonic()
+        try:
+            connection = await super().get_connection(command_name, *keys, **options)
+        except redis.asyncio.ConnectionError:
+            self.metrics.record_error(time.monotonic() - started)
+            raise
+        self.metrics.record_acquire(connection, time.monotonic() - started)
+        return connection
+
+    async def release(self, connection):
+        self.metrics.record_release(connection)
+        await super().release(connection)
+
+
+def _connection_kwargs(redis_config: Dict[str, Any]) -> Dict[str, Any]:
+    """Sync ve async havuzlarda ortak bağlantı ayarlarını döndürür"""
+    return {
+        "timeout": redis_config["pool_timeout"],
+        "socket_timeout": redis_config["socket_timeout"],
+        "socket_connect_timeout": redis_config["socket_connect_timeout"],
+        "socket_keepalive": True,
+        "health_check_interval": redis_config["health_check_interval"]
+    }
+
+
+def create_redis_client(redis_config: Dict[str, Any], metrics: RedisPoolMetrics) -> redis.Redis:
+    """
+    Ayarlı havuzla sync Redis client'ı oluşturur
+
+    Args:
+        redis_config: Config.get_redis_config sonucu
+        metrics: Havuz metrik nesnesi
+
+    Returns:
+        redis.Redis: Havuzu paylaşan thread-safe client
+    """
+    pool = InstrumentedBlockingConnectionPool.from_url(
+        redis_config["url"],
+        metrics=metrics,
+        max_connections=redis_config["max_connections"],
+        **_connection_kwargs(redis_config)
+    )
+    return redis.Redis(connection_pool=pool)
+
+
+def create_async_redis_client(redis_config: Dict[str, Any], metrics: RedisPoolMetrics) -> "redis.asyncio.Redis":
+    """
+    Ayarlı havuzla redis.asyncio client'ı oluşturur (event loop başına bir kez çağrılır)
+
+    Args:
+        redis_config: Config.get_redis_config sonucu
+        metrics: Tüm loop'ların paylaştığı havuz metrik nesnesi
+
+    Returns:
+        redis.asyncio.Redis: Çağrıldığı event loop'a ait client
+    """
+    pool = AsyncInstrumentedBlockingConnectionPool.from_url(
+        redis_config["url"],
+        metrics=metrics,
+        max_connections=redis_config["async_max_connections"],
+        **_connection_kwargs(redis_config)
+    )
+    return redis.asyncio.Redis(connection_pool=pool)
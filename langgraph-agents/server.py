@@ -0,0 +1,124 @@
+"""
+Finansal Agentic Proje Production Sunucusu
+==========================================
+
+Bu modül uygulamayı Flask development server yerine gunicorn ile çalıştırır.
+
+Özellikler:
+- Worker sayısı, worker sınıfı (gthread / gevent), keep-alive ve
+  zaman aşımları Config.GUNICORN üzerinden yapılandırılır
+- Uygulama singleton'ları (servisler, workflow, broadcaster, Kafka consumer)
+  master süreçte değil, her worker'da fork sonrası bir kez oluşturulur;
+  böylece thread'ler fork ile kaybolmaz ve iki kez başlatılmaz
+- Worker SIGTERM aldığında gunicorn'un kendi kapanışından önce
+  FinancialAgenticApp.shutdown() çalışır (workflow'lar ve tamponlar boşaltılır)
+
+Kullanım:
+- SERVER_MODE=production python app.py
+- gunicorn -c gunicorn.conf.py wsgi:application
+"""
+
+import signal
+from typing import Dict, Any
+
+from gunicorn.app.base import BaseApplication
+
+from config import config
+
+
+def install_shutdown_handler(worker):
+    """
+    Worker'ın SIGTERM handler'ını uygulama kapanışıyla sarar (post_worker_init hook'u)
+
+    Gunicorn SIGTERM'de yalnızca HTTP isteklerinin bitmesini bekler; arka plan
+    executor'ındaki workflow'lar, Kafka consumer'ı ve event tamponları bu sürede
+    boşaltılmazsa graceful_timeout sonunda SIGKILL ile yarıda kalır.
+
+    Args:
+        worker: Gunicorn worker instance'ı
+    """
+    previous_handler = signal.getsignal(signal.SIGTERM)
+
+    def handle_sigterm(signum, frame):
+        from app import FinancialAgenticApp
+        if FinancialAgenticApp._initialized:
+            FinancialAgenticApp._instance.shutdown()
+        if callable(previous_handler):
+            previous_handler(signum, frame)
+
+    signal.signal(signal.SIGTERM, handle_sigterm)
+
+
+def build_gunicorn_options() -> Dict[str, Any]:
+    """
+    Config'ten gunicorn ayarlarını oluşturur
+
+    Returns:
+        Dict[str, Any]: gunicorn ayar adı ve değeri
+    """
+    server_config = config.get_server_config()
+    worker_class = server_config["worker_class"]
+
+    options = {
+        "bind": server_config["bind"],
+        "workers": server_config["workers"],
+        "worker_class": worker_class,
+        "keepalive": server_config["keepalive"],
+        "timeout": server_config["timeout"],
+        "graceful_timeout": server_config["graceful_timeout"],
+        "backlog": server_config["backlog"],
+        # Singleton'lar master'da oluşturulmamalı (arka plan thread'leri fork'ta kaybolur)
+        "preload_app": False,
+        "accesslog": "-",
+        "errorlog": "-",
+        "post_worker_init": install_shutdown_handler
+    }
+
+    if worker_class == "gthread":
+        options["threads"] = server_config["threads"]
+    elif worker_class == "gevent":
+        options["worker_connections"] = server_config["worker_connections"]
+
+    if server_config["workers"] > 1 and config.get_event_bus_config()["backend"] == "memory":
+        print("⚠️ Birden fazla gunicorn worker'ı bellek içi event bus ile çalışıyor; "
+              "/stream yalnızca kendi worker'ının event'lerini görür (EVENT_BUS_BACKEND=redis-streams önerilir)")
+
+    return options
+
+
+class FinancialGunicornApp(BaseApplication):
+    """
+    Uygulamayı gömülü gunicorn ile çalıştıran sınıf
+
+    load() her worker'da çağrılır ve o worker'ın FinancialAgenticApp
+    singleton'ını oluşturur.
+    """
+
+    def __init__(self, options: Dict[str, Any]):
+        """
+        Gunicorn uygulamasını başlatır
+
+        Args:
+            options: gunicorn ayarları
+        """
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        """Ayarları gunicorn konfigürasyonuna yükler"""
+        for key, value in self.options.items():
+            if key in self.cfg.settings and value is not None:
+                self.cfg.set(key.lower(), value)
+
+    def load(self):
+        """Worker içinde Flask uygulamasını oluşturur ve döndürür"""
+        from wsgi import application
+        return application
+
+
+def run_production_server():
+    """Uygulamayı Config'teki ayarlarla gunicorn altında çalıştırır"""
+    options = build_gunicorn_options()
+    print(f"🚀 Production sunucusu başlatılıyor: {options['bind']} "
+          f"({options['workers']} worker, {options['worker_class']})")
+    FinancialGunicornApp(options).run()
@@ -16,15 +16,22 @@ Servisler:
 
 import json
 import time
-import requests
+import threading
 import redis
-from typing import Optional, Dict, Any, List
+import redis.asyncio
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Callable, Iterable, Tuple
 from kafka import KafkaConsumer, KafkaProducer
-from qdrant_client import QdrantClient
+from qdrant_client import QdrantClient, AsyncQdrantClient
 from qdrant_client.models import Distance, VectorParams, PointStruct
 from langchain_ollama import OllamaLLM, OllamaEmbeddings
 
 from config import config
+from http_client import http_client, LoopLocal
+from embedding_cache import EmbeddingCache
+from embedding_batcher import EmbeddingBatcher
+from redis_pool import RedisPoolMetrics, create_redis_client, create_async_redis_client
 
 
 class ServiceManager:
@@ -44,41 +51,172 @@ class ServiceManager:
             cls._instance = super(ServiceManager, cls).__new__(cls)
         return cls._instance
     
+    # Servis adı -> oluşturma sırası (warm-up bu sırayı izler; bağımlılıklar öncedir)
+    SERVICE_NAMES = ("redis", "ollama", "qdrant", "kafka", "huggingface", "mcp")
+    
     def __init__(self):
-        """Servis bağlantılarını başlatır"""
+        """Servis yöneticisini başlatır (bağlantılar ilk kullanımda veya warm-up'ta kurulur)"""
         if not ServiceManager._initialized:
             self._initialize_services()
             ServiceManager._initialized = True
     
     def _initialize_services(self):
-        """Tüm servisleri başlatır"""
-        print("Servis bağlantıları başlatılıyor...")
+        """
+        Lazy servis kayıtlarını hazırlar
+        
+        Hiçbir uzak bağlantı burada kurulmaz; her servis ilk erişildiğinde
+        veya start_warmup ile başlatılan arka plan thread'inde oluşturulur.
+        """
+        self._services: Dict[str, Any] = {}
+        self._locks = {name: threading.RLock() for name in self.SERVICE_NAMES}
+        self._readiness = {name: "pending" for name in self.SERVICE_NAMES}
+        self._warmup_thread: Optional[threading.Thread] = None
+        self._warmup_lock = threading.Lock()
         
-        # Servis instance'larını oluştur
-        self.redis_service = RedisService()
-        self.qdrant_service = QdrantService()
-        self.kafka_service = KafkaService()
-        self.ollama_service = OllamaService()
-        self.huggingface_service = HuggingFaceService()
-        self.mcp_service = MCPService()
+        # Ollama embedding önbelleği Redis'i, Qdrant ise Ollama'yı kullandığı için sıra önemli
+        self._factories: Dict[str, Callable[[], Any]] = {
+            "redis": RedisService,
+            "ollama": lambda: OllamaService(self.redis_service),
+            "qdrant": lambda: QdrantService(self.ollama_service),
+            "kafka": KafkaService,
+            "huggingface": HuggingFaceService,
+            "mcp": MCPService
+        }
+    
+    def _get_service(self, name: str) -> Any:
+        """
+        Servisi döndürür, henüz oluşturulmadıysa oluşturur
         
+        Args:
+            name: Servis adı
+            
+        Returns:
+            Any: Servis instance'ı
+        """
+        service = self._services.get(name)
+        if service is not None:
+            return service
+        
+        with self._locks[name]:
+            service = self._services.get(name)
+            if service is None:
+                self._readiness[name] = "initializing"
+                start = time.monotonic()
+                try:
+                    service = self._factories[name]()
+                except Exception:
+                    self._readiness[name] = "failed"
+                    raise
+                self._services[name] = service
+                self._readiness[name] = "ready"
+                print(f"✅ {name} servisi hazır ({(time.monotonic() - start) * 1000:.0f}ms)")
+            return service
+    
+    @property
+    def redis_service(self) -> "RedisService":
+        return self._get_service("redis")
+    
+    @property
+    def ollama_service(self) -> "OllamaService":
+        return self._get_service("ollama")
+    
+    @property
+    def qdrant_service(self) -> "QdrantService":
+        return self._get_service("qdrant")
+    
+    @property
+    def kafka_service(self) -> "KafkaService":
+        return self._get_service("kafka")
+    
+    @property
+    def huggingface_service(self) -> "HuggingFaceService":
+        return self._get_service("huggingface")
+    
+    @property
+    def mcp_service(self) -> "MCPService":
+        return self._get_service("mcp")
+    
+    def start_warmup(self):
+        """Tüm servisleri arka plan thread'inde sırayla başlatır (idempotent)"""
+        with self._warmup_lock:
+            if self._warmup_thread is not None:
+                return
+            self._warmup_thread = threading.Thread(
+                target=self._warmup, name="service-warmup", daemon=True
+            )
+            self._warmup_thread.start()
+    
+    def _warmup(self):
+        """Warm-up loop'u - bir servisin hatası diğerlerini engellemez"""
+        print("Servis bağlantıları arka planda başlatılıyor...")
+        for name in self.SERVICE_NAMES:
+            try:
+                self._get_service(name)
+            except Exception as e:
+                print(f"❌ {name} servisi başlatılamadı: {e}")
         print("Tüm servis bağlantıları tamamlandı")
     
+    def get_readiness(self) -> Dict[str, str]:
+        """
+        Servislerin başlatılma durumunu döndürür
+        
+        Returns:
+            Dict[str, str]: Servis adı ve durumu (pending, initializing, ready, failed)
+        """
+        return dict(self._readiness)
+    
+    def is_ready(self, name: str) -> bool:
+        """Servis oluşturulmuş mu kontrol eder (bloklamaz)"""
+        return self._readiness.get(name) == "ready"
+    
     def get_health_status(self) -> Dict[str, bool]:
         """
         Tüm servislerin sağlık durumunu kontrol eder
         
+        Henüz başlatılmamış servisler beklenmeden False olarak raporlanır.
+        
         Returns:
             Dict[str, bool]: Servis adı ve durumu
         """
         return {
-            "redis": self.redis_service.is_healthy(),
-            "qdrant": self.qdrant_service.is_healthy(),
-            "kafka": self.kafka_service.is_healthy(),
-            "ollama": self.ollama_service.is_healthy(),
-            "huggingface": self.huggingface_service.is_healthy(),
+            "redis": self.is_ready("redis") and self.redis_service.is_healthy(),
+            "qdrant": self.is_ready("qdrant") and self.qdrant_service.is_healthy(),
+            "kafka": self.is_ready("kafka") and self.kafka_service.is_healthy(),
+            "ollama": self.is_ready("ollama") and self.ollama_service.is_healthy(),
+            "huggingface": self.is_ready("huggingface") and self.huggingface_service.is_healthy(),
             "workflow": True  # Workflow her zaman True (runtime'da kontrol edilir)
         }
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Servis katmanının performans metriklerini döndürür
+        
+        Returns:
+            Dict[str, Any]: Metrik grubu adı ve değerleri
+        """
+        metrics = {"http_pool": http_client.get_stats(), "readiness": self.get_readiness()}
+        if self.is_ready("redis"):
+            metrics["redis_pool"] = self.redis_service.get_pool_stats()
+            metrics["redis_snapshot_cache"] = self.redis_service.get_snapshot_stats()
+        if self.is_ready("ollama"):
+            metrics["embedding_cache"] = self.ollama_service.embedding_cache.get_stats()
+            metrics["embedding_batcher"] = self.ollama_service.embedding_batcher.get_stats()
+        if self.is_ready("kafka"):
+            metrics["kafka_producer"] = self.kafka_service.get_stats()
+        return metrics
+    
+    async def aclose_async_clients(self):
+        """
+        Çalışan event loop'a ait async client'ları kapatır
+        
+        httpx.AsyncClient, redis.asyncio ve AsyncQdrantClient bağlantıları loop'a
+        bağlıdır; loop durdurulmadan önce bu loop içinde çağrılmalıdır.
+        """
+        await http_client.aclose_async_client()
+        if self.is_ready("redis"):
+            await self.redis_service.aclose_async_client()
+        if self.is_ready("qdrant"):
+            await self.qdrant_service.aclose_async_client()
 
 
 class RedisService:
@@ -91,13 +229,38 @@ class RedisService:
     
     def __init__(self):
         """Redis bağlantısını başlatır"""
+        redis_config = config.get_redis_config()
+        self.redis_config = redis_config
+        self.user_events_max = redis_config["user_events_max"]
+        self.user_events_transactional = redis_config["user_events_transactional"]
+        self.snapshot_events = redis_config["snapshot_events"]
+        self.snapshot_cache_ttl = redis_config["snapshot_cache_ttl"]
+        self.snapshot_cache_max_entries = redis_config["snapshot_cache_max_entries"]
+        
+        # Kısa vadeli hafıza snapshot önbelleği: user_id -> (son geçerlilik zamanı, snapshot)
+        self._snapshots: "OrderedDict[str, tuple]" = OrderedDict()
+        # Kullanıcı başına son yazma sırası: yazmadan önce başlayan okuma önbelleğe eski snapshot koymaz.
+        # Kayıt sayısı sınırlıdır; atılan kullanıcılar için taban değer (floor) kullanılır
+        self._snapshot_generations: "OrderedDict[str, int]" = OrderedDict()
+        self._snapshot_write_seq = 0
+        self._snapshot_generation_floor = 0
+        self._snapshot_lock = threading.Lock()
+        self._snapshot_stats = {"hits": 0, "misses": 0, "invalidations": 0, "stale_skips": 0}
+        
+        # Sync client tüm thread'lerin paylaştığı tek havuzu, async client'lar loop başına havuzu kullanır
+        self.pool_metrics = RedisPoolMetrics(redis_config["max_connections"])
+        self.async_pool_metrics = RedisPoolMetrics(redis_config["async_max_connections"])
         self.client: Optional[redis.Redis] = None
+        self._async_clients = LoopLocal(
+            lambda: create_async_redis_client(self.redis_config, self.async_pool_metrics),
+            closer=lambda client: client.close(close_connection_pool=True)
+        )
         self._connect()
     
     def _connect(self):
-        """Redis'e bağlanır"""
+        """Redis'e ayarlı bağlantı havuzuyla bağlanır"""
         try:
-            self.client = redis.from_url(config.REDIS_URL)
+            self.client = create_redis_client(self.redis_config, self.pool_metrics)
             # Bağlantıyı test et
             self.client.ping()
             print("✅ Redis bağlantısı başarılı")
@@ -115,6 +278,23 @@ class RedisService:
         except:
             return False
     
+    def get_async_client(self) -> Optional["redis.asyncio.Redis"]:
+        """
+        Çalışan event loop için redis.asyncio client'ını döndürür
+        
+        Sync bağlantı kurulamadıysa Redis erişilemez kabul edilir ve None döner.
+        
+        Returns:
+            redis.asyncio.Redis: Loop'a ait async client veya None
+        """
+        if not self.client:
+            return None
+        return self._async_clients.get()
+    
+    async def aclose_async_client(self):
+        """Çalışan event loop'un redis.asyncio client'ını ve havuzunu kapatır"""
+        await self._async_clients.aclose()
+    
     def set_user_action(self, user_id: str, action_data: Dict[str, Any]) -> bool:
         """
         Kullanıcının son eylemini Redis'te saklar
@@ -140,6 +320,8 @@ class RedisService:
         except Exception as e:
             print(f"Redis set_user_action hatası: {e}")
             return False
+        finally:
+            self._invalidate_snapshot(user_id)
     
     def get_user_action(self, user_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -162,10 +344,63 @@ class RedisService:
             print(f"Redis get_user_action hatası: {e}")
             return None
     
+    async def aset_user_action(self, user_id: str, action_data: Dict[str, Any]) -> bool:
+        """set_user_action'ın async karşılığı"""
+        client = self.get_async_client()
+        if not client:
+            return False
+        
+        try:
+            key = config.REDIS_KEYS["USER_LAST_ACTION"].format(user_id=user_id)
+            await client.set(
+                key,
+                json.dumps(action_data),
+                ex=config.REDIS_TTL["USER_ACTION"]
+            )
+            return True
+        except Exception as e:
+            print(f"Redis set_user_action hatası: {e}")
+            return False
+        finally:
+            self._invalidate_snapshot(user_id)
+    
+    async def aget_user_action(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """get_user_action'ın async karşılığı"""
+        client = self.get_async_client()
+        if not client:
+            return None
+        
+        try:
+            key = config.REDIS_KEYS["USER_LAST_ACTION"].format(user_id=user_id)
+            data = await client.get(key)
+            return json.loads(data) if data else None
+        except Exception as e:
+            print(f"Redis get_user_action hatası: {e}")
+            return None
+    
+    def _queue_user_event(self, pipe, user_id: str, event_data: Dict[str, Any]):
+        """
+        Event yazma komutlarını pipeline'a ekler (LPUSH + LTRIM + EXPIRE)
+        
+        Sync ve async pipeline'larda komutlar kuyruğa alınır; execute'ta tek
+        round-trip'te gönderilir.
+        
+        Args:
+            pipe: Redis pipeline'ı
+            user_id: Kullanıcı ID'si
+            event_data: Etkinlik verisi
+        """
+        key = config.REDIS_KEYS["USER_LAST_EVENTS"].format(user_id=user_id)
+        pipe.lpush(key, json.dumps(event_data))
+        pipe.ltrim(key, 0, self.user_events_max - 1)
+        pipe.expire(key, config.REDIS_TTL["USER_EVENTS"])
+    
     def push_user_event(self, user_id: str, event_data: Dict[str, Any]) -> bool:
         """
         Kullanıcı etkinliğini Redis listesine ekler
         
+        Liste en yeni USER_EVENTS_MAX etkinlikle sınırlanır.
+        
         Args:
             user_id: Kullanıcı ID'si
             event_data: Etkinlik verisi
@@ -173,17 +408,224 @@ class RedisService:
         Returns:
             bool: Başarılı ise True
         """
+        return self.push_user_events([(user_id, event_data)]) == 1
+    
+    def push_user_events(self, events: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        """
+        Birden fazla kullanıcının etkinliklerini tek round-trip'te yazar
+        
+        Aynı kullanıcının etkinlikleri verilen sırayla eklenir (sonuncusu listenin başında olur).
+        
+        Args:
+            events: (user_id, event_data) çiftleri
+            
+        Returns:
+            int: Yazılan etkinlik sayısı (hata durumunda 0)
+        """
         if not self.client:
-            return False
+            return 0
+        
+        events = list(events)
+        if not events:
+            return 0
         
         try:
-            key = config.REDIS_KEYS["USER_LAST_EVENTS"].format(user_id=user_id)
-            self.client.lpush(key, json.dumps(event_data))
-            self.client.expire(key, config.REDIS_TTL["USER_EVENTS"])
-            return True
+            pipe = self.client.pipeline(transaction=self.user_events_transactional)
+            for user_id, event_data in events:
+                self._queue_user_event(pipe, user_id, event_data)
+            pipe.execute()
+            return len(events)
         except Exception as e:
             print(f"Redis push_user_event hatası: {e}")
-            return False
+            return 0
+        finally:
+            for user_id, _ in events:
+                self._invalidate_snapshot(user_id)
+    
+    async def apush_user_event(self, user_id: str, event_data: Dict[str, Any]) -> bool:
+        """push_user_event'in async karşılığı"""
+        return await self.apush_user_events([(user_id, event_data)]) == 1
+    
+    async def apush_user_events(self, events: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        """push_user_events'in async karşılığı"""
+        client = self.get_async_client()
+        if not client:
+            return 0
+        
+        events = list(events)
+        if not events:
+            return 0
+        
+        try:
+            pipe = client.pipeline(transaction=self.user_events_transactional)
+            for user_id, event_data in events:
+                self._queue_user_event(pipe, user_id, event_data)
+            await pipe.execute()
+            return len(events)
+        except Exception as e:
+            print(f"Redis push_user_event hatası: {e}")
+            return 0
+        finally:
+            for user_id, _ in events:
+                self._invalidate_snapshot(user_id)
+    
+    def _cached_snapshot(self, user_id: str) -> tuple:
+        """
+        Süresi dolmamış önbellek snapshot'ını döndürür
+        
+        Returns:
+            tuple: (snapshot veya None, Redis okumasından önce kaydedilen yazma sayacı)
+        """
+        with self._snapshot_lock:
+            generation = self._snapshot_generations.get(user_id, self._snapshot_generation_floor)
+            entry = self._snapshots.get(user_id)
+            if entry is not None and entry[0] > time.monotonic():
+                self._snapshots.move_to_end(user_id)
+                self._snapshot_stats["hits"] += 1
+                return entry[1], generation
+            self._snapshots.pop(user_id, None)
+            self._snapshot_stats["misses"] += 1
+            return None, generation
+    
+    def _remember_snapshot(self, user_id: str, snapshot: Dict[str, Any], generation: int):
+        """
+        Snapshot'ı SNAPSHOT_CACHE_TTL süresince önbelleğe ekler
+        
+        Okuma sürerken kullanıcıya yazma yapıldıysa (sayaç değiştiyse) snapshot
+        eski olabilir ve önbelleğe alınmaz.
+        """
+        if self.snapshot_cache_ttl <= 0:
+            return
+        with self._snapshot_lock:
+            if self._snapshot_generations.get(user_id, self._snapshot_generation_floor) != generation:
+                self._snapshot_stats["stale_skips"] += 1
+                return
+            self._snapshots[user_id] = (time.monotonic() + self.snapshot_cache_ttl, snapshot)
+            self._snapshots.move_to_end(user_id)
+            while len(self._snapshots) > self.snapshot_cache_max_entries:
+                self._snapshots.popitem(last=False)
+    
+    def _invalidate_snapshot(self, user_id: str):
+        """Kullanıcının önbellekteki snapshot'ını siler ve yazma sayacını artırır (eylem veya etkinlik yazıldığında)"""
+        with self._snapshot_lock:
+            self._snapshot_write_seq += 1
+            self._snapshot_generations[user_id] = self._snapshot_write_seq
+            self._snapshot_generations.move_to_end(user_id)
+            while len(self._snapshot_generations) > self.snapshot_cache_max_entries:
+                self._snapshot_generations.popitem(last=False)
+                # Atılan kullanıcıyı okuyan istekler de sayacı değişmiş görür
+                self._snapshot_generation_floor = self._snapshot_write_seq
+            if self._snapshots.pop(user_id, None) is not None:
+                self._snapshot_stats["invalidations"] += 1
+    
+    def _user_snapshot_keys(self, user_id: str) -> Tuple[str, str]:
+        """Kullanıcının son eylem ve etkinlik listesi anahtarlarını döndürür"""
+        return (config.REDIS_KEYS["USER_LAST_ACTION"].format(user_id=user_id),
+                config.REDIS_KEYS["USER_LAST_EVENTS"].format(user_id=user_id))
+    
+    def _decode_snapshot(self, raw_action: Optional[bytes], raw_events: List[bytes]) -> Dict[str, Any]:
+        """
+        Pipeline yanıtını snapshot'a çevirir (JSON yalnızca burada, bir kez çözülür)
+        
+        Args:
+            raw_action: GET user:{id}:last_action yanıtı
+            raw_events: LRANGE user:{id}:last_events yanıtı (en yeni başta)
+            
+        Returns:
+            Dict[str, Any]: {"last_action": dict | None, "events": [dict, ...]}
+        """
+        events = []
+        for raw_event in raw_events or []:
+            try:
+                event = json.loads(raw_event)
+            except (TypeError, ValueError):
+                continue
+            if isinstance(event, dict):
+                events.append(event)
+        return {
+            "last_action": json.loads(raw_action) if raw_action else None,
+            "events": events
+        }
+    
+    def get_user_snapshot(self, user_id: str) -> Dict[str, Any]:
+        """
+        Kullanıcının son eylemini ve son etkinliklerini tek round-trip'te alır
+        
+        Sonuç kısa süre süreç içinde önbelleğe alınır; set_user_action ve
+        push_user_event önbelleği geçersiz kılar. Dönen snapshot salt okunurdur.
+        
+        Args:
+            user_id: Kullanıcı ID'si
+            
+        Returns:
+            Dict[str, Any]: {"last_action": dict | None, "events": [dict, ...]}
+        """
+        snapshot, generation = self._cached_snapshot(user_id)
+        if snapshot is not None:
+            return snapshot
+        
+        if not self.client:
+            return {"last_action": None, "events": []}
+        
+        try:
+            action_key, events_key = self._user_snapshot_keys(user_id)
+            pipe = self.client.pipeline(transaction=False)
+            pipe.get(action_key)
+            pipe.lrange(events_key, 0, self.snapshot_events - 1)
+            raw_action, raw_events = pipe.execute()
+            snapshot = self._decode_snapshot(raw_action, raw_events)
+        except Exception as e:
+            print(f"Redis get_user_snapshot hatası: {e}")
+            return {"last_action": None, "events": []}
+        
+        self._remember_snapshot(user_id, snapshot, generation)
+        return snapshot
+    
+    async def aget_user_snapshot(self, user_id: str) -> Dict[str, Any]:
+        """get_user_snapshot'ın async karşılığı"""
+        snapshot, generation = self._cached_snapshot(user_id)
+        if snapshot is not None:
+            return snapshot
+        
+        client = self.get_async_client()
+        if not client:
+            return {"last_action": None, "events": []}
+        
+        try:
+            action_key, events_key = self._user_snapshot_keys(user_id)
+            pipe = client.pipeline(transaction=False)
+            pipe.get(action_key)
+            pipe.lrange(events_key, 0, self.snapshot_events - 1)
+            raw_action, raw_events = await pipe.execute()
+            snapshot = self._decode_snapshot(raw_action, raw_events)
+        except Exception as e:
+            print(f"Redis get_user_snapshot hatası: {e}")
+            return {"last_action": None, "events": []}
+        
+        self._remember_snapshot(user_id, snapshot, generation)
+        return snapshot
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """
+        Bağlantı havuzu metriklerini döndürür
+        
+        Returns:
+            Dict[str, Any]: Sync havuz ve event loop havuzlarının (toplam) bekleme/kullanım sayaçları
+        """
+        return {
+            "sync": self.pool_metrics.get_stats(),
+            "async": dict(self.async_pool_metrics.get_stats(), loops=len(self._async_clients.clients()))
+        }
+    
+    def get_snapshot_stats(self) -> Dict[str, Any]:
+        """
+        Snapshot önbelleği istatistiklerini döndürür
+        
+        Returns:
+            Dict[str, Any]: Hit/miss/geçersiz kılma sayaçları ve önbellek boyutu
+        """
+        with self._snapshot_lock:
+            return dict(self._snapshot_stats, size=len(self._snapshots), ttl=self.snapshot_cache_ttl)
 
 
 class QdrantService:
@@ -194,9 +636,16 @@ class QdrantService:
     benzerlik araması için kullanılır.
     """
     
-    def __init__(self):
-        """Qdrant bağlantısını başlatır"""
+    def __init__(self, ollama_service: Optional["OllamaService"] = None):
+        """
+        Qdrant bağlantısını başlatır
+        
+        Args:
+            ollama_service: Embedding üretimi için paylaşılan OllamaService
+        """
         self.client: Optional[QdrantClient] = None
+        self.ollama_service = ollama_service
+        self._async_clients = LoopLocal(self._create_async_client)
         self._connect()
     
     def _connect(self):
@@ -215,6 +664,28 @@ class QdrantService:
             print(f"❌ Qdrant bağlantı hatası: {e}")
             self.client = None
     
+    def _create_async_client(self) -> AsyncQdrantClient:
+        """Sync client ile aynı adrese bağlanan AsyncQdrantClient oluşturur"""
+        qdrant_config = config.get_qdrant_config()
+        return AsyncQdrantClient(host=qdrant_config["host"], port=qdrant_config["port"])
+    
+    def get_async_client(self) -> Optional[AsyncQdrantClient]:
+        """
+        Çalışan event loop için AsyncQdrantClient'ı döndürür
+        
+        Collection sync bağlantıda oluşturulur; bağlantı kurulamadıysa None döner.
+        
+        Returns:
+            AsyncQdrantClient: Loop'a ait async client veya None
+        """
+        if not self.client:
+            return None
+        return self._async_clients.get()
+    
+    async def aclose_async_client(self):
+        """Çalışan event loop'un AsyncQdrantClient'ını kapatır"""
+        await self._async_clients.aclose()
+    
     def _ensure_collection_exists(self):
         """Financial memory collection'ının varlığını garanti eder"""
         if not self.client:
@@ -266,17 +737,7 @@ class QdrantService:
             if not embedding:
                 return False
             
-            # Point oluştur
-            point = PointStruct(
-                id=int(time.time() * 1000),  # Timestamp as ID
-                vector=embedding,
-                payload={
-                    "userId": user_id,
-                    "content": content,
-                    "timestamp": int(time.time()),
-                    **(metadata or {})
-                }
-            )
+            point = self._build_point(user_id, content, metadata, embedding)
             
             # Point'i sakla
             self.client.upsert(
@@ -314,7 +775,50 @@ class QdrantService:
                 collection_name=config.FINANCIAL_MEMORY_COLLECTION,
                 query_vector=query_embedding,
                 limit=top_k,
-                query_filter={"must": [{"key": "userId", "match": {"value": user_id}}]}
+                query_filter=self._user_filter(user_id)
+            )
+            
+            return [{"payload": hit.payload, "score": hit.score} for hit in search_result]
+        except Exception as e:
+            print(f"Qdrant search_similar hatası: {e}")
+            return []
+    
+    async def astore_memory(self, user_id: str, content: str, metadata: Dict[str, Any] = None) -> bool:
+        """store_memory'nin async karşılığı"""
+        client = self.get_async_client()
+        if not client:
+            return False
+        
+        try:
+            embedding = await self._aget_embedding(content)
+            if not embedding:
+                return False
+            
+            await client.upsert(
+                collection_name=config.FINANCIAL_MEMORY_COLLECTION,
+                points=[self._build_point(user_id, content, metadata, embedding)]
+            )
+            return True
+        except Exception as e:
+            print(f"Qdrant store_memory hatası: {e}")
+            return False
+    
+    async def asearch_similar(self, user_id: str, query_text: str, top_k: int = 3) -> List[Dict[str, Any]]:
+        """search_similar'ın async karşılığı"""
+        client = self.get_async_client()
+        if not client:
+            return []
+        
+        try:
+            query_embedding = await self._aget_embedding(query_text)
+            if not query_embedding:
+                return []
+            
+            search_result = await client.search(
+                collection_name=config.FINANCIAL_MEMORY_COLLECTION,
+                query_vector=query_embedding,
+                limit=top_k,
+                query_filter=self._user_filter(user_id)
             )
             
             return [{"payload": hit.payload, "score": hit.score} for hit in search_result]
@@ -322,6 +826,24 @@ class QdrantService:
             print(f"Qdrant search_similar hatası: {e}")
             return []
     
+    def _build_point(self, user_id: str, content: str, metadata: Optional[Dict[str, Any]],
+                     embedding: List[float]) -> PointStruct:
+        """Hafıza kaydı için Qdrant point'i oluşturur"""
+        return PointStruct(
+            id=int(time.time() * 1000),  # Timestamp as ID
+            vector=embedding,
+            payload={
+                "userId": user_id,
+                "content": content,
+                "timestamp": int(time.time()),
+                **(metadata or {})
+            }
+        )
+    
+    def _user_filter(self, user_id: str) -> Dict[str, Any]:
+        """Aramayı kullanıcının kayıtlarıyla sınırlayan filtre"""
+        return {"must": [{"key": "userId", "match": {"value": user_id}}]}
+    
     def _get_embedding(self, text: str) -> Optional[List[float]]:
         """
         Metin için embedding oluşturur
@@ -332,9 +854,16 @@ class QdrantService:
         Returns:
             List[float]: Embedding vektörü
         """
-        # Ollama servisinden embedding al
-        ollama_service = OllamaService()
-        return ollama_service.get_embedding(text)
+        # Paylaşılan Ollama servisinden embedding al (önbellek dahil)
+        if self.ollama_service is None:
+            self.ollama_service = OllamaService()
+        return self.ollama_service.get_embedding(text)
+    
+    async def _aget_embedding(self, text: str) -> Optional[List[float]]:
+        """_get_embedding'in async karşılığı"""
+        if self.ollama_service is None:
+            self.ollama_service = OllamaService()
+        return await self.ollama_service.aget_embedding(text)
 
 
 class KafkaService:
@@ -348,17 +877,32 @@ class KafkaService:
     def __init__(self):
         """Kafka bağlantısını başlatır"""
         self.producer: Optional[KafkaProducer] = None
+        self.producer_config = config.get_kafka_config()["producer"]
+        self.async_mode = self.producer_config["ASYNC"]
+        self._stats_lock = threading.Lock()
+        self._stats = {"sent": 0, "delivered": 0, "failed": 0, "rejected": 0, "flushes": 0}
+        self._failures_by_topic: Dict[str, int] = {}
+        self._last_error: Optional[str] = None
         self._connect_producer()
     
     def _connect_producer(self):
         """Kafka producer'ı başlatır"""
         try:
             kafka_config = config.get_kafka_config()
+            producer_config = kafka_config["producer"]
+            compression = producer_config["COMPRESSION"]
+            acks = producer_config["ACKS"]
             self.producer = KafkaProducer(
                 bootstrap_servers=kafka_config["bootstrap_servers"],
-                value_serializer=lambda v: json.dumps(v).encode('utf-8')
+                value_serializer=lambda v: json.dumps(v).encode('utf-8'),
+                linger_ms=producer_config["LINGER_MS"],
+                batch_size=producer_config["BATCH_SIZE"],
+                compression_type=None if compression == "none" else compression,
+                buffer_memory=producer_config["BUFFER_MEMORY"],
+                max_block_ms=producer_config["MAX_BLOCK_MS"],
+                acks=int(acks) if acks.isdigit() else acks
             )
-            print("✅ Kafka producer bağlantısı başarılı")
+            print(f"✅ Kafka producer bağlantısı başarılı ({'async' if self.async_mode else 'sync'} mod)")
         except Exception as e:
             print(f"❌ Kafka producer bağlantı hatası: {e}")
             self.producer = None
@@ -367,35 +911,138 @@ class KafkaService:
         """Kafka servisinin sağlık durumunu kontrol eder"""
         return self.producer is not None
     
-    def publish_event(self, topic: str, data: Dict[str, Any]) -> bool:
+    def publish_event(self, topic: str, data: Dict[str, Any], wait: Optional[bool] = None) -> bool:
         """
         Kafka topic'ine event yayınlar
         
+        Asenkron modda (varsayılan) kayıt producer buffer'ına eklenir ve
+        hemen dönülür; teslim sonucu delivery callback'leri ile kaydedilir.
+        Buffer doluysa send() en fazla MAX_BLOCK_MS bekler ve kayıt reddedilir.
+        
         Args:
             topic: Topic adı
             data: Yayınlanacak veri
+            wait: True ise bu kaydın broker onayı beklenir (None: konfigürasyondaki mod)
             
         Returns:
-            bool: Başarılı ise True
+            bool: Kayıt kabul edildiyse (senkron modda teslim edildiyse) True
         """
         if not self.producer:
             return False
         
+        sync = (not self.async_mode) if wait is None else wait
+        
         try:
-            self.producer.send(topic, data)
-            self.producer.flush()
-            return True
+            future = self.producer.send(topic, data)
+            self._count("sent")
         except Exception as e:
+            self._count("rejected")
+            self._record_failure(topic, e)
             print(f"Kafka publish_event hatası: {e}")
             return False
+        
+        if sync:
+            try:
+                future.get(timeout=self.producer_config["SYNC_TIMEOUT"])
+                self._count("delivered")
+                return True
+            except Exception as e:
+                self._count("failed")
+                self._record_failure(topic, e)
+                print(f"Kafka publish_event hatası: {e}")
+                return False
+        
+        future.add_callback(self._on_send_success)
+        future.add_errback(self._on_send_error, topic)
+        return True
+    
+    def _on_send_success(self, record_metadata):
+        """Delivery callback'i - başarılı teslim"""
+        self._count("delivered")
+    
+    def _on_send_error(self, topic: str, exc: Exception):
+        """Delivery callback'i - başarısız teslim"""
+        self._count("failed")
+        self._record_failure(topic, exc)
+        print(f"❌ Kafka teslim hatası ({topic}): {exc}")
     
-    def create_consumer(self, topic: str, group_id: str) -> Optional[KafkaConsumer]:
+    def _count(self, stat: str):
+        """Producer sayacını artırır"""
+        with self._stats_lock:
+            self._stats[stat] += 1
+    
+    def _record_failure(self, topic: str, exc: Exception):
+        """Topic bazlı hata sayacını ve son hatayı kaydeder"""
+        with self._stats_lock:
+            self._failures_by_topic[topic] = self._failures_by_topic.get(topic, 0) + 1
+            self._last_error = f"{topic}: {exc}"
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Buffer'daki tüm kayıtları gönderir ve teslimlerini bekler
+        
+        Yalnızca kapanışta (close) çağrılır. Workflow başına flush yapılmaz: global
+        flush her çalıştırmayı diğerlerinin buffer'daki kayıtlarına bekletir ve
+        linger/batching'i boşa çıkarır; teslimler delivery callback'leriyle izlenir.
+        
+        Args:
+            timeout: Maksimum bekleme süresi (saniye, None: konfigürasyon)
+            
+        Returns:
+            bool: Flush zamanında tamamlandıysa True
+        """
+        if not self.producer:
+            return False
+        
+        try:
+            self.producer.flush(timeout=timeout or self.producer_config["FLUSH_TIMEOUT"])
+            self._count("flushes")
+            return True
+        except Exception as e:
+            print(f"Kafka flush hatası: {e}")
+            return False
+    
+    def close(self, timeout: Optional[float] = None):
+        """
+        Producer'ı flush edip kapatır
+        
+        Args:
+            timeout: Maksimum bekleme süresi (saniye)
+        """
+        if not self.producer:
+            return
+        
+        self.flush(timeout)
+        try:
+            self.producer.close(timeout=timeout or self.producer_config["FLUSH_TIMEOUT"])
+        except Exception as e:
+            print(f"Kafka producer kapatma hatası: {e}")
+        self.producer = None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Producer teslim istatistiklerini döndürür
+        
+        Returns:
+            Dict[str, Any]: Gönderilen, teslim edilen, başarısız ve bekleyen kayıtlar
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+            stats["failures_by_topic"] = dict(self._failures_by_topic)
+            stats["last_error"] = self._last_error
+        
+        stats["mode"] = "async" if self.async_mode else "sync"
+        stats["in_flight"] = max(stats["sent"] - stats["delivered"] - stats["failed"], 0)
+        return stats
+    
+    def create_consumer(self, topic: str, group_id: str, enable_auto_commit: bool = True) -> Optional[KafkaConsumer]:
         """
         Kafka consumer oluşturur
         
         Args:
             topic: Dinlenecek topic
             group_id: Consumer group ID
+            enable_auto_commit: False ise offset'ler çağıran tarafından manuel commit edilir
             
         Returns:
             KafkaConsumer: Consumer instance
@@ -406,7 +1053,8 @@ class KafkaService:
                 topic,
                 bootstrap_servers=kafka_config["bootstrap_servers"],
                 value_deserializer=lambda m: json.loads(m.decode('utf-8')),
-                group_id=group_id
+                group_id=group_id,
+                enable_auto_commit=enable_auto_commit
             )
         except Exception as e:
             print(f"Kafka consumer oluşturma hatası: {e}")
@@ -421,10 +1069,30 @@ class OllamaService:
     yerel Ollama servisi ile iletişim.
     """
     
-    def __init__(self):
-        """Ollama bağlantısını başlatır"""
+    # /api/embed desteklenmiyor görüldükten sonra yeniden denenmeden önce beklenen süre (saniye)
+    BATCH_EMBED_RETRY_SECONDS = 300
+    # Bir embedding isteğinin (batch + tekli fallback dahil) toplam süre bütçesi (saniye)
+    EMBEDDING_TIMEOUT_SECONDS = 30
+    
+    def __init__(self, redis_service: Optional[RedisService] = None):
+        """
+        Ollama bağlantısını başlatır
+        
+        Args:
+            redis_service: Embedding önbelleğinin Redis katmanı için (opsiyonel)
+        """
         self.llm: Optional[OllamaLLM] = None
         self.embeddings: Optional[OllamaEmbeddings] = None
+        self.embedding_cache = EmbeddingCache(redis_service)
+        self.embedding_batcher = EmbeddingBatcher(self._request_embeddings_batch)
+        # Eski Ollama sürümlerinde çoklu girdi /api/embed yoktur; route 404'ünde bir süre
+        # tekli API'ye düşülür (model bulunamadı 404'ü batch desteğini kapatmaz)
+        self._batch_embed_retry_at = 0.0
+        # Batch başarısız olursa tekli istekler sırayla değil paralel gönderilir
+        self._embed_fallback_executor = ThreadPoolExecutor(
+            max_workers=config.get_embedding_batch_config()["max_batch_size"],
+            thread_name_prefix="embedding-fallback"
+        )
         self._connect()
     
     def _connect(self):
@@ -450,23 +1118,79 @@ class OllamaService:
         """
         Metin için embedding oluşturur
         
+        Önce model + içerik hash'li önbelleğe (LRU, ardından Redis) bakılır;
+        yalnızca ıskalamada Ollama'ya gidilir. Batching açıksa istek diğer
+        eşzamanlı isteklerle birlikte tek bir /api/embed çağrısında gönderilir.
+        
         Args:
             text: Embedding oluşturulacak metin
             
         Returns:
             List[float]: Embedding vektörü
         """
-        try:
-            # Direct Ollama API call için
-            import requests
+        model = config.OLLAMA_MODELS["EMBEDDING_MODEL"]
+        cached = self.embedding_cache.get(model, text)
+        if cached is not None:
+            return cached
+        
+        if config.EMBEDDING_BATCH["ENABLED"]:
+            try:
+                embedding = self.embedding_batcher.embed(text, timeout=self.EMBEDDING_TIMEOUT_SECONDS)
+            except Exception as e:
+                print(f"Ollama batch embedding hatası: {e}")
+                embedding = None
+        else:
+            embedding = self._request_embedding(model, text)
+        
+        if embedding:
+            self.embedding_cache.put(model, text, embedding)
+        return embedding
+    
+    async def aget_embedding(self, text: str) -> Optional[List[float]]:
+        """
+        get_embedding'in async karşılığı
+        
+        Önbellek katmanları aynıdır; ıskalamada istek paylaşılan
+        httpx.AsyncClient ile gönderilir. Thread tabanlı EmbeddingBatcher
+        kullanılmaz, eşzamanlı istekler event loop'ta birlikte beklenir.
+        
+        Args:
+            text: Embedding oluşturulacak metin
             
-            response = requests.post(
+        Returns:
+            List[float]: Embedding vektörü
+        """
+        model = config.OLLAMA_MODELS["EMBEDDING_MODEL"]
+        cached = await self.embedding_cache.aget(model, text)
+        if cached is not None:
+            return cached
+        
+        embedding = await self._arequest_embedding(model, text)
+        if embedding:
+            await self.embedding_cache.aput(model, text, embedding)
+        return embedding
+    
+    def _request_embedding(self, model: str, text: str, timeout: float = EMBEDDING_TIMEOUT_SECONDS) -> Optional[List[float]]:
+        """
+        Ollama embedding API'sini çağırır
+        
+        Args:
+            model: Embedding model adı
+            text: Embedding oluşturulacak metin
+            timeout: İstek zaman aşımı (saniye)
+            
+        Returns:
+            List[float]: Embedding vektörü
+        """
+        try:
+            # Direct Ollama API call için (paylaşılan keep-alive havuzu)
+            response = http_client.post(
                 f"{config.OLLAMA_BASE_URL}/api/embeddings",
                 json={
-                    "model": config.OLLAMA_MODELS["EMBEDDING_MODEL"],
+                    "model": model,
                     "prompt": text
                 },
-                timeout=30
+                timeout=timeout
             )
             
             if response.status_code == 200:
@@ -480,6 +1204,87 @@ class OllamaService:
             print(f"Ollama embedding hatası: {e}")
             return None
     
+    async def _arequest_embedding(self, model: str, text: str) -> Optional[List[float]]:
+        """_request_embedding'in async karşılığı"""
+        try:
+            response = await http_client.async_client().post(
+                f"{config.OLLAMA_BASE_URL}/api/embeddings",
+                json={
+                    "model": model,
+                    "prompt": text
+                },
+                timeout=30
+            )
+            
+            if response.status_code == 200:
+                return response.json().get("embedding")
+            
+            print(f"Ollama embedding API hatası: {response.status_code} - {response.text}")
+            return None
+                
+        except Exception as e:
+            print(f"Ollama embedding hatası: {e}")
+            return None
+    
+    def _request_embeddings_batch(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """
+        Birden fazla metni tek istekte Ollama /api/embed ile embed eder
+        
+        /api/embed kullanılamazsa, hata dönerse veya bağlantı hatası olursa metinler
+        /api/embeddings ile paralel gönderilir. Batch ve fallback birlikte
+        EMBEDDING_TIMEOUT_SECONDS bütçesini aşmaz; bekleyen çağıranlar zaman aşımına
+        düşmeden sonuç (veya None) alır.
+        
+        Args:
+            texts: Embedding oluşturulacak metinler
+            
+        Returns:
+            List[Optional[List[float]]]: Metinlerle aynı sırada embedding vektörleri
+        """
+        model = config.OLLAMA_MODELS["EMBEDDING_MODEL"]
+        deadline = time.monotonic() + self.EMBEDDING_TIMEOUT_SECONDS
+        
+        if time.monotonic() >= self._batch_embed_retry_at:
+            try:
+                response = http_client.post(
+                    f"{config.OLLAMA_BASE_URL}/api/embed",
+                    json={"model": model, "input": texts},
+                    timeout=self.EMBEDDING_TIMEOUT_SECONDS
+                )
+                
+                if response.status_code == 200:
+                    embeddings = response.json().get("embeddings") or []
+                    if len(embeddings) == len(texts):
+                        return embeddings
+                    print(f"Ollama batch embedding eksik yanıt: {len(embeddings)}/{len(texts)}")
+                elif response.status_code == 404 and not self._is_model_not_found(response):
+                    print(f"⚠️ Ollama /api/embed desteklenmiyor, {self.BATCH_EMBED_RETRY_SECONDS} sn tekli /api/embeddings kullanılacak")
+                    self._batch_embed_retry_at = time.monotonic() + self.BATCH_EMBED_RETRY_SECONDS
+                else:
+                    print(f"Ollama batch embedding API hatası: {response.status_code} - {response.text}")
+            except Exception as e:
+                print(f"Ollama batch embedding hatası: {e}")
+        
+        # Tekli fallback kalan bütçeyle paralel çalışır (en az 1 sn)
+        timeout = max(deadline - time.monotonic(), 1.0)
+        return list(self._embed_fallback_executor.map(
+            lambda text: self._request_embedding(model, text, timeout), texts
+        ))
+    
+    @staticmethod
+    def _is_model_not_found(response) -> bool:
+        """
+        404 yanıtının route yokluğundan değil, çekilmemiş modelden gelip gelmediğini kontrol eder
+        
+        Ollama model bulunamadığında JSON gövdede {"error": "model ... not found"} döner;
+        /api/embed route'u olmayan eski sürümler ise düz metin "404 page not found" döner.
+        """
+        try:
+            error = response.json().get("error", "")
+        except (ValueError, AttributeError):
+            return False
+        return isinstance(error, str) and "model" in error.lower()
+    
     def generate_text(self, prompt: str) -> Optional[str]:
         """
         LLM ile metin üretir
@@ -498,6 +1303,17 @@ class OllamaService:
         except Exception as e:
             print(f"Ollama text generation hatası: {e}")
             return None
+    
+    async def agenerate_text(self, prompt: str) -> Optional[str]:
+        """generate_text'in async karşılığı"""
+        if not self.llm:
+            return None
+        
+        try:
+            return await self.llm.ainvoke(prompt)
+        except Exception as e:
+            print(f"Ollama text generation hatası: {e}")
+            return None
 
 
 class HuggingFaceService:
@@ -518,13 +1334,19 @@ class HuggingFaceService:
         """Hugging Face servisinin sağlık durumunu kontrol eder"""
         return self.api_key is not None
     
-    def generate_response(self, system_prompt: str, user_prompt: str) -> Dict[str, Any]:
+    def generate_response(self, system_prompt: str, user_prompt: str,
+                          on_token: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
         """
         Hugging Face API ile yanıt üretir
         
+        on_token verilirse istek OpenAI-compatible "stream": true modunda
+        gönderilir ve gelen her kısmi içerik callback'e iletilir. Dönüş
+        formatı streaming olmayan çağrı ile aynıdır.
+        
         Args:
             system_prompt: Sistem prompt'u
             user_prompt: Kullanıcı prompt'u
+            on_token: Kısmi token callback'i (opsiyonel)
             
         Returns:
             Dict[str, Any]: API yanıtı
@@ -533,35 +1355,177 @@ class HuggingFaceService:
             return {"text": "Hugging Face API anahtarı bulunamadı"}
         
         try:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
+            payload, headers = self._build_request(system_prompt, user_prompt)
             
-            payload = {
-                "messages": [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                "model": self.model
-            }
+            if on_token is not None:
+                return self._generate_streaming(payload, headers, on_token)
             
-            response = requests.post(
+            response = http_client.post(
                 self.api_url, 
                 json=payload, 
                 headers=headers, 
                 timeout=config.API_TIMEOUTS["HUGGINGFACE"]
             )
+            return self._parse_completion(response)
+                
+        except Exception as e:
+            return {"error": "huggingface_api_failed", "detail": str(e)}
+    
+    async def agenerate_response(self, system_prompt: str, user_prompt: str,
+                                 on_token: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        """
+        generate_response'un async karşılığı (paylaşılan httpx.AsyncClient ile)
+        
+        Args:
+            system_prompt: Sistem prompt'u
+            user_prompt: Kullanıcı prompt'u
+            on_token: Kısmi token callback'i (opsiyonel)
+            
+        Returns:
+            Dict[str, Any]: API yanıtı
+        """
+        if not self.api_key:
+            return {"text": "Hugging Face API anahtarı bulunamadı"}
+        
+        try:
+            payload, headers = self._build_request(system_prompt, user_prompt)
             
-            result = response.json()
+            if on_token is not None:
+                return await self._agenerate_streaming(payload, headers, on_token)
             
-            if response.status_code == 200 and "choices" in result:
-                return {"text": result["choices"][0]["message"]["content"]}
-            else:
-                return {"error": "huggingface_api_failed", "detail": result.get("error", "Unknown error")}
+            response = await http_client.async_client().post(
+                self.api_url,
+                json=payload,
+                headers=headers,
+                timeout=config.API_TIMEOUTS["HUGGINGFACE"]
+            )
+            return self._parse_completion(response)
                 
         except Exception as e:
             return {"error": "huggingface_api_failed", "detail": str(e)}
+    
+    def _build_request(self, system_prompt: str, user_prompt: str) -> tuple:
+        """
+        Chat completion payload'ını ve header'larını oluşturur
+        
+        Returns:
+            tuple: (payload, headers)
+        """
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        
+        payload = {
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            "model": self.model
+        }
+        return payload, headers
+    
+    def _parse_completion(self, response: Any) -> Dict[str, Any]:
+        """Streaming olmayan chat completion yanıtını çözer (requests veya httpx)"""
+        result = response.json()
+        
+        if response.status_code == 200 and "choices" in result:
+            return {"text": result["choices"][0]["message"]["content"]}
+        else:
+            return {"error": "huggingface_api_failed", "detail": result.get("error", "Unknown error")}
+    
+    def _error_detail(self, response: Any) -> Any:
+        """Başarısız yanıttan hata detayını çıkarır"""
+        try:
+            return response.json().get("error", "Unknown error")
+        except ValueError:
+            return response.text
+    
+    def _parse_stream_line(self, line: str) -> tuple:
+        """
+        SSE stream satırını çözer
+        
+        Args:
+            line: "data: {...}" satırı
+            
+        Returns:
+            tuple: (stream bitti mi, token veya None)
+        """
+        if not line.startswith("data:"):
+            return False, None
+        data = line[len("data:"):].strip()
+        if data == "[DONE]":
+            return True, None
+        try:
+            chunk = json.loads(data)
+        except json.JSONDecodeError:
+            return False, None
+        choices = chunk.get("choices") or [{}]
+        return False, (choices[0].get("delta") or {}).get("content")
+    
+    def _generate_streaming(self, payload: Dict[str, Any], headers: Dict[str, str],
+                            on_token: Callable[[str], None]) -> Dict[str, Any]:
+        """
+        Yanıtı SSE stream olarak alır ve token'ları callback'e iletir
+        
+        Args:
+            payload: Chat completion payload'ı
+            headers: HTTP header'ları
+            on_token: Kısmi token callback'i
+            
+        Returns:
+            Dict[str, Any]: Birleştirilmiş API yanıtı
+        """
+        response = http_client.post(
+            self.api_url,
+            json={**payload, "stream": True},
+            headers=headers,
+            timeout=config.API_TIMEOUTS["HUGGINGFACE"],
+            stream=True
+        )
+        
+        try:
+            if response.status_code != 200:
+                return {"error": "huggingface_api_failed", "detail": self._error_detail(response)}
+            
+            parts = []
+            for raw_line in response.iter_lines():
+                line = raw_line.decode("utf-8", errors="replace") if raw_line else ""
+                done, token = self._parse_stream_line(line)
+                if done:
+                    break
+                if token:
+                    parts.append(token)
+                    on_token(token)
+            
+            return {"text": "".join(parts)}
+        finally:
+            response.close()
+    
+    async def _agenerate_streaming(self, payload: Dict[str, Any], headers: Dict[str, str],
+                                   on_token: Callable[[str], None]) -> Dict[str, Any]:
+        """_generate_streaming'in async karşılığı"""
+        async with http_client.async_client().stream(
+            "POST",
+            self.api_url,
+            json={**payload, "stream": True},
+            headers=headers,
+            timeout=config.API_TIMEOUTS["HUGGINGFACE"]
+        ) as response:
+            if response.status_code != 200:
+                await response.aread()
+                return {"error": "huggingface_api_failed", "detail": self._error_detail(response)}
+            
+            parts = []
+            async for line in response.aiter_lines():
+                done, token = self._parse_stream_line(line)
+                if done:
+                    break
+                if token:
+                    parts.append(token)
+                    on_token(token)
+            
+            return {"text": "".join(parts)}
 
 
 class MCPService:
@@ -579,7 +1543,7 @@ class MCPService:
     def is_healthy(self) -> bool:
         """MCP servisinin sağlık durumunu kontrol eder"""
         try:
-            response = requests.get(f"{self.base_url}/health", timeout=5)
+            response = http_client.get(f"{self.base_url}/health", timeout=5)
             return response.status_code == 200
         except:
             return False
@@ -595,24 +1559,54 @@ class MCPService:
         Returns:
             Dict[str, Any]: Araç yanıtı
         """
-        url = f"{self.base_url.rstrip('/')}/{path.lstrip('/')}"
+        url = self._tool_url(path)
         try:
-            response = requests.post(
+            response = http_client.post(
                 url, 
                 json=payload, 
                 timeout=config.API_TIMEOUTS["MCP_CALL"]
             )
+            return self._parse_tool_response(response, url)
+                
+        except Exception as e:
+            return {"error": "mcp_call_failed", "detail": str(e), "url": url}
+    
+    async def acall_tool(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        call_tool'un async karşılığı (paylaşılan httpx.AsyncClient ile)
+        
+        Args:
+            path: Araç yolu
+            payload: Gönderilecek veri
             
-            if response.status_code == 200:
-                try:
-                    return response.json()
-                except json.JSONDecodeError:
-                    return {"error": "mcp_call_failed", "detail": "Invalid JSON response", "url": url}
-            else:
-                return {"error": "mcp_call_failed", "detail": f"HTTP {response.status_code}: {response.text}", "url": url}
+        Returns:
+            Dict[str, Any]: Araç yanıtı
+        """
+        url = self._tool_url(path)
+        try:
+            response = await http_client.async_client().post(
+                url,
+                json=payload,
+                timeout=config.API_TIMEOUTS["MCP_CALL"]
+            )
+            return self._parse_tool_response(response, url)
                 
         except Exception as e:
             return {"error": "mcp_call_failed", "detail": str(e), "url": url}
+    
+    def _tool_url(self, path: str) -> str:
+        """Araç yolundan tam URL oluşturur"""
+        return f"{self.base_url.rstrip('/')}/{path.lstrip('/')}"
+    
+    def _parse_tool_response(self, response: Any, url: str) -> Dict[str, Any]:
+        """MCP yanıtını çözer (requests veya httpx yanıtı)"""
+        if response.status_code == 200:
+            try:
+                return response.json()
+            except json.JSONDecodeError:
+                return {"error": "mcp_call_failed", "detail": "Invalid JSON response", "url": url}
+        else:
+            return {"error": "mcp_call_failed", "detail": f"HTTP {response.status_code}: {response.text}", "url": url}
 
 
 # Global servis manager instance
@@ -0,0 +1,128 @@
+"""
+EventBroadcaster yönlendirme testleri
+=====================================
+
+Workflow, fallback ve chat akışlarının yayınladığı gerçek agent-output
+zarflarının userId ile abone olan bir client'a (web-ui dashboard'u gibi)
+ulaştığını doğrular.
+
+Çalıştırma (langgraph-agents dizininde):
+    python -m unittest discover -s tests
+"""
+
+import unittest
+from queue import Queue
+from unittest import mock
+
+import api
+import workflow
+from api import APIHandler, EventBroadcaster
+from workflow import FinancialWorkflow
+
+
+USER_ID = "web_ui_user"
+CORRELATION_ID = "corr-test-1"
+
+
+class RecordingQueue:
+    """publisher_queue yerine geçen, put edilen öğeleri biriktiren kuyruk"""
+
+    def __init__(self):
+        self.items = []
+
+    def put(self, item):
+        self.items.append(item)
+
+
+def fake_call_tool(path, payload):
+    """MCP araçları için sabit yanıtlar"""
+    return {
+        "userProfile.get": {"savedPreferences": {"autoSavingsRate": 0.3}},
+        "risk.scoreTransaction": {"score": 0.2, "reason": "ok"},
+        "risk.performAnalysis": {"analysis": {"overallScore": 0.2}},
+        "market.quotes": {"quotes": [{"name": "bond", "rate": 0.4}]},
+    }.get(path, {"status": "ok"})
+
+
+class EventBroadcasterRoutingTest(unittest.TestCase):
+    """userId aboneliğinin agent-output event'lerini aldığını test eder"""
+
+    def setUp(self):
+        self.broadcaster = EventBroadcaster(Queue())
+        self.client, _ = self.broadcaster.create_client(user_id=USER_ID)
+        self.published = RecordingQueue()
+
+        services = mock.MagicMock()
+        services.mcp_service.call_tool.side_effect = fake_call_tool
+        services.qdrant_service.search_similar.return_value = []
+        services.huggingface_service.generate_response.return_value = {"text": "Analiz tamamlandı."}
+        for module in (api, workflow):
+            patcher = mock.patch.object(module, "service_manager", services)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(api, "workflow_results", mock.MagicMock())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _received_events(self) -> list:
+        """Biriken event'leri broadcaster'dan geçirip client'ın aldığı event adlarını döndürür"""
+        for item in self.published.items:
+            self.broadcaster._fan_out(item)
+        received = []
+        while True:
+            msg = self.client.get(timeout=0)
+            if msg is None:
+                return received
+            received.extend(
+                line.split(": ", 1)[1] for line in msg.splitlines() if line.startswith("event: ")
+            )
+
+    def _handler(self) -> APIHandler:
+        handler = APIHandler.__new__(APIHandler)
+        handler.publisher_queue = self.published
+        return handler
+
+    def test_workflow_agent_outputs_reach_user_client(self):
+        flow = FinancialWorkflow.__new__(FinancialWorkflow)
+        flow.publisher_queue = self.published
+        state = {
+            "userId": USER_ID, "correlationId": CORRELATION_ID, "amount": 25000,
+            "risk_output": {"risk_score": 0.2}
+        }
+        tool_results = [
+            ("userProfile.get", {}, fake_call_tool("userProfile.get", {})),
+            ("risk.scoreTransaction", {}, fake_call_tool("risk.scoreTransaction", {})),
+            ("market.quotes", {"assetType": "bond"}, fake_call_tool("market.quotes", {}))
+        ]
+        for agent in ("PaymentsAgent", "RiskAgent", "InvestmentAgent"):
+            flow._agent_output(agent, state, [], tool_results, True)
+
+        self.assertEqual(self._received_events(), ["agent-output"] * 3)
+
+    def test_fallback_agent_outputs_reach_user_client(self):
+        event = {"payload": {"userId": USER_ID, "amount": 25000}}
+        self._handler()._run_deposit_fallback(event, CORRELATION_ID)
+
+        self.assertEqual(self._received_events(), ["agent-output"] * 3 + ["notification"])
+
+    def test_chat_agent_outputs_reach_user_client(self):
+        handler = self._handler()
+        handler._execute_payments_agent("5000 yap", {"amount_modification": True}, CORRELATION_ID, USER_ID)
+        handler._execute_risk_agent("risk", {"risk_analysis": True}, CORRELATION_ID, USER_ID)
+        handler._execute_general_agent("soru", {}, CORRELATION_ID, USER_ID)
+
+        self.assertEqual(self._received_events(), ["agent-output"] * 3)
+
+    def test_other_users_events_are_not_delivered(self):
+        self.published.put({
+            "event": "agent-output",
+            "userId": "another_user",
+            "correlationId": "corr-other",
+            "data": {"type": "agent-output", "agent": "RiskAgent"}
+        })
+
+        self.assertEqual(self._received_events(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
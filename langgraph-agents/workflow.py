@@ -16,6 +16,7 @@ LangGraph Özellikleri:
 - MCP Tool Calling: Fallback sistem ile MCP araçları entegrasyonu
 
 Workflow Akışı:
+0. MCPPrefetch: Tahmin edilebilir MCP okumalarını paralel olarak önceden yapar
 1. PaymentsAgent: Maaş yatışını analiz eder ve transfer önerisi yapar
 2. RiskAgent: İşlem riskini değerlendirir
 3. InvestmentAgent: Risk profiline göre yatırım önerileri sunar
@@ -33,7 +34,11 @@ Son Güncellemeler (2025-09-16):
 
 import time
 import json
-from typing import TypedDict, Dict, Any, Optional, List, Literal
+import asyncio
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TypedDict, Dict, Any, Optional, List, Literal, Callable
 from queue import Queue
 from langchain_core.tools import tool
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
@@ -44,6 +49,10 @@ from langgraph.prebuilt import ToolNode, tools_condition
 
 from config import config
 from services import service_manager
+from http_client import http_client
+from workflow_results import workflow_results
+from workflow_idempotency import workflow_idempotency
+from workflow_singleflight import workflow_singleflight
 
 
 class FinancialState(TypedDict):
@@ -75,6 +84,9 @@ class FinancialState(TypedDict):
     user_action: Optional[str]  # "approve", "reject", "custom_message"
     custom_message: Optional[str]
     
+    # MCP prefetch sonuçları (_prefetch_key -> araç yanıtı)
+    prefetched: Optional[Dict[str, Any]]
+    
     # Workflow kontrolü
     current_step: str
     error: Optional[str]
@@ -101,6 +113,9 @@ class FinancialWorkflow:
     - MCP Tool Calling fallback sistemi
     """
     
+    # Node'lar senkron çalışır; async varyant: async_workflow.AsyncFinancialWorkflow
+    is_async = False
+    
     def __init__(self, publisher_queue: Queue):
         """
         LangGraph workflow'unu başlatır
@@ -111,6 +126,12 @@ class FinancialWorkflow:
         self.publisher_queue = publisher_queue
         self.workflow = None
         
+        # MCP prefetch node'u için paylaşılan thread havuzu
+        self._prefetch_executor = ThreadPoolExecutor(
+            max_workers=config.MCP_PREFETCH["MAX_WORKERS"],
+            thread_name_prefix="mcp-prefetch"
+        )
+        
         # LangGraph için gerekli araçları tanımla
         self.tools = self._create_tools()
         
@@ -138,20 +159,9 @@ class FinancialWorkflow:
         self.ollama_model = config.OLLAMA_MODELS["LLM_MODEL"]  # llama3.2:3b - ngrok ile host edilen
         self.ollama_base_url = config.OLLAMA_BASE_URL  # http://localhost:11434
         
-        # LangChain ChatOllama'yı deneyelim, başarısız olursa fallback kullanacağız
+        # LangChain ChatOllama'yı oluştur (ağ çağrısı yapmaz); test çağrısı
+        # başlangıcı bloklamamak için warm_up ile arka planda yapılır
         try:
-            # Ollama client'ını doğrudan test et
-            import ollama
-            
-            # Ollama client'ını test et
-            client = ollama.Client(host=self.ollama_base_url)
-            test_response = client.chat(
-                model=self.ollama_model,
-                messages=[{"role": "user", "content": "Test mesajı"}]
-            )
-            print(f"✅ Ollama client test başarılı: {test_response['message']['content'][:50]}...")
-            
-            # LangChain ChatOllama'yı oluştur
             self.llm = ChatOllama(
                 model=self.ollama_model,
                 base_url=self.ollama_base_url,
@@ -161,15 +171,14 @@ class FinancialWorkflow:
             )
             print("✅ ChatOllama başarıyla oluşturuldu")
             
-            # Test çağrısı yap
-            test_response = self.llm.invoke("Test mesajı")
-            print(f"✅ ChatOllama test başarılı: {test_response.content[:50]}...")
-            
         except Exception as e:
             print(f"⚠️ ChatOllama oluşturulamadı: {e}")
             print("🔄 Fallback modu aktif - Manuel HTTP istekleri kullanılacak")
             self.llm = None
         
+        # LLM warm-up durumu: pending, warming, ready, fallback
+        self.llm_status = "pending" if self.llm else "fallback"
+        
         print("🤖 LLM Konfigürasyonu:")
         print(f"   🔹 Güçlü LLM: Ollama llama3.2:3b (Agent'lar için) - ngrok ile host edilen")
         print(f"   🔹 Büyük LLM: Hugging Face deepseek-v3-0324 (CoordinatorAgent için)")
@@ -216,23 +225,26 @@ class FinancialWorkflow:
         # 1. AGENT NODE'LARI TANIMLA
         # ========================================
         
+        # MCP Prefetch node'u - Tahmin edilebilir MCP okumalarını paralel başlatır
+        workflow.add_node("mcp_prefetch", self._timed_node("mcp_prefetch", self._mcp_prefetch_node))
+        
         # PaymentsAgent node'u - Maaş analizi ve transfer önerisi
-        workflow.add_node("payments_agent", self._payments_agent_node)
+        workflow.add_node("payments_agent", self._timed_node("payments_agent", self._payments_agent_node))
         
         # RiskAgent node'u - Risk analizi
-        workflow.add_node("risk_agent", self._risk_agent_node)
+        workflow.add_node("risk_agent", self._timed_node("risk_agent", self._risk_agent_node))
         
         # InvestmentAgent node'u - Yatırım önerileri
-        workflow.add_node("investment_agent", self._investment_agent_node)
+        workflow.add_node("investment_agent", self._timed_node("investment_agent", self._investment_agent_node))
         
         # CoordinatorAgent node'u - Final mesaj oluşturma
-        workflow.add_node("coordinator_agent", self._coordinator_agent_node)
+        workflow.add_node("coordinator_agent", self._timed_node("coordinator_agent", self._coordinator_agent_node))
         
         # UserInteraction node'u - Kullanıcı etkileşimi
-        workflow.add_node("user_interaction", self._user_interaction_node)
+        workflow.add_node("user_interaction", self._timed_node("user_interaction", self._user_interaction_node))
         
         # Execution node'u - İşlem gerçekleştirme
-        workflow.add_node("execution", self._execution_node)
+        workflow.add_node("execution", self._timed_node("execution", self._execution_node))
         
         # Tool node'u - MCP araçlarını kullanma
         tool_node = ToolNode(self.tools)
@@ -242,8 +254,9 @@ class FinancialWorkflow:
         # 2. WORKFLOW AKIŞINI TANIMLA
         # ========================================
         
-        # Başlangıç noktası
-        workflow.add_edge(START, "payments_agent")
+        # Başlangıç noktası - önce MCP okumaları paralel olarak prefetch edilir
+        workflow.add_edge(START, "mcp_prefetch")
+        workflow.add_edge("mcp_prefetch", "payments_agent")
         
         # Sıralı agent akışı
         workflow.add_edge("payments_agent", "risk_agent")
@@ -275,10 +288,147 @@ class FinancialWorkflow:
         self.workflow = workflow.compile(checkpointer=memory)
         
         print("✅ LangGraph workflow başarıyla oluşturuldu")
-        print("📋 Node'lar: payments_agent → risk_agent → investment_agent → coordinator_agent → user_interaction → execution")
+        print("📋 Node'lar: mcp_prefetch → payments_agent → risk_agent → investment_agent → coordinator_agent → user_interaction → execution")
         print("🔧 Araçlar: MCP Finance Tools entegrasyonu aktif")
         print("🧠 Memory: Redis + Qdrant checkpointing aktif")
     
+    def _timed_node(self, name: str, node: Callable) -> Callable:
+        """
+        Node'u süresini workflow sonuç deposuna yazan bir sarmalayıcıyla döndürür
+        
+        Async varyantın coroutine node'ları için async sarmalayıcı döner;
+        LangGraph node tipini sarmalayıcının kendisinden belirler.
+        
+        Args:
+            name: Node adı
+            node: Node fonksiyonu
+            
+        Returns:
+            Callable: Süre ölçen node fonksiyonu
+        """
+        def record(state: FinancialState, result: Optional[FinancialState], started_at: float):
+            ok = bool(result) and result.get("current_step") != "error"
+            workflow_results.record_node(state.get("correlationId"), name,
+                                         (time.time() - started_at) * 1000, ok)
+        
+        if asyncio.iscoroutinefunction(node):
+            async def timed_async_node(state: FinancialState) -> FinancialState:
+                started_at = time.time()
+                result = None
+                try:
+                    result = await node(state)
+                    return result
+                finally:
+                    record(state, result, started_at)
+            return timed_async_node
+        
+        def timed_node(state: FinancialState) -> FinancialState:
+            started_at = time.time()
+            result = None
+            try:
+                result = node(state)
+                return result
+            finally:
+                record(state, result, started_at)
+        return timed_node
+    
+    def _mcp_prefetch_node(self, state: FinancialState) -> FinancialState:
+        """
+        MCP Prefetch Node - Tahmin edilebilir MCP okumalarını paralel yapar
+        
+        Deposit gelir gelmez agent'ların ihtiyaç duyacağı okumaları aynı anda
+        başlatır: userProfile.get, transactions.query, InvestmentAgent'ın
+        seçebileceği her varlık türü için market.quotes ve profil gelince
+        hesaplanan transfer tutarı için risk.scoreTransaction. Sonraki node'lar
+        _call_mcp_tool üzerinden önce bu sonuçlara bakar; böylece ardışık MCP
+        gecikmeleri tek bir paralel tura iner.
+        """
+        if not config.MCP_PREFETCH["ENABLED"]:
+            return {**state, "prefetched": {}}
+        
+        print("🔄 MCP Prefetch node çalışıyor...")
+        started_at = time.time()
+        
+        try:
+            userId = state["userId"]
+            reads = self._prefetch_reads(userId)
+            
+            profile_payload = {"userId": userId}
+            profile_future = self._prefetch_executor.submit(
+                self._call_mcp_tool, "userProfile.get", profile_payload
+            )
+            
+            def score_proposed_transfer():
+                # Risk skoru PaymentsAgent'ın önereceği tutara bağlı; profil gelir gelmez hesaplanır
+                payload = self._prefetch_risk_payload(state, profile_future.result())
+                return payload, self._call_mcp_tool("risk.scoreTransaction", payload)
+            
+            risk_future = self._prefetch_executor.submit(score_proposed_transfer)
+            read_futures = [
+                (path, payload, self._prefetch_executor.submit(self._call_mcp_tool, path, payload))
+                for path, payload in reads
+            ]
+            
+            prefetched = {self._prefetch_key("userProfile.get", profile_payload): profile_future.result()}
+            for path, payload, future in read_futures:
+                prefetched[self._prefetch_key(path, payload)] = future.result()
+            risk_payload, risk_result = risk_future.result()
+            prefetched[self._prefetch_key("risk.scoreTransaction", risk_payload)] = risk_result
+            
+            print(f"✅ MCP Prefetch node tamamlandı: {len(prefetched)} okuma, "
+                  f"{(time.time() - started_at) * 1000:.0f} ms")
+            return {
+                **state,
+                "prefetched": prefetched,
+                "current_step": "mcp_prefetch_completed"
+            }
+            
+        except Exception as e:
+            # Prefetch yalnızca hızlandırmadır; hata durumunda node'lar ağdan okur
+            print(f"⚠️ MCP Prefetch hatası, node'lar doğrudan MCP'ye gidecek: {e}")
+            return {**state, "prefetched": {}}
+    
+    def _prefetch_reads(self, userId: str) -> List[tuple]:
+        """
+        Birbirinden bağımsız prefetch okumalarını döndürür
+        
+        Args:
+            userId: Kullanıcı ID'si
+            
+        Returns:
+            List[tuple]: (MCP yolu, payload) listesi
+        """
+        prefetch_config = config.MCP_PREFETCH
+        reads = [
+            ("transactions.query", {
+                "userId": userId,
+                "since": prefetch_config["TRANSACTIONS_SINCE"],
+                "limit": prefetch_config["TRANSACTIONS_LIMIT"]
+            })
+        ]
+        reads.extend(
+            ("market.quotes", {"assetType": asset_type, "tenor": prefetch_config["TENOR"]})
+            for asset_type in prefetch_config["ASSET_TYPES"]
+        )
+        return reads
+    
+    def _prefetch_risk_payload(self, state: FinancialState, profile: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        PaymentsAgent'ın önereceği transfer için risk.scoreTransaction payload'ı
+        
+        Args:
+            state: Workflow state'i
+            profile: Prefetch edilen userProfile.get yanıtı
+            
+        Returns:
+            Dict[str, Any]: risk.scoreTransaction payload'ı
+        """
+        propose_amount = int(state["amount"] * self._auto_savings_rate(profile))
+        return {
+            "userId": state["userId"],
+            "tx": {"amount": propose_amount, "type": "internal_transfer"}
+        }
+    
     def _payments_agent_node(self, state: FinancialState) -> FinancialState:
         """
         PaymentsAgent Node - LangGraph node implementasyonu
@@ -294,19 +444,96 @@ class FinancialWorkflow:
         - Output: Güncellenmiş FinancialState
         - Side Effects: Kafka event publishing
         """
-        print("🔄 PaymentsAgent node çalışıyor...")
+        return self._agent_node("PaymentsAgent", state)
+    
+    def _risk_agent_node(self, state: FinancialState) -> FinancialState:
+        """
+        RiskAgent Node - LangGraph node implementasyonu
+        
+        Bu node risk analizi yapar ve LangGraph'in mesaj sistemi ile çalışır.
+        """
+        return self._agent_node("RiskAgent", state)
+    
+    def _investment_agent_node(self, state: FinancialState) -> FinancialState:
+        """InvestmentAgent Node - Risk bazlı yatırım önerileri"""
+        return self._agent_node("InvestmentAgent", state)
+    
+    def _agent_node(self, agent: str, state: FinancialState) -> FinancialState:
+        """
+        Tool-calling agent node'larının ortak akışı
+        
+        1. Agent'ın system/human mesajları oluşturulur
+        2. Ollama LLM'i (llama3.2:3b) MCP araçları bağlı olarak çağrılır
+        3. LLM'in tool çağrıları, yoksa agent'ın fallback çağrıları yapılır
+        4. Agent çıktısı oluşturulur, yayınlanır ve state güncellenir
+        
+        Async workflow aynı adımları yalnızca I/O katmanını değiştirerek kullanır.
+        
+        Args:
+            agent: Agent adı ("PaymentsAgent", "RiskAgent", "InvestmentAgent")
+            state: Workflow state'i
+            
+        Returns:
+            FinancialState: Güncellenmiş state
+        """
+        print(f"🔄 {agent} node çalışıyor...")
         
         try:
-            # State'ten verileri al
-            userId = state["userId"]
-            amount = state["amount"]
-            correlationId = state["correlationId"]
+            messages = self._agent_messages(agent, state)
             
-            # ========================================
-            # 1. KULLANICI PROFİLİNİ ANALİZ ET
-            # ========================================
+            # 🔥 ÖNEMLİ: Burada Ollama üzerinden llama3.2:3b modeli kullanılıyor!
+            # LangChain'in bind_tools() metodu ile MCP araçları LLM'e bağlanıyor
+            # (tool-bound runnable http_client'ta önbelleklenir, her çağrıda yeniden oluşturulmaz)
+            print(f"🤖 {agent}: Ollama llama3.2:3b modeli ile analiz başlatılıyor...")
+            
+            # ChatOllama varsa kullan, yoksa manuel HTTP isteği gönder
+            # (streaming açıksa kısmi token'lar agent-token event'i olarak yayınlanır)
+            on_token = self._token_publisher(agent, state)
+            response = self._run_agent_llm(messages, on_token)
+            self._log_agent_response(agent, response)
+            
+            if response.tool_calls:
+                # Tool çağrılarını gerçekleştir
+                tool_results = []
+                for i, tool_call in enumerate(response.tool_calls):
+                    self._log_tool_call(agent, i, tool_call)
+                    result = self._call_mcp_tool(tool_call["name"], tool_call["args"], state)
+                    tool_results.append(self._tool_result(agent, i, tool_call, result))
+                
+                # Tool sonuçlarını mesaj olarak ekle ve final yanıtı al
+                messages.append(self._tool_summary_message(tool_results))
+                print(f"🔄 {agent}: Final LLM yanıtı alınıyor...")
+                messages.append(self._invoke_chat_model(self.llm, messages, on_token))
+                print(f"✅ {agent}: Final LLM yanıtı alındı")
+            else:
+                # Fallback: Manuel olarak gerekli tool'ları çağır
+                print(f"🔄 {agent}: Fallback olarak manuel tool çağrıları yapılıyor...")
+                tool_results = [
+                    (path, payload, self._call_mcp_tool(path, payload, state))
+                    for path, payload in self._agent_fallback_calls(agent, state)
+                ]
+                print(f"📊 {agent}: Fallback tool çağrıları tamamlandı")
+            
+            return self._agent_output(agent, state, messages, tool_results, bool(response.tool_calls))
+            
+        except Exception as e:
+            return self._agent_error(agent, state, e)
+    
+    def _agent_messages(self, agent: str, state: FinancialState) -> list:
+        """
+        Agent'ın system ve human mesajlarını state'teki mesaj listesine ekler
+        
+        Args:
+            agent: Agent adı
+            state: Workflow state'i
             
-            # System mesajı ile agent'a görev ver
+        Returns:
+            list: LLM'e gönderilecek mesaj listesi
+        """
+        userId = state["userId"]
+        
+        if agent == "PaymentsAgent":
+            amount = state["amount"]
             system_message = SystemMessage(content=f"""
 Sen PaymentsAgent'sın. Görevin:
 1. Kullanıcı {userId} için {amount:,}₺ maaş yatışını analiz et
@@ -321,206 +548,18 @@ Kullanabileceğin araçlar:
 
 Türkçe yanıt ver ve detaylı analiz yap.
             """)
-            
-            # Human mesajı ile görevi başlat
             human_message = HumanMessage(content=f"""
 Kullanıcı {userId} için {amount:,}₺ maaş yatışı analizi yap.
 Önce kullanıcı profilini al, sonra geçmiş işlemlerini incele.
 Otomatik tasarruf oranını hesaplayarak transfer önerisi oluştur.
             """)
-            
-            # Mesajları state'e ekle
-            messages = state.get("messages", [])
-            messages.extend([system_message, human_message])
-            
-            # ========================================
-            # 2. LLM İLE ANALİZ YAP - OLLAMA LLaMA3.2:3B KULLANIMI
-            # ========================================
-            
-            # 🔥 ÖNEMLİ: Burada Ollama üzerinden llama3.2:3b modeli kullanılıyor!
-            # Bu güçlü LLM (3B parametre) agent'ların tool calling yapması için optimize edilmiş
-            # LangChain'in bind_tools() metodu ile MCP araçları LLM'e bağlanıyor
-            # LLM artık hangi araçları kullanabileceğini biliyor ve otomatik olarak çağırıyor
-            
-            print(f"🤖 PaymentsAgent: Ollama llama3.2:3b modeli ile analiz başlatılıyor...")
-            
-            # ChatOllama varsa kullan, yoksa manuel HTTP isteği gönder
-            if self.llm:
-                try:
-                    response = self.llm.bind_tools(self.tools).invoke(messages)
-                    print(f"✅ ChatOllama başarılı")
-                except Exception as e:
-                    print(f"⚠️ ChatOllama başarısız: {e}")
-                    print(f"🔄 Manuel HTTP isteği gönderiliyor...")
-                    response_content = self._call_ollama_manual(messages)
-                    # Mock response oluştur
-                    # AIMessage zaten import edilmiş
-                    response = AIMessage(content=response_content)
-            else:
-                print(f"🔄 Manuel HTTP isteği gönderiliyor...")
-                response_content = self._call_ollama_manual(messages)
-                # Mock response oluştur
-                # AIMessage zaten import edilmiş
-                response = AIMessage(content=response_content)
-            
-            # ========================================
-            # 3. MCP TOOL ÇAĞRILARI - LLM TOOL CALLING
-            # ========================================
-            
-            # 🔥 ÖNEMLİ: LLM'in tool çağrıları yapıp yapmadığını kontrol et
-            print(f"🔍 PaymentsAgent: LLM yanıtı alındı, tool çağrıları kontrol ediliyor...")
-            print(f"📋 LLM yanıtı: {response.content[:200]}...")
-            print(f"📋 Tool calls sayısı: {len(response.tool_calls) if response.tool_calls else 0}")
-            
-            profile = None
-            transactions = None
-            
-            if response.tool_calls:
-                print(f"🎯 PaymentsAgent: {len(response.tool_calls)} adet MCP tool çağrısı tespit edildi!")
-                
-                # Tool çağrılarını gerçekleştir
-                tool_results = []
-                for i, tool_call in enumerate(response.tool_calls):
-                    tool_name = tool_call["name"]
-                    tool_args = tool_call["args"]
-                    
-                    print(f"🔧 PaymentsAgent: Tool #{i+1} çağrılıyor: {tool_name}")
-                    print(f"📥 Tool args: {tool_args}")
-                    
-                    # MCP aracını çağır
-                    result = self._call_mcp_tool(tool_name, tool_args)
-                    tool_results.append(f"{tool_name}: {result}")
-                    
-                    print(f"✅ PaymentsAgent: Tool #{i+1} tamamlandı: {tool_name}")
-                    print(f"📤 Tool result: {str(result)[:200]}...")
-                    
-                    # Sonuçları sakla
-                    if tool_name == "userProfile_get":
-                        profile = result
-                    elif tool_name == "transactions_query":
-                        transactions = result
-                
-                # Tool sonuçlarını mesaj olarak ekle
-                tool_message = AIMessage(content=f"Tool çağrıları tamamlandı: {'; '.join(tool_results)}")
-                messages.append(tool_message)
-                
-                print(f"🔄 PaymentsAgent: Final LLM yanıtı alınıyor...")
-                # Final yanıtı al
-                final_response = self.llm.invoke(messages)
-                messages.append(final_response)
-                print(f"✅ PaymentsAgent: Final LLM yanıtı alındı")
-            else:
-                print(f"⚠️ PaymentsAgent: LLM hiç tool çağrısı yapmadı!")
-                print(f"🤔 LLM yanıtı: {response.content[:200]}...")
-                
-                # Fallback: Manuel olarak gerekli tool'ları çağır
-                print(f"🔄 PaymentsAgent: Fallback olarak manuel tool çağrıları yapılıyor...")
-                profile = self._call_mcp_tool("userProfile.get", {"userId": userId})
-                transactions = self._call_mcp_tool("transactions.query", {
-                    "userId": userId,
-                    "since": "last30d",
-                    "limit": 10
-                })
-                print(f"📊 PaymentsAgent: Fallback tool çağrıları tamamlandı")
-            
-            # ========================================
-            # 4. PAYMENTS OUTPUT OLUŞTUR
-            # ========================================
-            
-            # LLM tool çağrılarından veya fallback'ten gelen verileri kullan
-            if profile is None:
-                print(f"⚠️ PaymentsAgent: Profile bulunamadı, varsayılan değerler kullanılıyor")
-                profile = {"savedPreferences": {"autoSavingsRate": 0.3}}
-            
-            auto_rate = profile.get("savedPreferences", {}).get("autoSavingsRate", 0.3)
-            propose_amount = int(amount * auto_rate)
-            
-            print(f"💰 PaymentsAgent: Tasarruf oranı hesaplandı: {auto_rate} ({auto_rate*100}%)")
-            print(f"💰 PaymentsAgent: Transfer miktarı hesaplandı: {propose_amount:,}₺")
-            print(f"💰 PaymentsAgent: LLM tool calling {'başarılı' if response.tool_calls else 'başarısız - fallback kullanıldı'}")
-            
-            payments_output = {
-                "agent": "PaymentsAgent",
-                "action": "analyze_deposit",
-                "proposal": {
-                    "action": "propose_transfer",
-                    "amount": propose_amount,
-                    "from": "CHK001",
-                    "to": "SV001",
-                    "rate": auto_rate
-                },
-                "message": f"Maaşın {amount:,}₺ olarak hesabına geçti. Plan gereği {propose_amount:,}₺ tasarrufa aktarılabilir.",
-                "analysis": {
-                    "user_profile": profile,
-                    "auto_savings_rate": auto_rate,
-                    "proposed_amount": propose_amount
-                }
-            }
-            
-            # ========================================
-            # 4. EVENT PUBLISHING
-            # ========================================
-            
-            # Agent çıktısını Kafka'ya gönder
-            payments_output["type"] = "agent-output"
-            self.publisher_queue.put({"event": "agent-output", "data": payments_output})
-            
-            # Kafka'ya payments.pending event'i gönder
-            service_manager.kafka_service.publish_event(
-                config.KAFKA_TOPICS["PAYMENTS_PENDING"],
-                {
-                    "userId": userId,
-                    "proposal": payments_output["proposal"],
-                    "correlationId": correlationId
-                }
-            )
-            
-            # ========================================
-            # 5. STATE GÜNCELLE
-            # ========================================
-            
-            # State'i güncelle
-            updated_state = {
-                **state,
-                "messages": messages,
-                "payments_output": payments_output,
-                "current_step": "payments_agent_completed"
-            }
-            
-            print(f"✅ PaymentsAgent node tamamlandı: {propose_amount:,}₺ transfer önerisi")
-            return updated_state
-            
-        except Exception as e:
-            print(f"❌ PaymentsAgent node hatası: {e}")
-            return {
-                **state,
-                "error": f"PaymentsAgent hatası: {str(e)}",
-                "current_step": "error"
-            }
-    
-    def _risk_agent_node(self, state: FinancialState) -> FinancialState:
-        """
-        RiskAgent Node - LangGraph node implementasyonu
         
-        Bu node risk analizi yapar ve LangGraph'in mesaj sistemi ile çalışır.
-        """
-        print("🔄 RiskAgent node çalışıyor...")
-        
-        try:
-            userId = state["userId"]
-            correlationId = state["correlationId"]
+        elif agent == "RiskAgent":
             payments_output = state.get("payments_output", {})
-            
             if not payments_output:
                 raise ValueError("PaymentsAgent çıktısı bulunamadı")
-            
             proposal = payments_output.get("proposal", {})
             
-            # ========================================
-            # 1. RİSK ANALİZİ YAP
-            # ========================================
-            
-            # System mesajı ile agent'a görev ver
             system_message = SystemMessage(content=f"""
 Sen RiskAgent'sın. Görevin:
 1. Transfer işleminin risk skorunu hesapla
@@ -532,8 +571,6 @@ Kullanabileceğin araçlar:
 
 Türkçe yanıt ver ve risk analizini detaylandır.
             """)
-            
-            # Human mesajı ile görevi başlat
             human_message = HumanMessage(content=f"""
 Transfer işlemi için risk analizi yap:
 - Amount: {proposal.get('amount', 0):,}₺
@@ -542,183 +579,13 @@ Transfer işlemi için risk analizi yap:
 
 Risk skorunu hesapla ve analiz et.
             """)
-            
-            # Mesajları state'e ekle
-            messages = state.get("messages", [])
-            messages.extend([system_message, human_message])
-            
-            # ========================================
-            # 2. LLM İLE RİSK ANALİZİ - OLLAMA LLaMA3.2:3B KULLANIMI
-            # ========================================
-            
-            # 🔥 ÖNEMLİ: RiskAgent da Ollama llama3.2:3b modeli kullanıyor!
-            # Risk analizi için MCP araçlarını (risk.scoreTransaction) çağırması bekleniyor
-            
-            print(f"🤖 RiskAgent: Ollama llama3.2:3b modeli ile risk analizi başlatılıyor...")
-            
-            # ChatOllama varsa kullan, yoksa manuel HTTP isteği gönder
-            if self.llm:
-                try:
-                    response = self.llm.bind_tools(self.tools).invoke(messages)
-                    print(f"✅ ChatOllama başarılı")
-                except Exception as e:
-                    print(f"⚠️ ChatOllama başarısız: {e}")
-                    print(f"🔄 Manuel HTTP isteği gönderiliyor...")
-                    response_content = self._call_ollama_manual(messages)
-                    # Mock response oluştur
-                    # AIMessage zaten import edilmiş
-                    response = AIMessage(content=response_content)
-            else:
-                print(f"🔄 Manuel HTTP isteği gönderiliyor...")
-                response_content = self._call_ollama_manual(messages)
-                # Mock response oluştur
-                # AIMessage zaten import edilmiş
-                response = AIMessage(content=response_content)
-            
-            # ========================================
-            # 3. MCP TOOL ÇAĞRILARI - LLM TOOL CALLING
-            # ========================================
-            
-            # 🔥 ÖNEMLİ: LLM'in tool çağrıları yapıp yapmadığını kontrol et
-            print(f"🔍 RiskAgent: LLM yanıtı alındı, tool çağrıları kontrol ediliyor...")
-            print(f"📋 LLM yanıtı: {response.content[:200]}...")
-            print(f"📋 Tool calls sayısı: {len(response.tool_calls) if response.tool_calls else 0}")
-            
-            risk_result = None
-            
-            if response.tool_calls:
-                print(f"🎯 RiskAgent: {len(response.tool_calls)} adet MCP tool çağrısı tespit edildi!")
-                
-                # Tool çağrılarını gerçekleştir
-                tool_results = []
-                for i, tool_call in enumerate(response.tool_calls):
-                    tool_name = tool_call["name"]
-                    tool_args = tool_call["args"]
-                    
-                    print(f"🔧 RiskAgent: Tool #{i+1} çağrılıyor: {tool_name}")
-                    print(f"📥 Tool args: {tool_args}")
-                    
-                    # MCP aracını çağır
-                    result = self._call_mcp_tool(tool_name, tool_args)
-                    tool_results.append(f"{tool_name}: {result}")
-                    
-                    print(f"✅ RiskAgent: Tool #{i+1} tamamlandı: {tool_name}")
-                    print(f"📤 Tool result: {str(result)[:200]}...")
-                    
-                    # Sonuçları sakla
-                    if tool_name == "risk_scoreTransaction":
-                        risk_result = result
-                
-                # Tool sonuçlarını mesaj olarak ekle
-                tool_message = AIMessage(content=f"Tool çağrıları tamamlandı: {'; '.join(tool_results)}")
-                messages.append(tool_message)
-                
-                print(f"🔄 RiskAgent: Final LLM yanıtı alınıyor...")
-                # Final yanıtı al
-                final_response = self.llm.invoke(messages)
-                messages.append(final_response)
-                print(f"✅ RiskAgent: Final LLM yanıtı alındı")
-            else:
-                print(f"⚠️ RiskAgent: LLM hiç tool çağrısı yapmadı!")
-                print(f"🤔 LLM yanıtı: {response.content[:200]}...")
-                
-                # Fallback: Manuel olarak risk skorunu hesapla
-                print(f"🔄 RiskAgent: Fallback olarak manuel risk skoru hesaplanıyor...")
-                risk_result = self._call_mcp_tool("risk.scoreTransaction", {
-                    "userId": userId,
-                    "tx": {
-                        "amount": proposal.get("amount", 0),
-                        "type": "internal_transfer"
-                    }
-                })
-                print(f"📊 RiskAgent: Fallback risk skoru hesaplandı")
-            
-            # ========================================
-            # 4. RİSK OUTPUT OLUŞTUR
-            # ========================================
-            
-            # LLM tool çağrılarından veya fallback'ten gelen verileri kullan
-            if risk_result is None:
-                print(f"⚠️ RiskAgent: Risk result bulunamadı, varsayılan değerler kullanılıyor")
-                risk_result = {"score": 0.5, "reason": "default", "factors": ["unknown"]}
-            
-            risk_score = risk_result.get("score", 0.5)
-            
-            print(f"🛡️ RiskAgent: Risk skoru hesaplandı: {risk_score}")
-            print(f"🛡️ RiskAgent: Risk seviyesi: {'düşük' if risk_score < 0.3 else 'orta' if risk_score < 0.7 else 'yüksek'}")
-            print(f"🛡️ RiskAgent: LLM tool calling {'başarılı' if response.tool_calls else 'başarısız - fallback kullanıldı'}")
-            
-            risk_output = {
-                "agent": "RiskAgent",
-                "action": "analyze_risk",
-                "analysis": risk_result,
-                "message": f"İşlem güvenli, {'düşük' if risk_score < 0.5 else 'yüksek'} riskli.",
-                "risk_score": risk_score,
-                "risk_level": "low" if risk_score < 0.3 else "medium" if risk_score < 0.7 else "high"
-            }
-            
-            # ========================================
-            # 4. EVENT PUBLISHING
-            # ========================================
-            
-            # Agent çıktısını Kafka'ya gönder
-            risk_output["type"] = "agent-output"
-            self.publisher_queue.put({"event": "agent-output", "data": risk_output})
-            
-            # Kafka'ya risk.analysis event'i gönder
-            service_manager.kafka_service.publish_event(
-                config.KAFKA_TOPICS["RISK_ANALYSIS"],
-                {
-                    "userId": userId,
-                    "analysis": risk_result,
-                    "correlationId": correlationId
-                }
-            )
-            
-            # ========================================
-            # 5. STATE GÜNCELLE
-            # ========================================
-            
-            updated_state = {
-                **state,
-                "messages": messages,
-                "risk_output": risk_output,
-                "current_step": "risk_agent_completed"
-            }
-            
-            print(f"✅ RiskAgent node tamamlandı: Risk skoru {risk_score}")
-            return updated_state
-            
-        except Exception as e:
-            print(f"❌ RiskAgent node hatası: {e}")
-            return {
-                **state,
-                "error": f"RiskAgent hatası: {str(e)}",
-                "current_step": "error"
-            }
-    
-    def _investment_agent_node(self, state: FinancialState) -> FinancialState:
-        """InvestmentAgent Node - Risk bazlı yatırım önerileri"""
-        print("🔄 InvestmentAgent node çalışıyor...")
         
-        try:
-            userId = state["userId"]
-            correlationId = state["correlationId"]
+        else:  # InvestmentAgent
             risk_output = state.get("risk_output", {})
-            
             if not risk_output:
                 raise ValueError("RiskAgent çıktısı bulunamadı")
-            
             risk_score = risk_output.get("risk_score", 0.5)
             
-            # ========================================
-            # 1. LLM İLE YATIRIM ANALİZİ - OLLAMA LLaMA3.2:1B KULLANIMI
-            # ========================================
-            
-            # 🔥 ÖNEMLİ: InvestmentAgent da Ollama llama3.2:1b modeli kullanıyor!
-            # Yatırım analizi için MCP araçlarını (market.quotes) çağırması bekleniyor
-            
-            # System mesajı ile agent'a görev ver
             system_message = SystemMessage(content=f"""
 Sen InvestmentAgent'sın. Görevin:
 1. Risk skoru {risk_score} olan kullanıcı için yatırım önerileri oluştur
@@ -731,102 +598,185 @@ Kullanabileceğin araçlar:
 Risk skoru {risk_score} için uygun yatırım stratejisi belirle.
 Türkçe yanıt ver ve detaylı analiz yap.
             """)
+            human_message = HumanMessage(content=f"""
+Risk skoru {risk_score} olan kullanıcı için yatırım analizi yap.
+Risk durumuna göre uygun varlık türlerini belirle ve piyasa kotalarını sorgula.
+            """)
+        
+        # Mesajları state'e ekle
+        messages = state.get("messages", [])
+        messages.extend([system_message, human_message])
+        return messages
+    
+    def _agent_fallback_calls(self, agent: str, state: FinancialState) -> List[tuple]:
+        """
+        LLM tool çağrısı yapmadığında agent'ın yapacağı MCP çağrıları
+        
+        Args:
+            agent: Agent adı
+            state: Workflow state'i
+            
+        Returns:
+            List[tuple]: (MCP yolu, payload) listesi
+        """
+        userId = state["userId"]
+        
+        if agent == "PaymentsAgent":
+            return [
+                ("userProfile.get", {"userId": userId}),
+                ("transactions.query", {"userId": userId, "since": "last30d", "limit": 10})
+            ]
+        
+        if agent == "RiskAgent":
+            proposal = state["payments_output"].get("proposal", {})
+            return [("risk.scoreTransaction", {
+                "userId": userId,
+                "tx": {
+                    "amount": proposal.get("amount", 0),
+                    "type": "internal_transfer"
+                }
+            })]
+        
+        risk_score = state["risk_output"].get("risk_score", 0.5)
+        asset_types = ["bond", "equity", "fund"] if risk_score < 0.3 else ["bond", "savings"]
+        return [
+            ("market.quotes", {"assetType": asset_type, "tenor": "1Y"})
+            for asset_type in asset_types
+        ]
+    
+    def _log_agent_response(self, agent: str, response: AIMessage):
+        """LLM yanıtını ve tool çağrısı sayısını loglar"""
+        # 🔥 ÖNEMLİ: LLM'in tool çağrıları yapıp yapmadığını kontrol et
+        print(f"🔍 {agent}: LLM yanıtı alındı, tool çağrıları kontrol ediliyor...")
+        print(f"📋 LLM yanıtı: {response.content[:200]}...")
+        print(f"📋 Tool calls sayısı: {len(response.tool_calls) if response.tool_calls else 0}")
+        
+        if response.tool_calls:
+            print(f"🎯 {agent}: {len(response.tool_calls)} adet MCP tool çağrısı tespit edildi!")
+        else:
+            print(f"⚠️ {agent}: LLM hiç tool çağrısı yapmadı!")
+    
+    def _log_tool_call(self, agent: str, index: int, tool_call: Dict[str, Any]):
+        """LLM'in istediği tool çağrısını loglar"""
+        print(f"🔧 {agent}: Tool #{index+1} çağrılıyor: {tool_call['name']}")
+        print(f"📥 Tool args: {tool_call['args']}")
+    
+    def _tool_result(self, agent: str, index: int, tool_call: Dict[str, Any],
+                     result: Dict[str, Any]) -> tuple:
+        """
+        Tool sonucunu loglar ve (MCP yolu, args, sonuç) olarak döndürür
+        
+        LLM araç adları (örn: "userProfile_get") fallback çağrılarıyla aynı
+        MCP yoluna normalize edilir; böylece çıktı oluşturma tek yerden yapılır.
+        """
+        print(f"✅ {agent}: Tool #{index+1} tamamlandı: {tool_call['name']}")
+        print(f"📤 Tool result: {str(result)[:200]}...")
+        return MCP_TOOL_PATHS.get(tool_call["name"], tool_call["name"]), tool_call["args"], result
+    
+    def _tool_summary_message(self, tool_results: List[tuple]) -> AIMessage:
+        """Tool sonuçlarını final LLM çağrısı için mesaja çevirir"""
+        summary = "; ".join(f"{path}: {result}" for path, _, result in tool_results)
+        return AIMessage(content=f"Tool çağrıları tamamlandı: {summary}")
+    
+    def _agent_output(self, agent: str, state: FinancialState, messages: list,
+                      tool_results: List[tuple], tool_calling: bool) -> FinancialState:
+        """
+        Tool sonuçlarından agent çıktısını oluşturur, yayınlar ve state'i günceller
+        
+        Args:
+            agent: Agent adı
+            state: Workflow state'i
+            messages: Güncel mesaj listesi
+            tool_results: (MCP yolu, args, sonuç) listesi
+            tool_calling: LLM tool çağrısı yaptıysa True, fallback kullanıldıysa False
             
-            # Human mesajı ile görevi başlat
-            human_message = HumanMessage(content=f"""
-Risk skoru {risk_score} olan kullanıcı için yatırım analizi yap.
-Risk durumuna göre uygun varlık türlerini belirle ve piyasa kotalarını sorgula.
-            """)
+        Returns:
+            FinancialState: Güncellenmiş state
+        """
+        userId = state["userId"]
+        correlationId = state["correlationId"]
+        results = {path: result for path, _, result in tool_results}
+        tool_calling_status = 'başarılı' if tool_calling else 'başarısız - fallback kullanıldı'
+        
+        if agent == "PaymentsAgent":
+            amount = state["amount"]
             
-            # Mesajları state'e ekle
-            messages = state.get("messages", [])
-            messages.extend([system_message, human_message])
+            # LLM tool çağrılarından veya fallback'ten gelen verileri kullan
+            profile = results.get("userProfile.get")
+            if profile is None:
+                print(f"⚠️ PaymentsAgent: Profile bulunamadı, varsayılan değerler kullanılıyor")
+                profile = {"savedPreferences": {"autoSavingsRate": 0.3}}
             
-            print(f"🤖 InvestmentAgent: Ollama llama3.2:3b modeli ile yatırım analizi başlatılıyor...")
+            auto_rate = self._auto_savings_rate(profile)
+            propose_amount = int(amount * auto_rate)
             
-            # ChatOllama varsa kullan, yoksa manuel HTTP isteği gönder
-            if self.llm:
-                try:
-                    response = self.llm.bind_tools(self.tools).invoke(messages)
-                    print(f"✅ ChatOllama başarılı")
-                except Exception as e:
-                    print(f"⚠️ ChatOllama başarısız: {e}")
-                    print(f"🔄 Manuel HTTP isteği gönderiliyor...")
-                    response_content = self._call_ollama_manual(messages)
-                    # Mock response oluştur
-                    # AIMessage zaten import edilmiş
-                    response = AIMessage(content=response_content)
-            else:
-                print(f"🔄 Manuel HTTP isteği gönderiliyor...")
-                response_content = self._call_ollama_manual(messages)
-                # Mock response oluştur
-                # AIMessage zaten import edilmiş
-                response = AIMessage(content=response_content)
+            print(f"💰 PaymentsAgent: Tasarruf oranı hesaplandı: {auto_rate} ({auto_rate*100}%)")
+            print(f"💰 PaymentsAgent: Transfer miktarı hesaplandı: {propose_amount:,}₺")
+            print(f"💰 PaymentsAgent: LLM tool calling {tool_calling_status}")
             
-            # ========================================
-            # 2. MCP TOOL ÇAĞRILARI - DETAYLI LOGGING
-            # ========================================
+            output = {
+                "agent": "PaymentsAgent",
+                "action": "analyze_deposit",
+                "proposal": {
+                    "action": "propose_transfer",
+                    "amount": propose_amount,
+                    "from": "CHK001",
+                    "to": "SV001",
+                    "rate": auto_rate
+                },
+                "message": f"Maaşın {amount:,}₺ olarak hesabına geçti. Plan gereği {propose_amount:,}₺ tasarrufa aktarılabilir.",
+                "analysis": {
+                    "user_profile": profile,
+                    "auto_savings_rate": auto_rate,
+                    "proposed_amount": propose_amount
+                }
+            }
+            state_key = "payments_output"
+            topic = config.KAFKA_TOPICS["PAYMENTS_PENDING"]
+            kafka_payload = {"userId": userId, "proposal": output["proposal"], "correlationId": correlationId}
+            summary = f"{propose_amount:,}₺ transfer önerisi"
+        
+        elif agent == "RiskAgent":
+            risk_result = results.get("risk.scoreTransaction")
+            if risk_result is None:
+                print(f"⚠️ RiskAgent: Risk result bulunamadı, varsayılan değerler kullanılıyor")
+                risk_result = {"score": 0.5, "reason": "default", "factors": ["unknown"]}
             
-            print(f"🔍 InvestmentAgent: LLM yanıtı alındı, tool çağrıları kontrol ediliyor...")
-            print(f"📋 LLM yanıtı: {response.content[:200]}...")
-            print(f"📋 Tool calls sayısı: {len(response.tool_calls) if response.tool_calls else 0}")
+            risk_score = risk_result.get("score", 0.5)
             
-            quotes = {}
-            if response.tool_calls:
-                print(f"🎯 InvestmentAgent: {len(response.tool_calls)} adet MCP tool çağrısı tespit edildi!")
-                
-                # Tool çağrılarını gerçekleştir
-                tool_results = []
-                for i, tool_call in enumerate(response.tool_calls):
-                    tool_name = tool_call["name"]
-                    tool_args = tool_call["args"]
-                    
-                    print(f"🔧 InvestmentAgent: Tool #{i+1} çağrılıyor: {tool_name}")
-                    print(f"📥 Tool args: {tool_args}")
-                    
-                    # MCP aracını çağır
-                    result = self._call_mcp_tool(tool_name, tool_args)
-                    tool_results.append(f"{tool_name}: {result}")
-                    
-                    print(f"✅ InvestmentAgent: Tool #{i+1} tamamlandı: {tool_name}")
-                    print(f"📤 Tool result: {str(result)[:200]}...")
-                    
-                    # Market quotes sonuçlarını sakla
-                    if tool_name == "market_quotes":
-                        asset_type = tool_args.get("assetType", "unknown")
-                        quotes[asset_type] = result
-                
-                # Tool sonuçlarını mesaj olarak ekle
-                tool_message = AIMessage(content=f"Tool çağrıları tamamlandı: {'; '.join(tool_results)}")
-                messages.append(tool_message)
-                
-                print(f"🔄 InvestmentAgent: Final LLM yanıtı alınıyor...")
-                # Final yanıtı al
-                final_response = self.llm.invoke(messages)
-                messages.append(final_response)
-                print(f"✅ InvestmentAgent: Final LLM yanıtı alındı")
-            else:
-                print(f"⚠️ InvestmentAgent: LLM hiç tool çağrısı yapmadı!")
-                print(f"🤔 LLM yanıtı: {response.content[:200]}...")
-                
-                # Fallback: Manuel olarak market quotes al
-                print(f"🔄 InvestmentAgent: Fallback olarak manuel market quotes alınıyor...")
-                asset_types = ["bond", "equity", "fund"] if risk_score < 0.3 else ["bond", "savings"]
-                for asset_type in asset_types:
-                    quotes[asset_type] = self._call_mcp_tool("market.quotes", {
-                        "assetType": asset_type,
-                        "tenor": "1Y"
-                    })
-                    print(f"📊 InvestmentAgent: Manuel {asset_type} quotes alındı")
+            print(f"🛡️ RiskAgent: Risk skoru hesaplandı: {risk_score}")
+            print(f"🛡️ RiskAgent: Risk seviyesi: {'düşük' if risk_score < 0.3 else 'orta' if risk_score < 0.7 else 'yüksek'}")
+            print(f"🛡️ RiskAgent: LLM tool calling {tool_calling_status}")
             
-            # LLM tool çağrılarından veya fallback'ten gelen verileri kullan
+            output = {
+                "agent": "RiskAgent",
+                "action": "analyze_risk",
+                "analysis": risk_result,
+                "message": f"İşlem güvenli, {'düşük' if risk_score < 0.5 else 'yüksek'} riskli.",
+                "risk_score": risk_score,
+                "risk_level": "low" if risk_score < 0.3 else "medium" if risk_score < 0.7 else "high"
+            }
+            state_key = "risk_output"
+            topic = config.KAFKA_TOPICS["RISK_ANALYSIS"]
+            kafka_payload = {"userId": userId, "analysis": risk_result, "correlationId": correlationId}
+            summary = f"Risk skoru {risk_score}"
+        
+        else:  # InvestmentAgent
+            risk_score = state["risk_output"].get("risk_score", 0.5)
+            
+            # Market quotes sonuçlarını varlık türüne göre sakla
+            quotes = {
+                args.get("assetType", "unknown"): result
+                for path, args, result in tool_results
+                if path == "market.quotes"
+            }
             asset_types = list(quotes.keys()) if quotes else ["bond", "equity", "fund"]
             
             print(f"📈 InvestmentAgent: {len(asset_types)} yatırım türü analiz edildi")
             print(f"📈 InvestmentAgent: Yatırım stratejisi: {'agresif' if risk_score < 0.3 else 'muhafazakar'}")
-            print(f"📈 InvestmentAgent: LLM tool calling {'başarılı' if response.tool_calls else 'başarısız - fallback kullanıldı'}")
+            print(f"📈 InvestmentAgent: LLM tool calling {tool_calling_status}")
             
-            investment_output = {
+            output = {
                 "agent": "InvestmentAgent",
                 "action": "analyze_investment",
                 "recommendation": quotes,
@@ -834,34 +784,38 @@ Risk durumuna göre uygun varlık türlerini belirle ve piyasa kotalarını sorg
                 "strategy": "aggressive" if risk_score < 0.3 else "conservative",
                 "asset_types": asset_types
             }
-        
-            # Event publishing
-            investment_output["type"] = "agent-output"
-            self.publisher_queue.put({"event": "agent-output", "data": investment_output})
-            
-            service_manager.kafka_service.publish_event(
-                config.KAFKA_TOPICS["INVESTMENTS_PROPOSAL"],
-                {
-                    "userId": userId,
-                    "recommendation": quotes,
-                    "correlationId": correlationId
-                }
-            )
-            
-            print(f"✅ InvestmentAgent node tamamlandı: {len(asset_types)} yatırım önerisi")
-            return {
-                **state,
-                "investment_output": investment_output,
-                "current_step": "investment_agent_completed"
-            }
-            
-        except Exception as e:
-            print(f"❌ InvestmentAgent node hatası: {e}")
-            return {
-                **state,
-                "error": f"InvestmentAgent hatası: {str(e)}",
-                "current_step": "error"
-            }
+            state_key = "investment_output"
+            topic = config.KAFKA_TOPICS["INVESTMENTS_PROPOSAL"]
+            kafka_payload = {"userId": userId, "recommendation": quotes, "correlationId": correlationId}
+            summary = f"{len(asset_types)} yatırım önerisi"
+        
+        # Agent çıktısını SSE'ye ve Kafka'ya gönder (async modda fire-and-forget);
+        # zarftaki userId/correlationId EventBroadcaster'ın abonelere yönlendirmesi içindir
+        output["type"] = "agent-output"
+        self.publisher_queue.put({
+            "event": "agent-output",
+            "userId": userId,
+            "correlationId": correlationId,
+            "data": output
+        })
+        service_manager.kafka_service.publish_event(topic, kafka_payload)
+        
+        print(f"✅ {agent} node tamamlandı: {summary}")
+        return {
+            **state,
+            "messages": messages,
+            state_key: output,
+            "current_step": f"{state_key.replace('_output', '')}_agent_completed"
+        }
+    
+    def _agent_error(self, agent: str, state: FinancialState, error: Exception) -> FinancialState:
+        """Agent node hatasını loglar ve hata state'i döndürür"""
+        print(f"❌ {agent} node hatası: {error}")
+        return {
+            **state,
+            "error": f"{agent} hatası: {str(error)}",
+            "current_step": "error"
+        }
     
     def _coordinator_agent_node(self, state: FinancialState) -> FinancialState:
         """CoordinatorAgent Node - Final mesaj oluşturma ve memory entegrasyonu"""
@@ -893,33 +847,13 @@ Risk durumuna göre uygun varlık türlerini belirle ve piyasa kotalarını sorg
             system_prompt = self._get_coordinator_system_prompt()
             
             # Büyük LLM ile final mesaj oluştur
-            llm_response = service_manager.huggingface_service.generate_response(system_prompt, prompt)
+            llm_response = service_manager.huggingface_service.generate_response(
+                system_prompt, prompt, on_token=self._token_publisher("CoordinatorAgent", state)
+            )
             final_message = llm_response.get("text", "Analiz tamamlandı.")
-        
-            coordinator_output = {
-                "agent": "CoordinatorAgent",
-                "action": "create_final_message",
-                "message": final_message,
-                "memory_used": {
-                    "short_term": short_term_memory,
-                    "long_term": long_term_memory
-                }
-            }
-            
-            # Event publishing
-            notification = {
-                "type": "final_proposal",
-                "userId": userId,
-                "correlationId": correlationId,
-                "message": final_message,
-                "proposal": state.get("payments_output", {}).get("proposal", {})
-            }
-            
-            self.publisher_queue.put({"event": "notification", "data": notification})
             
-            service_manager.kafka_service.publish_event(
-                config.KAFKA_TOPICS["ADVISOR_FINAL_MESSAGE"],
-                notification
+            coordinator_output = self._publish_coordinator_output(
+                state, short_term_memory, long_term_memory, final_message
             )
         
             # Hafızaları güncelle
@@ -940,6 +874,47 @@ Risk durumuna göre uygun varlık türlerini belirle ve piyasa kotalarını sorg
                 "current_step": "error"
             }
     
+    def _publish_coordinator_output(self, state: FinancialState, short_term_memory: str,
+                                    long_term_memory: str, final_message: str) -> Dict[str, Any]:
+        """
+        Coordinator çıktısını oluşturur ve final_proposal bildirimini yayınlar
+        
+        Args:
+            state: Workflow state'i
+            short_term_memory: Kısa vadeli hafıza
+            long_term_memory: Uzun vadeli hafıza
+            final_message: Büyük LLM'in ürettiği final mesaj
+            
+        Returns:
+            Dict[str, Any]: coordinator_output
+        """
+        coordinator_output = {
+            "agent": "CoordinatorAgent",
+            "action": "create_final_message",
+            "message": final_message,
+            "memory_used": {
+                "short_term": short_term_memory,
+                "long_term": long_term_memory
+            }
+        }
+        
+        # Event publishing
+        notification = {
+            "type": "final_proposal",
+            "userId": state["userId"],
+            "correlationId": state["correlationId"],
+            "message": final_message,
+            "proposal": state.get("payments_output", {}).get("proposal", {})
+        }
+        
+        self.publisher_queue.put({"event": "notification", "data": notification})
+        
+        service_manager.kafka_service.publish_event(
+            config.KAFKA_TOPICS["ADVISOR_FINAL_MESSAGE"],
+            notification
+        )
+        return coordinator_output
+    
     def _user_interaction_node(self, state: FinancialState) -> FinancialState:
         """UserInteraction Node - Kullanıcı etkileşimi simülasyonu"""
         print("🔄 UserInteraction node çalışıyor...")
@@ -990,7 +965,12 @@ Risk durumuna göre uygun varlık türlerini belirle ve piyasa kotalarını sorg
                     }
                 }
                 
-                self.publisher_queue.put({"event": "payments.executed", "data": execution_event})
+                self.publisher_queue.put({
+                    "event": "payments.executed",
+                    "userId": userId,
+                    "correlationId": correlationId,
+                    "data": execution_event
+                })
                 
                 service_manager.kafka_service.publish_event(
                     config.KAFKA_TOPICS["PAYMENTS_EXECUTED"],
@@ -1044,6 +1024,26 @@ Risk durumuna göre uygun varlık türlerini belirle ve piyasa kotalarını sorg
             return "end"
     
     def execute(self, initial_state: FinancialState) -> Optional[FinancialState]:
+        """
+        LangGraph workflow'unu correlationId başına en fazla bir kez çalıştırır
+        
+        Kafka yeniden teslimi, istemci tekrarları veya fallback yolu aynı
+        correlationId'yi tekrar gönderirse LLM pipeline'ı yeniden çalışmaz;
+        saklı sonuç veya devam eden çalıştırmanın sonucu döner. Aynı
+        (userId, amount) farklı correlationId ile eşzamanlı gelirse de
+        follower leader çalıştırmasına bağlanır (single-flight).
+        
+        Args:
+            initial_state: Başlangıç state'i (LangGraph formatında)
+            
+        Returns:
+            FinancialState: Workflow sonucu
+        """
+        return workflow_idempotency.run(initial_state, lambda: workflow_singleflight.run(
+            initial_state, lambda: self._invoke(initial_state), self.publisher_queue
+        ))
+    
+    def _invoke(self, initial_state: FinancialState) -> Optional[FinancialState]:
         """
         LangGraph workflow'unu çalıştırır
         
@@ -1064,26 +1064,13 @@ Risk durumuna göre uygun varlık türlerini belirle ve piyasa kotalarını sorg
         
         try:
             print(f"🚀 LangGraph workflow başlatılıyor: {initial_state['correlationId']}")
+            workflow_results.mark_running(initial_state["correlationId"], initial_state["userId"], initial_state["amount"])
             
             # LangGraph'in gerçek invoke metodunu kullan
             config_dict = {"configurable": {"thread_id": initial_state["correlationId"]}}
             
             # Initial state'i LangGraph formatına çevir
-            langgraph_state = {
-                "messages": initial_state.get("messages", []),
-                "userId": initial_state["userId"],
-                "amount": initial_state["amount"],
-                "correlationId": initial_state["correlationId"],
-                "payments_output": initial_state.get("payments_output"),
-                "risk_output": initial_state.get("risk_output"),
-                "investment_output": initial_state.get("investment_output"),
-                "coordinator_output": initial_state.get("coordinator_output"),
-                "user_action": initial_state.get("user_action"),
-                "custom_message": initial_state.get("custom_message"),
-                "current_step": initial_state.get("current_step", "start"),
-                "error": initial_state.get("error"),
-                "final_result": initial_state.get("final_result")
-            }
+            langgraph_state = self._to_langgraph_state(initial_state)
             
             # Workflow'u çalıştır
             result = self.workflow.invoke(langgraph_state, config=config_dict)
@@ -1091,17 +1078,158 @@ Risk durumuna göre uygun varlık türlerini belirle ve piyasa kotalarını sorg
             print(f"✅ LangGraph workflow tamamlandı: {initial_state['userId']}")
             print(f"📊 Final step: {result.get('current_step', 'unknown')}")
             
+            workflow_results.mark_finished(initial_state["correlationId"], result)
             return result
             
         except Exception as e:
             print(f"❌ LangGraph workflow çalıştırma hatası: {e}")
-            return {
+            result = {
                 **initial_state,
                 "error": f"Workflow hatası: {str(e)}",
                 "current_step": "error"
             }
+            workflow_results.mark_finished(initial_state["correlationId"], result)
+            return result
+    
+    def _to_langgraph_state(self, initial_state: FinancialState) -> FinancialState:
+        """
+        Başlangıç state'ini eksik alanları doldurarak LangGraph formatına çevirir
+        
+        Args:
+            initial_state: Başlangıç state'i
+            
+        Returns:
+            FinancialState: LangGraph'e verilecek state
+        """
+        return {
+            "messages": initial_state.get("messages", []),
+            "userId": initial_state["userId"],
+            "amount": initial_state["amount"],
+            "correlationId": initial_state["correlationId"],
+            "payments_output": initial_state.get("payments_output"),
+            "risk_output": initial_state.get("risk_output"),
+            "investment_output": initial_state.get("investment_output"),
+            "coordinator_output": initial_state.get("coordinator_output"),
+            "user_action": initial_state.get("user_action"),
+            "custom_message": initial_state.get("custom_message"),
+            "prefetched": initial_state.get("prefetched"),
+            "current_step": initial_state.get("current_step", "start"),
+            "error": initial_state.get("error"),
+            "final_result": initial_state.get("final_result")
+        }
+    
+    def _token_publisher(self, agent: str, state: FinancialState) -> Optional[Callable[[str], None]]:
+        """
+        Agent için kısmi token yayınlayıcı callback oluşturur
+        
+        Her token publisher_queue üzerinden "agent-token" event'i olarak
+        correlationId ve agent adı ile yayınlanır. Final agent-output ve
+        notification event'leri değişmeden ayrıca gönderilir.
+        
+        reset=True ile çağrılırsa index sıfırlanır ve "reset": true işaretli
+        event yayınlanır; UI agent'ın o ana kadarki token'larını siler (yanıt
+        baştan yeniden stream edilirken metin iki kez görünmesin diye).
+        
+        Args:
+            agent: Agent adı (örn: "PaymentsAgent")
+            state: Workflow state'i
+            
+        Returns:
+            Callable: Token callback'i, streaming kapalıysa None
+        """
+        if not config.LLM_STREAMING["ENABLED"]:
+            return None
+        
+        event_name = config.LLM_STREAMING["TOKEN_EVENT"]
+        user_id = state.get("userId")
+        correlation_id = state.get("correlationId")
+        index = itertools.count()
+        
+        def publish(token: str, reset: bool = False):
+            nonlocal index
+            if reset:
+                index = itertools.count()
+            data = {
+                "type": event_name,
+                "agent": agent,
+                "userId": user_id,
+                "correlationId": correlation_id,
+                "index": next(index),
+                "token": token
+            }
+            if reset:
+                data["reset"] = True
+            self.publisher_queue.put({"event": event_name, "data": data})
+        
+        return publish
+    
+    def _run_agent_llm(self, messages: list, on_token: Optional[Callable[[str], None]] = None) -> AIMessage:
+        """
+        Agent'ın tool-bound LLM çağrısını yapar
+        
+        ChatOllama varsa http_client'ta önbelleklenen tool-bound runnable
+        kullanılır; ChatOllama yoksa ya da çağrı başarısız olursa manuel
+        HTTP isteğine düşülür. Stream yarıda kaldıysa fallback yanıtı baştan
+        stream etmeden önce reset token'ı yayınlanır.
+        
+        Args:
+            messages: LangChain mesaj listesi
+            on_token: Kısmi token callback'i (opsiyonel)
+            
+        Returns:
+            AIMessage: LLM yanıtı (tool_calls dahil)
+        """
+        if self.llm:
+            streamed = []
+            
+            def track(token: str):
+                streamed.append(True)
+                on_token(token)
+            
+            try:
+                response = self._invoke_chat_model(
+                    http_client.bind_tools(self.llm, self.tools), messages,
+                    track if on_token is not None else None
+                )
+                print(f"✅ ChatOllama başarılı")
+                return response
+            except Exception as e:
+                print(f"⚠️ ChatOllama başarısız: {e}")
+                if streamed:
+                    on_token("", reset=True)
+        
+        print(f"🔄 Manuel HTTP isteği gönderiliyor...")
+        response_content = self._call_ollama_manual(messages, on_token)
+        return AIMessage(content=response_content)
+    
+    def _invoke_chat_model(self, runnable: Any, messages: list,
+                           on_token: Optional[Callable[[str], None]] = None) -> AIMessage:
+        """
+        Chat modelini çağırır, on_token verilirse stream ederek çağırır
+        
+        Stream edilen chunk'lar birleştirilir; böylece tool_calls dahil
+        dönüş değeri invoke() ile aynı şekilde kullanılabilir.
+        
+        Args:
+            runnable: ChatOllama veya tool-bound runnable
+            messages: LangChain mesaj listesi
+            on_token: Kısmi token callback'i (opsiyonel)
+            
+        Returns:
+            AIMessage: LLM yanıtı
+        """
+        if on_token is None:
+            return runnable.invoke(messages)
+        
+        response = None
+        for chunk in runnable.stream(messages):
+            if isinstance(chunk.content, str) and chunk.content:
+                on_token(chunk.content)
+            response = chunk if response is None else response + chunk
+        
+        return response if response is not None else AIMessage(content="")
     
-    def _call_ollama_manual(self, messages: list) -> str:
+    def _call_ollama_manual(self, messages: list, on_token: Optional[Callable[[str], None]] = None) -> str:
         """
         Ollama'ya manuel HTTP isteği gönder (ChatOllama başarısız olduğunda fallback)
         
@@ -1117,6 +1245,8 @@ Risk durumuna göre uygun varlık türlerini belirle ve piyasa kotalarını sorg
         
         Args:
             messages: LangChain mesaj listesi (SystemMessage, HumanMessage, AIMessage)
+            on_token: Verilirse istek "stream": true ile gönderilir ve her kısmi
+                token bu callback'e iletilir (opsiyonel)
             
         Returns:
             str: Ollama'dan gelen yanıt metni
@@ -1129,59 +1259,98 @@ Risk durumuna göre uygun varlık türlerini belirle ve piyasa kotalarını sorg
         - MCP tool calling performansı artırıldı
         """
         try:
-            import requests
-            
-            # LangChain mesajlarını Ollama formatına çevir
-            ollama_messages = []
-            for msg in messages:
-                if hasattr(msg, 'content'):
-                    if msg.__class__.__name__ == 'SystemMessage':
-                        ollama_messages.append({"role": "system", "content": msg.content})
-                    elif msg.__class__.__name__ == 'HumanMessage':
-                        ollama_messages.append({"role": "user", "content": msg.content})
-                    elif msg.__class__.__name__ == 'AIMessage':
-                        ollama_messages.append({"role": "assistant", "content": msg.content})
-            
-            # Ollama API'sine istek gönder
-            response = requests.post(
+            # Ollama API'sine istek gönder (paylaşılan keep-alive havuzu)
+            streaming = on_token is not None
+            response = http_client.post(
                 f"{self.ollama_base_url}/api/chat",
-                json={
-                    "model": self.ollama_model,
-                    "messages": ollama_messages,
-                    "stream": False,
-                    "options": {
-                        "temperature": 0.1,
-                        "num_ctx": 2048
-                    }
-                },
-                timeout=120  # Timeout'u 2 dakikaya çıkar
+                json=self._ollama_chat_payload(messages, streaming),
+                timeout=120,  # Timeout'u 2 dakikaya çıkar
+                stream=streaming
             )
             
-            if response.status_code == 200:
-                result = response.json()
-                return result.get("message", {}).get("content", "")
-            else:
+            if response.status_code != 200:
                 print(f"❌ Ollama API hatası: {response.status_code} - {response.text}")
                 return "Ollama API hatası"
+            
+            if not streaming:
+                result = response.json()
+                return result.get("message", {}).get("content", "")
+            
+            # Streaming modunda Ollama satır başına bir JSON chunk döndürür
+            parts = []
+            try:
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    token = chunk.get("message", {}).get("content", "")
+                    if token:
+                        parts.append(token)
+                        on_token(token)
+                    if chunk.get("done"):
+                        break
+            finally:
+                response.close()
+            return "".join(parts)
                 
         except Exception as e:
             print(f"❌ Manuel Ollama çağrısı hatası: {e}")
             return "Manuel Ollama çağrısı başarısız"
     
-    def _call_mcp_tool(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    def _ollama_chat_payload(self, messages: list, streaming: bool) -> Dict[str, Any]:
+        """
+        LangChain mesajlarını Ollama /api/chat payload'ına çevirir
+        
+        Args:
+            messages: LangChain mesaj listesi
+            streaming: "stream": true ile istenecekse True
+            
+        Returns:
+            Dict[str, Any]: /api/chat istek gövdesi
+        """
+        ollama_messages = []
+        for msg in messages:
+            if hasattr(msg, 'content'):
+                if msg.__class__.__name__ == 'SystemMessage':
+                    ollama_messages.append({"role": "system", "content": msg.content})
+                elif msg.__class__.__name__ == 'HumanMessage':
+                    ollama_messages.append({"role": "user", "content": msg.content})
+                elif msg.__class__.__name__ in ('AIMessage', 'AIMessageChunk'):
+                    ollama_messages.append({"role": "assistant", "content": msg.content})
+        
+        return {
+            "model": self.ollama_model,
+            "messages": ollama_messages,
+            "stream": streaming,
+            "options": {
+                "temperature": 0.1,
+                "num_ctx": 2048
+            }
+        }
+    
+    def _call_mcp_tool(self, path: str, payload: Dict[str, Any],
+                       state: Optional[FinancialState] = None) -> Dict[str, Any]:
         """
         MCP aracını çağırır - DETAYLI LOGGING İLE
         
         🔥 ÖNEMLİ: Bu metod LangGraph agent'larının MCP Finance Tools ile iletişim kurmasını sağlar
         Her tool çağrısı detaylı olarak loglanır ve sonuçları takip edilir
         
+        State verilirse önce mcp_prefetch node'unun sonuçlarına bakılır; aynı
+        araç ve payload için başarılı bir prefetch sonucu varsa ağa gidilmez.
+        
         Args:
             path: Araç yolu (örn: "userProfile.get", "market.quotes")
             payload: Gönderilecek veri
+            state: Workflow state'i (prefetch sonuçları için, opsiyonel)
             
         Returns:
             Dict[str, Any]: Araç yanıtı
         """
+        prefetched = self._prefetched_result(path, payload, state)
+        if prefetched is not None:
+            return prefetched
+        
         print(f"🌐 MCP Tool Çağrısı: {path}")
         print(f"📥 Payload: {payload}")
         
@@ -1194,9 +1363,60 @@ Risk durumuna göre uygun varlık türlerini belirle ve piyasa kotalarını sorg
             print(f"❌ MCP Tool Hatası: {path} - {e}")
             return {"error": str(e), "path": path}
     
+    def _prefetched_result(self, path: str, payload: Dict[str, Any],
+                           state: Optional[FinancialState]) -> Optional[Dict[str, Any]]:
+        """
+        Aynı araç ve payload için başarılı prefetch sonucunu döndürür
+        
+        Args:
+            path: Araç adı veya yolu
+            payload: Araç parametreleri
+            state: Workflow state'i (opsiyonel)
+            
+        Returns:
+            Dict[str, Any]: Prefetch sonucu, yoksa None
+        """
+        if not state:
+            return None
+        prefetched = (state.get("prefetched") or {}).get(self._prefetch_key(path, payload))
+        if isinstance(prefetched, dict) and "error" not in prefetched:
+            print(f"⚡ MCP Prefetch hit: {path}")
+            return prefetched
+        return None
+    
+    def _prefetch_key(self, path: str, payload: Dict[str, Any]) -> str:
+        """
+        Prefetch sonuçları için araç + payload anahtarı üretir
+        
+        LLM tool çağrıları araç adını (örn: "userProfile_get"), fallback
+        çağrıları MCP yolunu (örn: "userProfile.get") kullanır; ikisi de
+        aynı anahtara normalize edilir.
+        
+        Args:
+            path: Araç adı veya yolu
+            payload: Araç parametreleri
+            
+        Returns:
+            str: Prefetch anahtarı
+        """
+        normalized_path = MCP_TOOL_PATHS.get(path, path)
+        return f"{normalized_path}:{json.dumps(payload, sort_keys=True, default=str)}"
+    
+    def _auto_savings_rate(self, profile: Optional[Dict[str, Any]]) -> float:
+        """
+        Kullanıcı profilinden otomatik tasarruf oranını okur
+        
+        Args:
+            profile: userProfile.get yanıtı
+            
+        Returns:
+            float: Tasarruf oranı (varsayılan 0.3)
+        """
+        return (profile or {}).get("savedPreferences", {}).get("autoSavingsRate", 0.3)
+    
     def _get_short_term_memory(self, userId: str) -> str:
         """
-        Redis'ten kısa vadeli hafızayı alır
+        Redis'ten kısa vadeli hafızayı alır (son eylem + son etkinlikler, tek round-trip)
         
         Args:
             userId: Kullanıcı ID'si
@@ -1204,10 +1424,29 @@ Risk durumuna göre uygun varlık türlerini belirle ve piyasa kotalarını sorg
         Returns:
             str: Kısa vadeli hafıza bilgisi
         """
-        last_action = service_manager.redis_service.get_user_action(userId)
-        if last_action:
-            return f"Son kullanıcı eylemi: {last_action}"
-        return ""
+        snapshot = service_manager.redis_service.get_user_snapshot(userId)
+        return self._format_short_term_memory(snapshot)
+    
+    def _format_short_term_memory(self, snapshot: Dict[str, Any]) -> str:
+        """
+        Redis snapshot'ını prompt'a eklenecek metne çevirir
+        
+        Args:
+            snapshot: get_user_snapshot sonucu (son eylem ve son etkinlikler)
+            
+        Returns:
+            str: Kısa vadeli hafıza bilgisi
+        """
+        lines = []
+        if snapshot.get("last_action"):
+            lines.append(f"Son kullanıcı eylemi: {snapshot['last_action']}")
+        if snapshot.get("events"):
+            lines.append("Son etkinlikler:")
+            lines.extend(
+                f"- {event.get('type', 'event')} {event.get('amount', '')}₺: {str(event.get('message', ''))[:100]}"
+                for event in snapshot["events"]
+            )
+        return "\n".join(lines)
     
     def _get_long_term_memory(self, userId: str, query: str) -> str:
         """
@@ -1224,18 +1463,29 @@ Risk durumuna göre uygun varlık türlerini belirle ve piyasa kotalarını sorg
             similar_memories = service_manager.qdrant_service.search_similar(
                 userId, query, top_k=3
             )
-            
-            if similar_memories:
-                memory_texts = [
-                    f"- {mem['payload'].get('content', '')[:100]}..." 
-                    for mem in similar_memories
-                ]
-                return f"Geçmiş benzer analizler:\n" + "\n".join(memory_texts)
-            return ""
+            return self._format_long_term_memory(similar_memories)
         except Exception as e:
             print(f"⚠️ Uzun vadeli hafıza hatası: {e}")
             return ""
     
+    def _format_long_term_memory(self, similar_memories: List[Dict[str, Any]]) -> str:
+        """
+        Qdrant arama sonuçlarını prompt'a eklenecek metne çevirir
+        
+        Args:
+            similar_memories: search_similar sonuçları
+            
+        Returns:
+            str: Uzun vadeli hafıza bilgisi
+        """
+        if similar_memories:
+            memory_texts = [
+                f"- {mem['payload'].get('content', '')[:100]}..." 
+                for mem in similar_memories
+            ]
+            return f"Geçmiş benzer analizler:\n" + "\n".join(memory_texts)
+        return ""
+    
     def _build_coordinator_prompt(self, userId: str, amount: int, state: FinancialState, 
                                 short_term_memory: str, long_term_memory: str) -> str:
         """
@@ -1332,6 +1582,30 @@ Türkçe yanıt ver ve finansal terimleri açıkla."""
         return self.execute(initial_state)
     
     
+    def warm_up(self):
+        """
+        LLM test çağrısını arka plan thread'inde başlatır
+        
+        İlk çağrı modeli Ollama belleğine yükler; başarısız olursa agent'lar
+        manuel HTTP fallback'ine geçer. HTTP trafiği bu süre boyunca kabul edilir.
+        """
+        if self.llm is None or self.llm_status != "pending":
+            return
+        self.llm_status = "warming"
+        threading.Thread(target=self._warm_up_llm, name="llm-warmup", daemon=True).start()
+    
+    def _warm_up_llm(self):
+        """ChatOllama'yı test eder ve sonucu llm_status'a yazar"""
+        try:
+            test_response = self.llm.invoke("Test mesajı")
+            print(f"✅ ChatOllama test başarılı: {test_response.content[:50]}...")
+            self.llm_status = "ready"
+        except Exception as e:
+            print(f"⚠️ ChatOllama testi başarısız: {e}")
+            print("🔄 Fallback modu aktif - Manuel HTTP istekleri kullanılacak")
+            self.llm = None
+            self.llm_status = "fallback"
+    
     def is_ready(self) -> bool:
         """
         Workflow'un hazır olup olmadığını kontrol eder
@@ -1342,6 +1616,16 @@ Türkçe yanıt ver ve finansal terimleri açıkla."""
         return self.workflow is not None
 
 
+# LangGraph tool adı -> MCP araç yolu eşlemesi (prefetch anahtarları için)
+MCP_TOOL_PATHS = {
+    "transactions_query": "transactions.query",
+    "userProfile_get": "userProfile.get",
+    "risk_scoreTransaction": "risk.scoreTransaction",
+    "market_quotes": "market.quotes",
+    "savings_createTransfer": "savings.createTransfer"
+}
+
+
 # LangGraph Tools - MCP Finance Tools için
 @tool
 def transactions_query(userId: str, since: str = None, limit: int = 10) -> dict:
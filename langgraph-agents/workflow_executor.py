@@ -0,0 +1,231 @@
+"""
+Finansal Agentic Proje Workflow Executor
+========================================
+
+Bu modül /simulate_deposit ve /action isteklerinin arka plan işlerini
+sınırlı bir worker havuzunda çalıştırır. İstek başına sınırsız thread
+açmak yerine:
+
+- En fazla MAX_CONCURRENCY iş aynı anda çalışır (tek Ollama backend'i korunur)
+- Çalışamayan en fazla QUEUE_SIZE iş bekleme kuyruğunda sıraya girer
+- Çalışan + bekleyen iş sayısı doluysa iş kabul edilmez; API 429 ve Retry-After döndürür
+- Async workflow'lar submit_future ile aynı kapasiteden slot alır ve aynı
+  MAX_CONCURRENCY sınırına tabidir; çalışırken worker thread'i tutmaz, çalışma
+  slotu Future tamamlanınca bırakılır
+- Kapanışta close() yeni iş almayı durdurur, drain() kabul edilmiş işlerin
+  (devam eden Future'lar dahil) bitmesini bekler
+
+Böylece ani trafik artışlarında bellek tükenmez, gecikme öngörülebilir kalır.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, Any, List
+
+from config import config
+
+
+class WorkflowExecutor:
+    """
+    Sabit boyutlu worker havuzu ve sınırlı bekleme kuyruğu ile iş yürütücüsü
+
+    submit thread-safe'tir ve bloklamaz; kapasite doluysa False döner.
+    """
+
+    def __init__(self, name: str = "workflow"):
+        """
+        Executor'ı ve worker thread'lerini başlatır
+
+        Args:
+            name: Thread adlarında ve loglarda kullanılacak ad
+        """
+        executor_config = config.get_workflow_executor_config()
+        self.name = name
+        self.max_concurrency = max(1, executor_config["max_concurrency"])
+        self.queue_size = max(1, executor_config["queue_size"])
+        self.retry_after = executor_config["retry_after_seconds"]
+
+        # Kabul kararı kuyruk boyutuna değil sayaca göre verilir; boşta bekleyen
+        # worker'lar işi henüz almamış olsa bile kapasite tam kullanılır
+        self.capacity = self.max_concurrency + self.queue_size
+        self._queue: "queue.Queue" = queue.Queue()
+        self._workers: List[threading.Thread] = []
+        self._admitted = 0
+        self._running = 0
+        # Çalışma slotları: thread'li işler ve loop'taki async workflow'lar aynı
+        # max_concurrency sınırını paylaşır
+        self._run_slots = threading.Semaphore(self.max_concurrency)
+
+        self._stats_lock = threading.Lock()
+        self._idle = threading.Condition(self._stats_lock)
+        self.closed = False
+        self._stats = {"submitted": 0, "rejected": 0, "completed": 0, "failed": 0}
+        self._total_wait = 0.0
+        self._total_run = 0.0
+
+        for index in range(self.max_concurrency):
+            worker = threading.Thread(
+                target=self._worker_loop, name=f"{name}-worker-{index}", daemon=True
+            )
+            worker.start()
+            self._workers.append(worker)
+
+        print(f"✅ Workflow executor başlatıldı: {name} "
+              f"({self.max_concurrency} eşzamanlı, {self.queue_size} bekleyen)")
+
+    def _admit(self) -> bool:
+        """Kapasite varsa bir slot ayırır (kapanıyorsa veya doluysa False)"""
+        with self._stats_lock:
+            if self.closed:
+                self._stats["rejected"] += 1
+                print(f"⚠️ Workflow executor kapanıyor, iş reddedildi: {self.name}")
+                return False
+            if self._admitted >= self.capacity:
+                self._stats["rejected"] += 1
+                print(f"⚠️ Workflow executor dolu, iş reddedildi: {self.name}")
+                return False
+            self._admitted += 1
+            self._stats["submitted"] += 1
+            return True
+
+    def submit(self, fn: Callable, *args) -> bool:
+        """
+        İşi kuyruğa ekler
+
+        Args:
+            fn: Çalıştırılacak fonksiyon
+            *args: Fonksiyon argümanları
+
+        Returns:
+            bool: Kabul edildiyse True, kapasite doluysa False
+        """
+        if not self._admit():
+            return False
+        self._queue.put((fn, args, time.time(), "job"))
+        return True
+
+    def submit_future(self, start: Callable[[], Future], on_done: Callable[[Future], Any]) -> bool:
+        """
+        Kendi Future'ını döndüren işi (örn: event loop'taki async workflow) kuyruğa ekler
+
+        İş sırası gelip çalışma slotu boşalınca başlatılır; çalışırken worker
+        thread'i tutulmaz ama çalışma slotu tutulur, böylece eşzamanlı async
+        workflow sayısı da max_concurrency ile sınırlıdır. Future tamamlanınca
+        çalışma slotu bırakılır ve on_done bir worker thread'inde çalışır
+        (event loop'u bloklamaz).
+
+        Args:
+            start: İşi başlatıp Future döndüren fonksiyon
+            on_done: Tamamlanan Future ile çağrılacak fonksiyon (sonuç işleme, fallback)
+
+        Returns:
+            bool: Kabul edildiyse True, kapasite doluysa False
+        """
+        if not self._admit():
+            return False
+        self._queue.put((start, (on_done,), time.time(), "start"))
+        return True
+
+    def _worker_loop(self):
+        """Worker loop'u - kuyruktaki işleri, async başlatmaları ve Future devamlarını çalıştırır"""
+        while True:
+            fn, args, enqueued_at, kind = self._queue.get()
+            self._run_slots.acquire()
+            started_at = time.time()
+            with self._stats_lock:
+                self._running += 1
+                if kind != "continue":
+                    # Devamların beklemesi işin kendisi başladıktan sonradır, sayılmaz
+                    self._total_wait += started_at - enqueued_at
+
+            if kind == "start":
+                self._start_future(fn, args[0], started_at)
+                continue
+
+            failed = False
+            try:
+                fn(*args)
+            except Exception as e:
+                failed = True
+                print(f"❌ Workflow executor iş hatası: {e}")
+            finally:
+                self._release_slot(started_at)
+                self._finish(failed)
+
+    def _start_future(self, start: Callable[[], Future], on_done: Callable[[Future], Any], started_at: float):
+        """Async işi başlatır; çalışma slotu Future tamamlanana kadar tutulur"""
+        try:
+            future = start()
+        except Exception as e:
+            future = Future()
+            future.set_exception(e)
+
+        def settle(done: Future):
+            self._release_slot(started_at)
+            self._queue.put((on_done, (done,), time.time(), "continue"))
+
+        future.add_done_callback(settle)
+
+    def _release_slot(self, started_at: float):
+        """Çalışma slotunu bırakır ve çalışma süresini işler"""
+        with self._stats_lock:
+            self._running -= 1
+            self._total_run += time.time() - started_at
+        self._run_slots.release()
+
+    def _finish(self, failed: bool):
+        """Kabul edilmiş işin kapasite slotunu bırakır"""
+        with self._stats_lock:
+            self._admitted -= 1
+            self._stats["failed" if failed else "completed"] += 1
+            if self._admitted == 0:
+                self._idle.notify_all()
+
+    def close(self):
+        """Yeni iş kabulünü durdurur (kabul edilmiş işler çalışmaya devam eder)"""
+        with self._stats_lock:
+            self.closed = True
+        print(f"🛑 Workflow executor yeni iş almayı durdurdu: {self.name}")
+
+    def drain(self, timeout: float) -> bool:
+        """
+        Kuyruktaki ve çalışan tüm işlerin (submit_future Future'ları dahil) bitmesini bekler
+
+        Args:
+            timeout: Maksimum bekleme süresi (saniye)
+
+        Returns:
+            bool: Tüm işler zamanında bittiyse True
+        """
+        with self._idle:
+            drained = self._idle.wait_for(lambda: self._admitted == 0, max(timeout, 0))
+            remaining = self._admitted
+        if drained:
+            print(f"✅ Workflow executor boşaltıldı: {self.name}")
+        else:
+            print(f"⚠️ Workflow executor zamanında boşalmadı: {self.name} ({remaining} iş yarıda)")
+        return drained
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Executor metriklerini döndürür
+
+        Returns:
+            Dict[str, Any]: Kuyruk derinliği, çalışan iş sayısı, red ve süre sayaçları
+        """
+        with self._stats_lock:
+            finished = self._stats["completed"] + self._stats["failed"]
+            started = finished + self._running
+            return dict(
+                self._stats,
+                name=self.name,
+                closed=self.closed,
+                running=self._running,
+                max_concurrency=self.max_concurrency,
+                queue_depth=self._admitted - self._running,
+                queue_capacity=self.queue_size,
+                avg_queue_wait_ms=round(self._total_wait / started * 1000, 1) if started else 0.0,
+                avg_run_ms=round(self._total_run / finished * 1000, 1) if finished else 0.0
+            )
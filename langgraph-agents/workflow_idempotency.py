@@ -0,0 +1,288 @@
+"""
+Finansal Agentic Proje Workflow Idempotency Katmanı
+===================================================
+
+Bu modül aynı deposit'in LLM pipeline'ını iki kez çalıştırmasını engeller.
+Kafka yeniden teslimi, /simulate_deposit istemci tekrarları ve fallback yolu
+aynı correlationId ile gelir; bu katman FinancialWorkflow.execute'un önünde
+durur ve her correlationId'yi yalnızca bir kez çalıştırır.
+
+Akış:
+1. Sonuç deposunda tamamlanmış kayıt varsa saklı sonuç döner (L1'de ücretsiz, yoksa tek Redis GET)
+2. Aynı süreçte çalışan bir kopya varsa onun sonucuna bağlanılır (Future)
+3. Redis'te SET NX EX ile correlationId sahiplenilir; sahiplenemeyen kopya
+   başka bir worker'daki çalıştırmanın sonucunu sonuç deposundan bekler
+4. Başarısız çalıştırmaların sahipliği bırakılır; yeniden teslim tekrar dener
+
+Redis erişilemezse yalnızca süreç içi tekilleştirme yapılır (fail-open).
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Dict, Any, Optional, Set
+
+from config import config
+from services import service_manager
+from workflow_results import workflow_results
+
+
+class WorkflowIdempotency:
+    """
+    correlationId bazlı tekrar bastırma katmanı
+
+    Thread-safe çalışır. run() sahiplenen çağıran için fonksiyonu çalıştırır,
+    kopyalar için saklı veya devam eden çalıştırmanın sonucunu döndürür.
+    """
+
+    def __init__(self):
+        """Katmanı başlatır (Redis bağlantısı ilk sahiplenmede kullanılır)"""
+        idempotency_config = config.get_workflow_idempotency_config()
+        self.enabled = idempotency_config["enabled"]
+        self.claim_ttl = idempotency_config["claim_ttl"]
+        self.wait_timeout = idempotency_config["wait_timeout"]
+        self.poll_interval = idempotency_config["poll_interval_ms"] / 1000.0
+        self.key_pattern = idempotency_config["key_pattern"]
+
+        self._in_flight: Dict[str, Future] = {}
+        self._claimed: Set[str] = set()
+        self._lock = threading.Lock()
+        self._stats = {
+            "executed": 0, "duplicates_completed": 0, "attached_local": 0,
+            "attached_remote": 0, "attach_timeouts": 0, "redis_errors": 0
+        }
+
+    def _redis_client(self):
+        """Sahiplenme için Redis client'ını döndürür (yoksa None)"""
+        try:
+            return service_manager.redis_service.client
+        except Exception:
+            return None
+
+    def _count(self, stat: str):
+        """İstatistik sayacını artırır"""
+        with self._lock:
+            self._stats[stat] += 1
+
+    def _claim(self, correlation_id: str) -> bool:
+        """
+        correlationId'yi Redis'te SET NX EX ile sahiplenir
+
+        Args:
+            correlation_id: Workflow correlation ID'si
+
+        Returns:
+            bool: Sahiplenildiyse (veya Redis yoksa) True, başka worker'da çalışıyorsa False
+        """
+        client = self._redis_client()
+        if client is None:
+            return True
+        try:
+            return bool(client.set(self.key_pattern.format(correlation_id=correlation_id),
+                                   str(time.time()), nx=True, ex=self.claim_ttl))
+        except Exception as e:
+            self._count("redis_errors")
+            print(f"Idempotency Redis sahiplenme hatası: {e}")
+            return True
+
+    def _release(self, correlation_id: str):
+        """Başarısız çalıştırmanın sahipliğini bırakır (yeniden teslim tekrar çalıştırabilir)"""
+        client = self._redis_client()
+        if client is None:
+            return
+        try:
+            client.delete(self.key_pattern.format(correlation_id=correlation_id))
+        except Exception as e:
+            self._count("redis_errors")
+            print(f"Idempotency Redis bırakma hatası: {e}")
+
+    def _completed_record(self, correlation_id: str) -> Optional[Dict[str, Any]]:
+        """Sonuç deposundaki tamamlanmış kaydı döndürür (yoksa None)"""
+        record = workflow_results.get(correlation_id)
+        if record is not None and record.get("status") == "completed":
+            return record
+        return None
+
+    def _wait_remote(self, initial_state: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Başka bir worker'daki çalıştırmanın sonucunu sonuç deposundan bekler
+
+        Args:
+            initial_state: Kopyanın başlangıç state'i
+
+        Returns:
+            Dict[str, Any]: Çalıştırmanın sonucu, zaman aşımında None
+        """
+        record = workflow_results.wait_finished(initial_state["correlationId"], self.wait_timeout, self.poll_interval)
+        return self._remote_result(initial_state, record)
+
+    def _remote_result(self, initial_state: Dict[str, Any],
+                       record: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Başka worker'daki çalıştırmanın kaydını kopyanın sonucuna çevirir (zaman aşımında None)"""
+        correlation_id = initial_state["correlationId"]
+        if record is None:
+            self._count("attach_timeouts")
+            print(f"⚠️ Devam eden workflow sonucu beklenirken zaman aşımı: {correlation_id}")
+            return None
+
+        self._count("attached_remote")
+        return dict(workflow_results.to_state(initial_state, record), duplicate=True)
+
+    def run(self, initial_state: Dict[str, Any],
+            execute: Callable[[], Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+        """
+        correlationId'yi en fazla bir kez çalıştırır
+
+        Args:
+            initial_state: Başlangıç state'i (correlationId içerir)
+            execute: Sahiplenen çağıran için workflow'u çalıştıran fonksiyon
+
+        Returns:
+            Dict[str, Any]: Workflow sonucu (kopyalar için saklı veya paylaşılan sonuç)
+        """
+        correlation_id = initial_state.get("correlationId")
+        if not self.enabled or not correlation_id:
+            return execute()
+
+        record = self._completed_record(correlation_id)
+        if record is not None:
+            self._count("duplicates_completed")
+            print(f"♻️ Tekrarlanan workflow, saklı sonuç döndürülüyor: {correlation_id}")
+            return dict(workflow_results.to_state(initial_state, record), duplicate=True)
+
+        with self._lock:
+            leader = self._in_flight.get(correlation_id)
+            if leader is None:
+                future = Future()
+                self._in_flight[correlation_id] = future
+
+        if leader is not None:
+            self._count("attached_local")
+            print(f"🔗 Tekrarlanan workflow devam eden çalıştırmaya bağlandı: {correlation_id}")
+            return leader.result()
+
+        try:
+            if not self._claim(correlation_id):
+                print(f"🔗 Workflow başka bir worker'da çalışıyor, sonucu bekleniyor: {correlation_id}")
+                result = self._wait_remote(initial_state)
+            else:
+                self._count("executed")
+                with self._lock:
+                    self._claimed.add(correlation_id)
+                result = None
+                try:
+                    result = execute()
+                finally:
+                    with self._lock:
+                        self._claimed.discard(correlation_id)
+                    if not result or result.get("current_step") == "error":
+                        self._release(correlation_id)
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(correlation_id, None)
+
+    async def arun(self, initial_state: Dict[str, Any],
+                   execute: Callable[[], Awaitable[Optional[Dict[str, Any]]]]) -> Optional[Dict[str, Any]]:
+        """
+        run'ın async karşılığı (async workflow yolu için)
+
+        Redis erişimleri thread'de yapılır; bekleyen kopyalar event loop'u ve
+        worker thread'lerini bloklamadan bekler.
+
+        Args:
+            initial_state: Başlangıç state'i (correlationId içerir)
+            execute: Sahiplenen çağıran için workflow'u çalıştıran coroutine fonksiyonu
+
+        Returns:
+            Dict[str, Any]: Workflow sonucu (kopyalar için saklı veya paylaşılan sonuç)
+        """
+        correlation_id = initial_state.get("correlationId")
+        if not self.enabled or not correlation_id:
+            return await execute()
+
+        record = await asyncio.to_thread(self._completed_record, correlation_id)
+        if record is not None:
+            self._count("duplicates_completed")
+            print(f"♻️ Tekrarlanan workflow, saklı sonuç döndürülüyor: {correlation_id}")
+            return dict(workflow_results.to_state(initial_state, record), duplicate=True)
+
+        with self._lock:
+            leader = self._in_flight.get(correlation_id)
+            if leader is None:
+                future = Future()
+                self._in_flight[correlation_id] = future
+
+        if leader is not None:
+            self._count("attached_local")
+            print(f"🔗 Tekrarlanan workflow devam eden çalıştırmaya bağlandı: {correlation_id}")
+            return await asyncio.wrap_future(leader)
+
+        try:
+            if not await asyncio.to_thread(self._claim, correlation_id):
+                print(f"🔗 Workflow başka bir worker'da çalışıyor, sonucu bekleniyor: {correlation_id}")
+                record = await workflow_results.await_finished(correlation_id, self.wait_timeout, self.poll_interval)
+                result = self._remote_result(initial_state, record)
+            else:
+                self._count("executed")
+                with self._lock:
+                    self._claimed.add(correlation_id)
+                result = None
+                try:
+                    result = await execute()
+                finally:
+                    with self._lock:
+                        self._claimed.discard(correlation_id)
+                    if not result or result.get("current_step") == "error":
+                        await asyncio.to_thread(self._release, correlation_id)
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(correlation_id, None)
+
+    def abandon_in_flight(self) -> int:
+        """
+        Kapanışta bitirilemeyen çalıştırmaların sahipliğini bırakır
+
+        Sahiplik claim TTL'i boyunca kalsaydı Kafka'nın yeniden teslim ettiği
+        deposit sonuç beklerken zaman aşımına düşerdi; bırakılınca yeniden çalışır.
+
+        Returns:
+            int: Bırakılan çalıştırma sayısı
+        """
+        with self._lock:
+            claimed = list(self._claimed)
+            self._claimed.clear()
+
+        for correlation_id in claimed:
+            self._release(correlation_id)
+            workflow_results.mark_finished(correlation_id, {
+                "current_step": "error",
+                "error": "Workflow kapanış sırasında yarıda kaldı"
+            })
+        if claimed:
+            print(f"⚠️ Yarıda kalan {len(claimed)} workflow'un sahipliği bırakıldı")
+        return len(claimed)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Tekrar bastırma sayaçlarını döndürür
+
+        Returns:
+            Dict[str, Any]: Çalıştırılan, bastırılan ve bağlanan workflow sayıları
+        """
+        with self._lock:
+            return dict(self._stats, in_flight=len(self._in_flight))
+
+
+# Global workflow idempotency instance'ı
+workflow_idempotency = WorkflowIdempotency()
@@ -0,0 +1,345 @@
+"""
+Finansal Agentic Proje Workflow Sonuç Deposu
+============================================
+
+Bu modül her workflow çalıştırmasının durumunu, node bazlı sürelerini ve
+final sonucunu correlationId anahtarıyla saklar. GET /workflow/<correlationId>
+endpoint'i bu depodan okur; böylece polling yapan veya yeniden bağlanan
+client'lar SSE stream'i açık tutmadan ya da pipeline'ı tekrar çalıştırmadan
+sonuca ulaşır.
+
+Katmanlar:
+- L1: Süreç içi LRU (node süreleri çalışma boyunca burada güncellenir)
+- L2: Redis (durum geçişlerinde yazılır; gunicorn worker'ları arasında paylaşılır)
+
+Durumlar: queued → running → completed | failed
+Her kayıt TTL sonunda her iki katmandan da düşer.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any
+
+from config import config
+from services import service_manager
+
+
+class WorkflowResultStore:
+    """
+    İki katmanlı (LRU + Redis) workflow sonuç deposu
+
+    Thread-safe çalışır. Redis erişilemezse yalnızca L1 katmanı kullanılır.
+    """
+
+    STATUSES = ("queued", "running", "completed", "failed")
+
+    def __init__(self):
+        """Depoyu başlatır (Redis bağlantısı ilk yazmada kullanılır)"""
+        store_config = config.get_workflow_results_config()
+        self.enabled = store_config["enabled"]
+        self.redis_enabled = store_config["redis_enabled"]
+        self.max_entries = store_config["max_entries"]
+        self.ttl = store_config["ttl"]
+        self.key_pattern = store_config["key_pattern"]
+
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"l1_hits": 0, "l2_hits": 0, "misses": 0, "writes": 0, "redis_errors": 0}
+
+    def _redis_client(self):
+        """L2 katmanı için Redis client'ını döndürür (yoksa None)"""
+        if not self.redis_enabled:
+            return None
+        try:
+            return service_manager.redis_service.client
+        except Exception:
+            return None
+
+    def _count(self, stat: str):
+        """İstatistik sayacını artırır"""
+        with self._lock:
+            self._stats[stat] += 1
+
+    def _update(self, correlation_id: str, persist: bool, keep_statuses: tuple = (),
+                **fields) -> Optional[Dict[str, Any]]:
+        """
+        Kaydı L1'de günceller (yoksa oluşturur), istenirse Redis'e yazar
+
+        Args:
+            correlation_id: Workflow correlation ID'si
+            persist: Güncel kaydın Redis'e yazılıp yazılmayacağı
+            keep_statuses: Kayıt bu durumlardan birindeyse güncelleme yapılmaz
+            **fields: Güncellenecek alanlar
+
+        Returns:
+            Dict[str, Any]: Kaydın kopyası (güncelleme atlandıysa None)
+        """
+        if not self.enabled or not correlation_id:
+            return None
+
+        now = time.time()
+        with self._lock:
+            record = self._entries.get(correlation_id)
+            if record is None or record["expiresAt"] <= now:
+                record = {"correlationId": correlation_id, "status": "queued", "nodes": [],
+                          "createdAt": now}
+                self._entries[correlation_id] = record
+            elif record["status"] in keep_statuses:
+                return None
+            record.update(fields)
+            record["updatedAt"] = now
+            record["expiresAt"] = now + self.ttl
+            self._entries.move_to_end(correlation_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            snapshot = json.loads(json.dumps(record, default=str))
+
+        if persist:
+            self._persist(snapshot)
+        return snapshot
+
+    def _persist(self, record: Dict[str, Any]):
+        """Kaydı TTL ile Redis'e yazar"""
+        self._count("writes")
+        client = self._redis_client()
+        if client is None:
+            return
+        try:
+            client.set(
+                self.key_pattern.format(correlation_id=record["correlationId"]),
+                json.dumps(record),
+                ex=self.ttl
+            )
+        except Exception as e:
+            self._count("redis_errors")
+            print(f"Workflow sonuç deposu Redis yazma hatası: {e}")
+
+    def mark_queued(self, correlation_id: str, user_id: str, amount: Any):
+        """
+        Kabul edilen workflow'u kuyrukta olarak kaydeder
+
+        İş kuyruğa alındıktan sonra çağrılır; worker kaydı bu arada ilerlettiyse
+        (running, completed, failed) durum geri alınmaz.
+
+        Args:
+            correlation_id: Workflow correlation ID'si
+            user_id: Kullanıcı ID'si
+            amount: Yatış tutarı
+        """
+        self._update(correlation_id, True, ("running", "completed", "failed"), status="queued", userId=user_id, amount=amount,
+                     nodes=[], finalResult=None, error=None)
+
+    def mark_running(self, correlation_id: str, user_id: str, amount: Any):
+        """
+        Workflow'un çalışmaya başladığını kaydeder
+
+        Args:
+            correlation_id: Workflow correlation ID'si
+            user_id: Kullanıcı ID'si
+            amount: Yatış tutarı
+        """
+        self._update(correlation_id, True, status="running", userId=user_id, amount=amount,
+                     startedAt=time.time(), nodes=[], finalResult=None, error=None)
+
+    def record_node(self, correlation_id: str, node: str, duration_ms: float, ok: bool = True):
+        """
+        Tamamlanan node'un süresini kaydeder (yalnızca L1; Redis'e final kayıtla yazılır)
+
+        Args:
+            correlation_id: Workflow correlation ID'si
+            node: Node adı
+            duration_ms: Node süresi (milisaniye)
+            ok: Node hatasız tamamlandıysa True
+        """
+        if not self.enabled or not correlation_id:
+            return
+        with self._lock:
+            record = self._entries.get(correlation_id)
+            if record is None:
+                return
+            record["nodes"].append({
+                "node": node,
+                "durationMs": round(duration_ms, 1),
+                "status": "ok" if ok else "error"
+            })
+            record["currentStep"] = node
+
+    def mark_attached(self, correlation_id: str, leader_id: str, user_id: str, amount: Any):
+        """
+        Aynı deposit için devam eden başka bir çalıştırmaya bağlanan workflow'u kaydeder
+
+        Args:
+            correlation_id: Bağlanan (follower) workflow'un correlation ID'si
+            leader_id: Sonucu paylaşılan (leader) workflow'un correlation ID'si
+            user_id: Kullanıcı ID'si
+            amount: Yatış tutarı
+        """
+        self._update(correlation_id, True, status="running", userId=user_id, amount=amount,
+                     startedAt=time.time(), attachedTo=leader_id, nodes=[], finalResult=None, error=None)
+
+    def mark_finished(self, correlation_id: str, result: Optional[Dict[str, Any]], mode: str = "workflow"):
+        """
+        Workflow sonucunu kaydeder
+
+        Sonuç yoksa veya current_step "error" ise workflow başarısız sayılır.
+
+        Args:
+            correlation_id: Workflow correlation ID'si
+            result: Workflow'un final state'i (veya fallback özeti)
+            mode: Sonucu üreten yol ("workflow", "fallback" veya "single-flight")
+        """
+        result = result or {}
+        failed = not result or result.get("current_step") == "error"
+        coordinator_output = result.get("coordinator_output") or {}
+
+        with self._lock:
+            record = self._entries.get(correlation_id) or {}
+            started_at = record.get("startedAt")
+        finished_at = time.time()
+
+        self._update(
+            correlation_id, True,
+            status="failed" if failed else "completed",
+            mode=mode,
+            finishedAt=finished_at,
+            durationMs=round((finished_at - started_at) * 1000, 1) if started_at else None,
+            currentStep=result.get("current_step"),
+            finalMessage=coordinator_output.get("message"),
+            finalResult=result.get("final_result"),
+            error=result.get("error") if result else "Workflow sonuç döndürmedi"
+        )
+
+    def get(self, correlation_id: str, refresh: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Workflow kaydını döndürür
+
+        Args:
+            correlation_id: Workflow correlation ID'si
+            refresh: True ise bitmemiş L1 kaydı yerine Redis'teki güncel kayıt tercih edilir
+                (başka bir worker'da devam eden çalıştırmayı izlemek için)
+
+        Returns:
+            Dict[str, Any]: Kayıt veya None (bilinmiyor / süresi dolmuş)
+        """
+        if not self.enabled:
+            return None
+
+        now = time.time()
+        local = None
+        with self._lock:
+            record = self._entries.get(correlation_id)
+            if record is not None:
+                if record["expiresAt"] <= now:
+                    del self._entries[correlation_id]
+                elif not refresh or record["status"] in ("completed", "failed"):
+                    self._entries.move_to_end(correlation_id)
+                    self._stats["l1_hits"] += 1
+                    return json.loads(json.dumps(record, default=str))
+                else:
+                    local = json.loads(json.dumps(record, default=str))
+
+        client = self._redis_client()
+        if client is not None:
+            try:
+                raw = client.get(self.key_pattern.format(correlation_id=correlation_id))
+                if raw:
+                    self._count("l2_hits")
+                    remote = json.loads(raw)
+                    self._remember_finished(remote)
+                    return remote
+            except Exception as e:
+                self._count("redis_errors")
+                print(f"Workflow sonuç deposu Redis okuma hatası: {e}")
+
+        if local is not None:
+            self._count("l1_hits")
+            return local
+
+        self._count("misses")
+        return None
+
+    def wait_finished(self, correlation_id: str, timeout: float, poll_interval: float) -> Optional[Dict[str, Any]]:
+        """
+        Başka bir worker'da devam eden çalıştırmanın bitmesini bekler
+
+        Args:
+            correlation_id: İzlenen workflow'un correlation ID'si
+            timeout: Maksimum bekleme süresi (saniye)
+            poll_interval: Depo yoklama aralığı (saniye)
+
+        Returns:
+            Dict[str, Any]: Bitmiş (completed/failed) kayıt, zaman aşımında None
+        """
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            record = self.get(correlation_id, refresh=True)
+            if record is not None and record.get("status") in ("completed", "failed"):
+                return record
+            time.sleep(poll_interval)
+        return None
+
+    async def await_finished(self, correlation_id: str, timeout: float,
+                             poll_interval: float) -> Optional[Dict[str, Any]]:
+        """wait_finished'in async karşılığı (Redis okumaları thread'de, bekleme loop'ta yapılır)"""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            record = await asyncio.to_thread(self.get, correlation_id, True)
+            if record is not None and record.get("status") in ("completed", "failed"):
+                return record
+            await asyncio.sleep(poll_interval)
+        return None
+
+    def to_state(self, initial_state: Dict[str, Any], record: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Depo kaydını workflow'u çağıranların beklediği final state biçimine çevirir
+
+        Args:
+            initial_state: Çağıranın başlangıç state'i
+            record: Depo kaydı
+
+        Returns:
+            Dict[str, Any]: Final state
+        """
+        return {
+            **initial_state,
+            "coordinator_output": {"message": record.get("finalMessage")},
+            "final_result": record.get("finalResult"),
+            "current_step": record.get("currentStep") or record.get("status"),
+            "error": record.get("error")
+        }
+
+    def _remember_finished(self, record: Dict[str, Any]):
+        """Redis'ten okunan bitmiş kaydı L1'e ekler (sonraki okumalar Redis'e gitmez)"""
+        if record.get("status") not in ("completed", "failed") or record.get("expiresAt", 0) <= time.time():
+            return
+        with self._lock:
+            self._entries[record["correlationId"]] = record
+            self._entries.move_to_end(record["correlationId"])
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Depo istatistiklerini döndürür
+
+        Returns:
+            Dict[str, Any]: Hit/miss sayaçları ve durum bazlı kayıt sayıları
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+            by_status = {status: 0 for status in self.STATUSES}
+            for record in self._entries.values():
+                by_status[record["status"]] = by_status.get(record["status"], 0) + 1
+
+        stats["max_entries"] = self.max_entries
+        stats["ttl"] = self.ttl
+        stats["by_status"] = by_status
+        return stats
+
+
+# Global workflow sonuç deposu instance'ı
+workflow_results = WorkflowResultStore()
@@ -0,0 +1,328 @@
+"""
+Finansal Agentic Proje Workflow Single-Flight Katmanı
+=====================================================
+
+Bu modül aynı deposit için eşzamanlı çalışan workflow'ları tek bir
+çalıştırmada birleştirir. UI çift gönderim yaptığında ya da aynı deposit
+Kafka ve /simulate_deposit üzerinden farklı correlationId'lerle geldiğinde
+payments → risk → investment → coordinator zinciri paralel olarak iki kez
+çalışmaz.
+
+Parmak izi (userId, amount) çiftidir ve yalnızca çalıştırma sürerken geçerlidir:
+- İlk gelen leader olur ve workflow'u çalıştırır
+- Aynı süreçteki follower'lar leader'ın Future'ına bağlanır
+- Başka worker'daki follower'lar Redis in-flight anahtarından leader'ı bulur
+  ve sonucunu sonuç deposundan bekler
+- Her follower için "workflow-attached" event'i yayınlanır; EventBroadcaster
+  leader'ın event'lerini follower'ın correlationId aboneliklerine de iletir
+
+Leader bittiğinde parmak izi serbest kalır; sonraki deposit yeniden çalışır.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Dict, Any, Optional, Tuple
+from queue import Queue
+
+from config import config
+from services import service_manager
+from workflow_results import workflow_results
+
+
+class WorkflowSingleFlight:
+    """
+    (userId, amount) parmak izi bazlı eşzamanlı çalıştırma birleştirici
+
+    Thread-safe çalışır. Redis erişilemezse yalnızca süreç içi birleştirme yapılır.
+    """
+
+    def __init__(self):
+        """Katmanı başlatır (Redis bağlantısı ilk leader seçiminde kullanılır)"""
+        single_flight_config = config.get_workflow_single_flight_config()
+        self.enabled = single_flight_config["enabled"]
+        self.attached_event = single_flight_config["attached_event"]
+        self.inflight_ttl = single_flight_config["inflight_ttl"]
+        self.wait_timeout = single_flight_config["wait_timeout"]
+        self.poll_interval = single_flight_config["poll_interval_ms"] / 1000.0
+        self.key_pattern = single_flight_config["key_pattern"]
+
+        self._leaders: Dict[Tuple[str, str], Tuple[str, Future]] = {}
+        self._leading: Dict[Tuple[str, str], str] = {}
+        self._lock = threading.Lock()
+        self._stats = {"leaders": 0, "attached_local": 0, "attached_remote": 0,
+                       "attach_timeouts": 0, "redis_errors": 0}
+
+    def _redis_client(self):
+        """In-flight anahtarları için Redis client'ını döndürür (yoksa None)"""
+        try:
+            return service_manager.redis_service.client
+        except Exception:
+            return None
+
+    def _count(self, stat: str):
+        """İstatistik sayacını artırır"""
+        with self._lock:
+            self._stats[stat] += 1
+
+    def _fingerprint(self, initial_state: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+        """
+        Deposit parmak izini üretir (25000, "25000" ve 25000.0 aynı parmak izidir)
+
+        Args:
+            initial_state: Başlangıç state'i
+
+        Returns:
+            Tuple[str, str]: (userId, amount) veya eksik alan varsa None
+        """
+        user_id = initial_state.get("userId")
+        amount = initial_state.get("amount")
+        if not user_id or amount is None:
+            return None
+        try:
+            amount = f"{float(amount):.2f}"
+        except (TypeError, ValueError):
+            amount = str(amount)
+        return str(user_id), amount
+
+    def _redis_key(self, fingerprint: Tuple[str, str]) -> str:
+        """Parmak izinin Redis in-flight anahtarını döndürür"""
+        return self.key_pattern.format(user_id=fingerprint[0], amount=fingerprint[1])
+
+    def _claim_remote(self, fingerprint: Tuple[str, str], correlation_id: str) -> Optional[str]:
+        """
+        Parmak izini Redis'te SET NX EX ile sahiplenir
+
+        Args:
+            fingerprint: Deposit parmak izi
+            correlation_id: Leader adayının correlation ID'si
+
+        Returns:
+            str: Başka bir worker leader ise onun correlation ID'si, aksi halde None
+        """
+        client = self._redis_client()
+        if client is None:
+            return None
+        key = self._redis_key(fingerprint)
+        try:
+            if client.set(key, correlation_id, nx=True, ex=self.inflight_ttl):
+                return None
+            leader_id = client.get(key)
+            if leader_id is None:
+                return None
+            leader_id = leader_id.decode("utf-8") if isinstance(leader_id, bytes) else str(leader_id)
+            return None if leader_id == correlation_id else leader_id
+        except Exception as e:
+            self._count("redis_errors")
+            print(f"Single-flight Redis sahiplenme hatası: {e}")
+            return None
+
+    def _release_remote(self, fingerprint: Tuple[str, str], correlation_id: str):
+        """Leader bittiğinde parmak izini bırakır (anahtar hâlâ bu leader'a aitse)"""
+        client = self._redis_client()
+        if client is None:
+            return
+        key = self._redis_key(fingerprint)
+        try:
+            leader_id = client.get(key)
+            if leader_id is not None:
+                leader_id = leader_id.decode("utf-8") if isinstance(leader_id, bytes) else str(leader_id)
+            if leader_id == correlation_id:
+                client.delete(key)
+        except Exception as e:
+            self._count("redis_errors")
+            print(f"Single-flight Redis bırakma hatası: {e}")
+
+    def _announce(self, initial_state: Dict[str, Any], leader_id: str, publisher_queue: Optional[Queue]):
+        """
+        Follower'ın leader'a bağlandığını yayınlar ve sonuç deposuna işler
+
+        Args:
+            initial_state: Follower'ın başlangıç state'i
+            leader_id: Leader'ın correlation ID'si
+            publisher_queue: Event yayınlama kuyruğu
+        """
+        correlation_id = initial_state["correlationId"]
+        print(f"🔗 Aynı deposit zaten çalışıyor, {correlation_id} → {leader_id} çalıştırmasına bağlandı")
+        workflow_results.mark_attached(correlation_id, leader_id, initial_state["userId"], initial_state["amount"])
+        if publisher_queue is None:
+            return
+        publisher_queue.put({
+            "event": self.attached_event,
+            "data": {
+                "type": self.attached_event,
+                "userId": initial_state["userId"],
+                "amount": initial_state["amount"],
+                "correlationId": correlation_id,
+                "leaderCorrelationId": leader_id
+            }
+        })
+
+    def _follower_result(self, initial_state: Dict[str, Any], leader_id: str,
+                         result: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Leader sonucunu follower'ın correlationId'siyle döndürür ve sonuç deposuna yazar"""
+        if result is not None:
+            result = {**result, "correlationId": initial_state["correlationId"], "attached_to": leader_id}
+        workflow_results.mark_finished(initial_state["correlationId"], result, mode="single-flight")
+        return result
+
+    def _remote_follower_result(self, initial_state: Dict[str, Any], leader_id: str,
+                                record: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Başka worker'daki leader'ın kaydını follower sonucuna çevirir ve sonuç deposuna yazar"""
+        if record is None:
+            self._count("attach_timeouts")
+            print(f"⚠️ Leader workflow sonucu beklenirken zaman aşımı: {leader_id}")
+            result = None
+        else:
+            self._count("attached_remote")
+            result = workflow_results.to_state(initial_state, record)
+        return self._follower_result(initial_state, leader_id, result)
+
+    def run(self, initial_state: Dict[str, Any], execute: Callable[[], Optional[Dict[str, Any]]],
+            publisher_queue: Optional[Queue] = None) -> Optional[Dict[str, Any]]:
+        """
+        Aynı deposit için devam eden çalıştırma varsa ona bağlanır, yoksa execute'u çalıştırır
+
+        Args:
+            initial_state: Başlangıç state'i (userId, amount, correlationId)
+            execute: Leader için workflow'u çalıştıran fonksiyon
+            publisher_queue: "workflow-attached" event'inin yayınlanacağı kuyruk
+
+        Returns:
+            Dict[str, Any]: Workflow sonucu (follower'lar için leader'ın sonucu)
+        """
+        fingerprint = self._fingerprint(initial_state)
+        correlation_id = initial_state.get("correlationId")
+        if not self.enabled or fingerprint is None or not correlation_id:
+            return execute()
+
+        with self._lock:
+            leader = self._leaders.get(fingerprint)
+            if leader is None:
+                future = Future()
+                self._leaders[fingerprint] = (correlation_id, future)
+
+        if leader is not None:
+            leader_id, leader_future = leader
+            self._count("attached_local")
+            self._announce(initial_state, leader_id, publisher_queue)
+            return self._follower_result(initial_state, leader_id, leader_future.result())
+
+        try:
+            remote_leader_id = self._claim_remote(fingerprint, correlation_id)
+            if remote_leader_id is not None:
+                # Bu süreçte sonradan gelen follower'lar doğrudan gerçek leader'a bağlansın
+                with self._lock:
+                    self._leaders[fingerprint] = (remote_leader_id, future)
+                self._announce(initial_state, remote_leader_id, publisher_queue)
+                record = workflow_results.wait_finished(remote_leader_id, self.wait_timeout, self.poll_interval)
+                result = self._remote_follower_result(initial_state, remote_leader_id, record)
+            else:
+                self._count("leaders")
+                with self._lock:
+                    self._leading[fingerprint] = correlation_id
+                try:
+                    result = execute()
+                finally:
+                    with self._lock:
+                        self._leading.pop(fingerprint, None)
+                    self._release_remote(fingerprint, correlation_id)
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._leaders.pop(fingerprint, None)
+
+    async def arun(self, initial_state: Dict[str, Any],
+                   execute: Callable[[], Awaitable[Optional[Dict[str, Any]]]],
+                   publisher_queue: Optional[Queue] = None) -> Optional[Dict[str, Any]]:
+        """
+        run'ın async karşılığı (async workflow yolu için)
+
+        Redis erişimleri ve event yayınları thread'de yapılır; follower'lar
+        event loop'u ve worker thread'lerini bloklamadan leader'ı bekler.
+
+        Args:
+            initial_state: Başlangıç state'i (userId, amount, correlationId)
+            execute: Leader için workflow'u çalıştıran coroutine fonksiyonu
+            publisher_queue: "workflow-attached" event'inin yayınlanacağı kuyruk
+
+        Returns:
+            Dict[str, Any]: Workflow sonucu (follower'lar için leader'ın sonucu)
+        """
+        fingerprint = self._fingerprint(initial_state)
+        correlation_id = initial_state.get("correlationId")
+        if not self.enabled or fingerprint is None or not correlation_id:
+            return await execute()
+
+        with self._lock:
+            leader = self._leaders.get(fingerprint)
+            if leader is None:
+                future = Future()
+                self._leaders[fingerprint] = (correlation_id, future)
+
+        if leader is not None:
+            leader_id, leader_future = leader
+            self._count("attached_local")
+            await asyncio.to_thread(self._announce, initial_state, leader_id, publisher_queue)
+            leader_result = await asyncio.wrap_future(leader_future)
+            return await asyncio.to_thread(self._follower_result, initial_state, leader_id, leader_result)
+
+        try:
+            remote_leader_id = await asyncio.to_thread(self._claim_remote, fingerprint, correlation_id)
+            if remote_leader_id is not None:
+                with self._lock:
+                    self._leaders[fingerprint] = (remote_leader_id, future)
+                await asyncio.to_thread(self._announce, initial_state, remote_leader_id, publisher_queue)
+                record = await workflow_results.await_finished(remote_leader_id, self.wait_timeout, self.poll_interval)
+                result = await asyncio.to_thread(self._remote_follower_result, initial_state, remote_leader_id, record)
+            else:
+                self._count("leaders")
+                with self._lock:
+                    self._leading[fingerprint] = correlation_id
+                try:
+                    result = await execute()
+                finally:
+                    with self._lock:
+                        self._leading.pop(fingerprint, None)
+                    await asyncio.to_thread(self._release_remote, fingerprint, correlation_id)
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._leaders.pop(fingerprint, None)
+
+    def abandon_in_flight(self) -> int:
+        """
+        Kapanışta bitirilemeyen leader çalıştırmalarının parmak izlerini bırakır
+
+        Returns:
+            int: Bırakılan parmak izi sayısı
+        """
+        with self._lock:
+            leading = list(self._leading.items())
+            self._leading.clear()
+
+        for fingerprint, correlation_id in leading:
+            self._release_remote(fingerprint, correlation_id)
+        return len(leading)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Single-flight sayaçlarını döndürür
+
+        Returns:
+            Dict[str, Any]: Leader, bağlanan follower ve devam eden parmak izi sayıları
+        """
+        with self._lock:
+            return dict(self._stats, in_flight=len(self._leaders))
+
+
+# Global workflow single-flight instance'ı
+workflow_singleflight = WorkflowSingleFlight()
@@ -0,0 +1,27 @@
+"""
+Finansal Agentic Proje WSGI Entry Point'i
+=========================================
+
+gunicorn gibi harici WSGI sunucuları için uygulama nesnesi.
+
+    gunicorn -c gunicorn.conf.py wsgi:application
+
+preload_app kapalı olduğu için bu modül her worker'da ayrı import edilir
+ve FinancialAgenticApp singleton'ı worker başına bir kez oluşturulur.
+"""
+
+from flask import Flask
+
+
+def create_application() -> Flask:
+    """
+    Uygulama bileşenlerini başlatır ve Flask uygulamasını döndürür
+
+    Returns:
+        Flask: Route'ları kayıtlı Flask uygulaması
+    """
+    from app import FinancialAgenticApp
+    return FinancialAgenticApp().app
+
+
+application = create_application()
@@ -1,5 +1,9 @@
 import {useEffect, useState} from "react";
 
+// Dashboard'un kullanıcısı; /stream yalnızca bu kullanıcının event'lerini gönderir
+const USER_ID = process.env.NEXT_PUBLIC_USER_ID || "web_ui_user";
+const API_URL = process.env.NEXT_PUBLIC_API_URL || "http://localhost:5001";
+
 export default function Home(){
   const [events, setEvents] = useState([]);
   const [isLoading, setIsLoading] = useState(false);
@@ -13,6 +17,8 @@ export default function Home(){
   const [toastMessage, setToastMessage] = useState("");
   const [showToast, setShowToast] = useState(false);
   const [collapsedEvents, setCollapsedEvents] = useState(new Set());
+  // Agent LLM'lerinden gelen kısmi token'lar (correlationId + agent bazında)
+  const [streamingOutputs, setStreamingOutputs] = useState({});
   
   // Yeni event'ler geldiğinde otomatik olarak collapsed state'e ekle
   useEffect(() => {
@@ -51,13 +57,40 @@ export default function Home(){
   };
   
   useEffect(()=>{
-    const es = new EventSource(process.env.NEXT_PUBLIC_STREAM_URL || "http://localhost:5001/stream");
+    const streamUrl = new URL(process.env.NEXT_PUBLIC_STREAM_URL || `${API_URL}/stream`);
+    streamUrl.searchParams.set("userId", USER_ID);
+    const es = new EventSource(streamUrl.toString());
+    // Final çıktı geldiğinde ilgili agent'ın canlı token akışını temizle
+    const clearStreaming = (data, agent) => {
+      const key = `${data.correlationId || 'unknown'}_${agent}`;
+      setStreamingOutputs(prev => {
+        if (!(key in prev)) return prev;
+        const next = {...prev};
+        delete next[key];
+        return next;
+      });
+    };
+    es.addEventListener("agent-token", e=>{
+      const data = JSON.parse(e.data);
+      const key = `${data.correlationId || 'unknown'}_${data.agent}`;
+      setStreamingOutputs(prev => ({
+        ...prev,
+        [key]: {
+          agent: data.agent,
+          correlationId: data.correlationId,
+          // reset: yanıt baştan yeniden stream ediliyor, önceki token'ları at
+          text: (data.reset ? '' : (prev[key]?.text || '')) + data.token
+        }
+      }));
+    });
     es.addEventListener("notification", e=>{
       const data = JSON.parse(e.data);
+      clearStreaming(data, 'CoordinatorAgent');
       setEvents(ev=>[data,...ev]);
     });
     es.addEventListener("agent-output", e=>{
       const data = JSON.parse(e.data);
+      clearStreaming(data, data.agent);
       setEvents(ev=>[data,...ev]);
     });
     es.addEventListener("execution", e=>{
@@ -132,11 +165,11 @@ export default function Home(){
   const triggerDeposit = async (amount) => {
     setIsLoading(true);
     try {
-      const response = await fetch((process.env.NEXT_PUBLIC_API_URL || "http://localhost:5001") + "/simulate_deposit", {
+      const response = await fetch(API_URL + "/simulate_deposit", {
         method: "POST",
         headers: {"Content-Type": "application/json"},
         body: JSON.stringify({
-          user_id: "web_ui_user",
+          user_id: USER_ID,
           amount: amount,
           correlation_id: `web_ui_${Date.now()}`
         })
@@ -159,14 +192,14 @@ export default function Home(){
   const triggerKafkaDeposit = async (amount) => {
     setIsLoading(true);
     try {
-      const response = await fetch((process.env.NEXT_PUBLIC_API_URL || "http://localhost:5001") + "/kafka/publish", {
+      const response = await fetch(API_URL + "/kafka/publish", {
         method: "POST",
         headers: {"Content-Type": "application/json"},
         body: JSON.stringify({
           topic: "transactions.deposit",
           data: {
             payload: {
-              userId: "web_ui_user",
+              userId: USER_ID,
               amount: amount
             },
             meta: {
@@ -198,11 +231,11 @@ export default function Home(){
     try {
       console.log("🚀 Evet butonuna tıklandı, tüm öneriler onaylanıyor...", item);
       
-      const response = await fetch((process.env.NEXT_PUBLIC_API_URL || "http://localhost:5001") + "/approve_all_proposals", {
+      const response = await fetch(API_URL + "/approve_all_proposals", {
         method: "POST",
         headers: {"Content-Type": "application/json"},
       body: JSON.stringify({
-        userId: item.userId || "web_ui_user",
+        userId: item.userId || USER_ID,
           response: "approve_all",
         proposal: item.proposal || item,
           correlationId: item.correlationId || "corr-demo",
@@ -260,11 +293,11 @@ export default function Home(){
     setButtonsDisabled(true);
     showToastMessage("❌ Tüm öneriler reddediliyor...");
     try {
-      const response = await fetch((process.env.NEXT_PUBLIC_API_URL || "http://localhost:5001") + "/reject_all_proposals", {
+      const response = await fetch(API_URL + "/reject_all_proposals", {
         method: "POST",
         headers: {"Content-Type": "application/json"},
       body: JSON.stringify({
-        userId: item.userId || "web_ui_user",
+        userId: item.userId || USER_ID,
           response: "reject_all",
         proposal: item.proposal || item,
           correlationId: item.correlationId || "corr-demo",
@@ -295,11 +328,11 @@ export default function Home(){
     
     setIsLoading(true);
     try {
-      const response = await fetch((process.env.NEXT_PUBLIC_API_URL || "http://localhost:5001") + "/chat_response", {
+      const response = await fetch(API_URL + "/chat_response", {
         method: "POST",
         headers: {"Content-Type": "application/json"},
         body: JSON.stringify({
-          userId: currentProposal.userId || "web_ui_user",
+          userId: currentProposal.userId || USER_ID,
           response: chatInput.trim(),
           proposal: currentProposal.proposal || currentProposal,
           correlationId: currentProposal.correlationId || "corr-demo",
@@ -356,11 +389,11 @@ export default function Home(){
       console.log("💬 Özel mesaj gönderiliyor:", customMessageInput.trim());
       console.log("📋 Event data:", currentEvent);
       
-      const response = await fetch((process.env.NEXT_PUBLIC_API_URL || "http://localhost:5001") + "/chat_response", {
+      const response = await fetch(API_URL + "/chat_response", {
         method: "POST",
         headers: {"Content-Type": "application/json"},
         body: JSON.stringify({
-          userId: currentEvent.userId || "web_ui_user",
+          userId: currentEvent.userId || USER_ID,
           response: customMessageInput.trim(),
           proposal: currentEvent.proposal || currentEvent,
           correlationId: currentEvent.correlationId || "corr-demo",
@@ -421,11 +454,11 @@ export default function Home(){
       console.log("💬 Chat response gönderiliyor:", chatInput.trim());
       console.log("📋 Event data:", event);
       
-      const response = await fetch((process.env.NEXT_PUBLIC_API_URL || "http://localhost:5001") + "/chat_response", {
+      const response = await fetch(API_URL + "/chat_response", {
         method: "POST",
         headers: {"Content-Type": "application/json"},
         body: JSON.stringify({
-          userId: event.userId || "web_ui_user",
+          userId: event.userId || USER_ID,
           response: chatInput.trim(),
           proposal: event.proposal || event,
           correlationId: event.correlationId || "corr-demo",
@@ -546,6 +579,19 @@ export default function Home(){
         <h2>📱 Real-time Bildirimler</h2>
         <p>Agent'ların çıktıları ve kullanıcı etkileşimleri:</p>
         
+        {Object.entries(streamingOutputs).map(([key, out]) => (
+          <div key={key} style={{
+            border: '1px dashed #007bff',
+            padding: 15,
+            margin: 10,
+            borderRadius: 8,
+            backgroundColor: '#f0f7ff'
+          }}>
+            <h4 style={{margin: '0 0 8px 0', color: '#007bff'}}>✍️ {out.agent} yazıyor...</h4>
+            <p style={{whiteSpace: 'pre-wrap', margin: 0, fontSize: '14px'}}>{out.text}</p>
+          </div>
+        ))}
+        
         {events.length === 0 ? (
           <div style={{padding: 20, textAlign: 'center', color: '#666'}}>
             <p>Henüz bildirim yok. Yukarıdaki butonlardan birini tıklayarak maaş yatış senaryosunu başlatın.</p>